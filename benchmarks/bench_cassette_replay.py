@@ -0,0 +1,99 @@
+"""Cassette replay benchmarks.
+
+Records a few coordinator cycles against a misbehaving simulator (slow
+``device/list``, jittery device reads, occasional 5xx and a rate limit), then
+replays the cassette against a fresh client and coordinator at the original
+and at zero latency. Replaying at original latency shows what the current
+coordinator/retry code would have done with the same incident; zero latency
+isolates client-side overhead.
+
+``--bench-cassette FILE`` replays a cassette captured in production with the
+``smart_envi.start_api_recording`` / ``stop_api_recording`` services instead.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+
+import pytest
+
+from custom_components.smart_envi.api import EnviApiClient
+from custom_components.smart_envi.cassette import CassettePlayer, CassetteRecorder
+from custom_components.smart_envi.coordinator import EnviDataUpdateCoordinator
+from tools.envi_simulator import LatencyProfile, SimulatorConfig
+
+from conftest import BenchEnvironment
+
+CYCLES = 3
+LATENCY_SCALES = (1.0, 0.0)
+
+
+async def _run_cycles(coordinator: EnviDataUpdateCoordinator, cycles: int) -> list[float]:
+    """Run coordinator update cycles and return their durations."""
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        coordinator.data = await coordinator._async_update_data()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def _replay(hass, cassette: dict, latency_scale: float, cycles: int) -> list[float]:
+    """Replay a cassette through a fresh client and coordinator."""
+    player = CassettePlayer(cassette, latency_scale=latency_scale, loop_responses=True)
+    client = EnviApiClient(None, "replay", "replay", transport=player)
+    coordinator = EnviDataUpdateCoordinator(hass, client, "replay_entry")
+    return await _run_cycles(coordinator, cycles)
+
+
+def bench_record_and_replay(loop, heaters, tmp_path, request, record):
+    """Record an incident from the simulator and replay it."""
+    env = BenchEnvironment(heaters, request.config.getoption("--bench-latency"))
+    loop.run_until_complete(env.async_setup(str(tmp_path), SimulatorConfig(
+        heaters=heaters,
+        latency=LatencyProfile.parse("uniform:0.005:0.03"),
+        endpoint_latency={"device_list": LatencyProfile.parse("fixed:0.25")},
+        error_rate=0.01,
+        rate_limit=max(50.0, heaters * 2.0),
+        retry_after=1,
+    )))
+    try:
+        recorder = CassetteRecorder(env.client.transport)
+        env.client.transport = recorder
+        recorded = loop.run_until_complete(_run_cycles(env.coordinator, CYCLES))
+        cassette = recorder.to_dict()
+
+        results = {
+            "interactions": len(recorder.interactions),
+            "recorded_cycle_median_s": statistics.median(recorded),
+        }
+        for scale in LATENCY_SCALES:
+            replayed = loop.run_until_complete(_replay(env.hass, cassette, scale, CYCLES))
+            results[f"replay_x{scale:g}_cycle_median_s"] = statistics.median(replayed)
+    finally:
+        loop.run_until_complete(env.async_teardown())
+
+    record("cassette_replay", heaters, results)
+
+
+def bench_replay_cassette_file(loop, tmp_path, request, record):
+    """Replay a cassette file given with ``--bench-cassette``."""
+    path = request.config.getoption("--bench-cassette")
+    if not path:
+        pytest.skip("no --bench-cassette given")
+
+    env = BenchEnvironment(0, request.config.getoption("--bench-latency"))
+    loop.run_until_complete(env.async_setup(str(tmp_path)))
+    try:
+        results = {}
+        for scale in LATENCY_SCALES:
+            player = CassettePlayer.load(path, latency_scale=scale, loop_responses=True)
+            client = EnviApiClient(None, "replay", "replay", transport=player)
+            coordinator = EnviDataUpdateCoordinator(env.hass, client, "replay_entry")
+            durations = loop.run_until_complete(_run_cycles(coordinator, CYCLES))
+            results[f"replay_x{scale:g}_cycle_median_s"] = statistics.median(durations)
+            results["devices"] = len(coordinator.device_ids)
+    finally:
+        loop.run_until_complete(env.async_teardown())
+
+    record("cassette_file_replay", results["devices"], results)
@@ -0,0 +1,100 @@
+"""Coordinator scaling benchmarks.
+
+Measures, for fleets of 10/100/1000 simulated heaters:
+
+* wall time and request count of one coordinator update cycle
+* peak memory allocated during a cycle (tracemalloc)
+* entity construction and platform add time per platform
+* cost of dispatching one coordinator update to every listener
+"""
+from __future__ import annotations
+
+import statistics
+import time
+import tracemalloc
+
+from custom_components.smart_envi import binary_sensor, climate, sensor
+
+CYCLES = 5
+DISPATCHES = 5
+
+PLATFORMS = {
+    "climate": climate.async_setup_entry,
+    "sensor": sensor.async_setup_entry,
+    "binary_sensor": binary_sensor.async_setup_entry,
+}
+
+
+def _request_count(env) -> int:
+    """Total requests served by the simulator so far."""
+    return env.simulator.stats["requests"]
+
+
+def bench_update_cycle(loop, bench_env, heaters, record):
+    """Time full coordinator update cycles and count requests per cycle."""
+    coordinator = bench_env.coordinator
+
+    # Warm-up cycle authenticates and establishes connections
+    coordinator.data = loop.run_until_complete(coordinator._async_update_data())
+
+    durations = []
+    requests = []
+    for _ in range(CYCLES):
+        before = _request_count(bench_env)
+        start = time.perf_counter()
+        coordinator.data = loop.run_until_complete(coordinator._async_update_data())
+        durations.append(time.perf_counter() - start)
+        requests.append(_request_count(bench_env) - before)
+
+    tracemalloc.start()
+    try:
+        coordinator.data = loop.run_until_complete(coordinator._async_update_data())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(coordinator.device_ids) == heaters
+    # One device list plus one status request per heater
+    assert statistics.median(requests) == heaters + 1
+    record("update_cycle", heaters, {
+        "cycles": CYCLES,
+        "wall_time_min_s": min(durations),
+        "wall_time_median_s": statistics.median(durations),
+        "requests_per_cycle": statistics.median(requests),
+        "peak_memory_bytes": peak,
+    })
+
+
+def bench_entity_setup_and_dispatch(loop, bench_env, heaters, record):
+    """Time entity creation per platform and listener dispatch for the fleet."""
+    coordinator = bench_env.coordinator
+    coordinator.data = loop.run_until_complete(coordinator._async_update_data())
+
+    platforms = {}
+    total_entities = 0
+    for domain, setup_entry in PLATFORMS.items():
+        constructed, added, count = loop.run_until_complete(
+            bench_env.async_add_platform(domain, setup_entry)
+        )
+        total_entities += count
+        platforms[domain] = {
+            "entities": count,
+            "construct_s": constructed,
+            "add_s": added,
+        }
+    record("entity_setup", heaters, platforms)
+
+    listeners = len(coordinator._listeners)
+    durations = []
+    for _ in range(DISPATCHES):
+        start = time.perf_counter()
+        coordinator.async_update_listeners()
+        durations.append(time.perf_counter() - start)
+
+    assert len(bench_env.hass.states.async_all()) == total_entities
+    record("listener_dispatch", heaters, {
+        "listeners": listeners,
+        "dispatch_min_s": min(durations),
+        "dispatch_median_s": statistics.median(durations),
+        "per_listener_us": statistics.median(durations) / max(listeners, 1) * 1_000_000,
+    })
@@ -0,0 +1,96 @@
+"""JSON decode and validation microbenchmarks.
+
+Decodes one poll cycle's worth of realistic responses (a ``device/list`` plus
+one ``device/{id}`` per heater, rendered by the simulator) with each decoder
+path, without any network or event loop overhead:
+
+* ``resp_json``: the old path, i.e. what ``aiohttp``'s ``resp.json()`` does
+  (decode the body to text, then ``json.loads``)
+* ``stdlib``: ``json.loads`` on the response bytes
+* ``orjson``: ``orjson.loads`` on the response bytes (if installed)
+* ``validate``: checking the decoded payloads against the field specs in
+  payload.py
+
+Times are the best of several rounds, in milliseconds of CPU per cycle. Run
+on the target hardware (e.g. a Raspberry Pi) to see the per-cycle saving
+there.
+"""
+from __future__ import annotations
+
+import json
+import time
+
+from custom_components.smart_envi.payload import (
+    DEVICE_REF_SPEC,
+    DEVICE_SPEC,
+    RESPONSE_SPECS,
+    orjson,
+)
+from tools.envi_simulator import EnviSimulator, SimulatorConfig
+
+ROUNDS = 7
+
+# Typical weekday schedule, attached to every other heater
+SCHEDULE = {
+    "id": 1,
+    "name": "Weekdays",
+    "enabled": True,
+    "times": [
+        {"time": "06:30:00", "temperature": 68, "enabled": True},
+        {"time": "08:30:00", "temperature": 62, "enabled": True},
+        {"time": "17:00:00", "temperature": 70, "enabled": True},
+        {"time": "22:30:00", "temperature": 60, "enabled": True},
+    ],
+}
+
+
+def _cycle_bodies(heaters: int) -> list[bytes]:
+    """Render the response bodies of one poll cycle as the API sends them."""
+    simulator = EnviSimulator(SimulatorConfig(heaters=heaters))
+    bodies = [json.dumps({
+        "status": "success",
+        "data": [{"id": heater.device_id, "name": heater.name} for heater in simulator.heaters.values()],
+    }).encode()]
+    for heater in simulator.heaters.values():
+        schedule = SCHEDULE if heater.device_id % 2 else None
+        bodies.append(json.dumps({"status": "success", "data": heater.to_payload(schedule)}).encode())
+    return bodies
+
+
+def _validate(payloads: list[dict]) -> None:
+    """Check decoded payloads the way the client does."""
+    device_list, devices = payloads[0], payloads[1:]
+    RESPONSE_SPECS["device_list"].problems(device_list)
+    for device in device_list["data"]:
+        DEVICE_REF_SPEC.problems(device)
+    for response in devices:
+        RESPONSE_SPECS["device_get"].problems(response)
+        DEVICE_SPEC.problems(response["data"])
+
+
+def _best_ms(func, *args) -> float:
+    """Return the fastest of ROUNDS runs of ``func(*args)`` in CPU milliseconds."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.process_time()
+        func(*args)
+        best = min(best, time.process_time() - start)
+    return round(best * 1000, 3)
+
+
+def bench_json_decode(heaters, record):
+    """Time decoding and validating one poll cycle's responses."""
+    bodies = _cycle_bodies(heaters)
+    payloads = [json.loads(body) for body in bodies]
+
+    results = {
+        "bytes_per_cycle": sum(len(body) for body in bodies),
+        "resp_json_ms": _best_ms(lambda: [json.loads(body.decode("utf-8")) for body in bodies]),
+        "stdlib_ms": _best_ms(lambda: [json.loads(body) for body in bodies]),
+        "orjson_ms": None,
+        "validate_ms": _best_ms(_validate, payloads),
+    }
+    if orjson is not None:
+        assert [orjson.loads(body) for body in bodies] == payloads
+        results["orjson_ms"] = _best_ms(lambda: [orjson.loads(body) for body in bodies])
+    record("json_decode", heaters, results)
@@ -0,0 +1,177 @@
+"""Shared fixtures for the Smart Envi scaling benchmarks.
+
+Benchmarks run the real API client, coordinator and entity platforms against
+the offline simulator in ``tools/envi_simulator.py``. Results are collected
+per benchmark and fleet size and written to a JSON file at the end of the
+session so runs can be compared across releases.
+
+Run with::
+
+    pip install -r benchmarks/requirements.txt
+    pytest benchmarks --bench-sizes 10,100,1000 --bench-output benchmarks/results/2.0.0.json
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import device_registry, entity, entity_registry  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+
+from custom_components.smart_envi.api import EnviApiClient  # noqa: E402
+from custom_components.smart_envi.const import DOMAIN  # noqa: E402
+from custom_components.smart_envi.coordinator import EnviDataUpdateCoordinator  # noqa: E402
+from tools.envi_simulator import EnviSimulator, LatencyProfile, SimulatorConfig  # noqa: E402
+
+DEFAULT_SIZES = "10,100,1000"
+DEFAULT_OUTPUT = REPO_ROOT / "benchmarks" / "results" / "latest.json"
+
+_RESULTS: dict[str, dict] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add benchmark command line options."""
+    group = parser.getgroup("smart_envi benchmarks")
+    group.addoption("--bench-sizes", default=DEFAULT_SIZES, help="comma-separated fleet sizes")
+    group.addoption("--bench-output", default=str(DEFAULT_OUTPUT), help="JSON file for results")
+    group.addoption("--bench-cassette", default=None, help="cassette file to replay (see cassette.py)")
+    group.addoption(
+        "--bench-latency", default="fixed:0",
+        help="simulator latency distribution (kind:a:b), e.g. lognormal:0.05:0.5",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Parametrize benchmarks that take ``heaters`` over the fleet sizes."""
+    if "heaters" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--bench-sizes").split(",") if size]
+        metafunc.parametrize("heaters", sizes, ids=[f"{size}_heaters" for size in sizes])
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Write collected results to the output JSON file."""
+    if not _RESULTS:
+        return
+    manifest = json.loads((REPO_ROOT / "custom_components" / DOMAIN / "manifest.json").read_text())
+    output = Path(session.config.getoption("--bench-output"))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "integration_version": manifest.get("version"),
+        "homeassistant_version": HA_VERSION,
+        "python_version": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "latency": session.config.getoption("--bench-latency"),
+        "results": _RESULTS,
+    }, indent=2, sort_keys=True))
+
+
+@pytest.fixture
+def record():
+    """Record a benchmark result: ``record("update_cycle", heaters, {...})``."""
+    def _record(name: str, heaters: int, values: dict) -> None:
+        _RESULTS.setdefault(name, {})[str(heaters)] = values
+    return _record
+
+
+@pytest.fixture(scope="session")
+def loop():
+    """Event loop shared by all benchmarks (no pytest-asyncio needed)."""
+    event_loop = asyncio.new_event_loop()
+    yield event_loop
+    event_loop.close()
+
+
+class BenchEnvironment:
+    """Home Assistant core, simulator, client and coordinator for one fleet size."""
+
+    def __init__(self, heaters: int, latency: str) -> None:
+        """Initialize the environment (call ``async_setup`` before use)."""
+        self.heaters = heaters
+        self.latency = latency
+        self.hass: HomeAssistant | None = None
+        self.simulator: EnviSimulator | None = None
+        self.session: aiohttp.ClientSession | None = None
+        self.client: EnviApiClient | None = None
+        self.coordinator: EnviDataUpdateCoordinator | None = None
+        self.platforms: list[EntityPlatform] = []
+
+    async def async_setup(self, config_dir: str, simulator_config: SimulatorConfig | None = None) -> None:
+        """Start HA core pieces, the simulator and the coordinator."""
+        self.hass = HomeAssistant(config_dir)
+        await device_registry.async_load(self.hass)
+        await entity_registry.async_load(self.hass)
+        entity.async_setup(self.hass)
+
+        self.simulator = EnviSimulator(simulator_config or SimulatorConfig(
+            heaters=self.heaters, latency=LatencyProfile.parse(self.latency)
+        ))
+        base_url = await self.simulator.start()
+        # Large fleets open many parallel connections; don't cap below the fleet size
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+        self.client = EnviApiClient(self.session, "bench@example.com", "bench", base_url=base_url)
+        self.coordinator = EnviDataUpdateCoordinator(self.hass, self.client, "bench_entry")
+        self.hass.data.setdefault(DOMAIN, {})[f"{DOMAIN}_coordinator_bench_entry"] = self.coordinator
+
+    async def async_add_platform(self, domain: str, setup_entry) -> tuple[float, float, int]:
+        """Run a platform's async_setup_entry and add its entities.
+
+        Returns:
+            Tuple of (entity construction seconds, platform add seconds, entity count)
+        """
+        created: list = []
+        fake_entry = SimpleNamespace(entry_id="bench_entry", async_on_unload=lambda _unsub: None)
+
+        start = time.perf_counter()
+        await setup_entry(self.hass, fake_entry, lambda entities, *args, **kwargs: created.extend(entities))
+        constructed = time.perf_counter() - start
+
+        entity_platform = EntityPlatform(
+            hass=self.hass,
+            logger=logging.getLogger(__name__),
+            domain=domain,
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        self.platforms.append(entity_platform)
+        start = time.perf_counter()
+        await entity_platform.async_add_entities(created)
+        added = time.perf_counter() - start
+        return constructed, added, len(created)
+
+    async def async_teardown(self) -> None:
+        """Stop everything started by ``async_setup``."""
+        for entity_platform in self.platforms:
+            await entity_platform.async_reset()
+        if self.session is not None:
+            await self.session.close()
+        if self.simulator is not None:
+            await self.simulator.stop()
+        if self.hass is not None:
+            await self.hass.async_stop(force=True)
+
+
+@pytest.fixture
+def bench_env(loop, heaters, tmp_path, request):
+    """Benchmark environment for the parametrized fleet size."""
+    env = BenchEnvironment(heaters, request.config.getoption("--bench-latency"))
+    loop.run_until_complete(env.async_setup(str(tmp_path)))
+    yield env
+    loop.run_until_complete(env.async_teardown())
@@ -14,8 +14,6 @@ import logging
 
 from datetime import timedelta
 
-from aiohttp import ClientTimeout
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
@@ -25,6 +23,9 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .api import EnviApiClient, EnviAuthenticationError
 from .const import DOMAIN, SCAN_INTERVAL
 from .coordinator import EnviDataUpdateCoordinator
+from .journal import async_remove_journal
+from .pool import PoolSettings, async_create_connection_pool
+from .timeouts import build_timeout_profiles
 from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,13 +35,25 @@ PLATFORMS: list[Platform] = [Platform.CLIMATE, Platform.BINARY_SENSOR, Platform.
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Smart Envi from a config entry."""
-    session = async_get_clientsession(hass)
-    
     # Get options with defaults
     options = entry.options or {}
-    api_timeout = options.get("api_timeout", 15)
     
-    client = EnviApiClient(session, entry.data["username"], entry.data["password"], api_timeout=api_timeout)
+    # Use a connection pool of our own if configured, else HA's shared session
+    pool = None
+    if pool_settings := PoolSettings.from_options(options):
+        pool = async_create_connection_pool(hass, entry, pool_settings)
+        session = pool.session
+    else:
+        session = async_get_clientsession(hass)
+    
+    client = EnviApiClient(
+        session,
+        entry.data["username"],
+        entry.data["password"],
+        hedge_reads=options.get("hedged_requests", False),
+        timeouts=build_timeout_profiles(options),
+        connection_pool=pool,
+    )
 
     try:
         await client.authenticate()
@@ -57,9 +70,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Initialize coordinator with configurable scan interval
     coordinator = EnviDataUpdateCoordinator(hass, client, entry.entry_id, scan_interval)
+    coordinator.async_configure_scan_interval(
+        scan_interval,
+        auto=options.get("auto_scan_interval", False),
+        schedule_aware=options.get("schedule_aware_polling", False),
+    )
     hass.data[DOMAIN][f"{DOMAIN}_coordinator_{entry.entry_id}"] = coordinator
+    # Commands queued during an earlier outage are replayed once the API is reachable
+    await coordinator.journal.async_load()
     await coordinator.async_config_entry_first_refresh()
     
+    # Drop device registry entries for heaters removed while we were offline
+    coordinator.async_remove_stale_devices()
+    
     # Set up options update listener
     entry.async_on_unload(entry.add_update_listener(async_update_options))
     
@@ -74,13 +97,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
-    # Update API client timeout if changed
+    # Update API client timeouts if changed
     options = entry.options or {}
-    api_timeout = options.get("api_timeout", 15)
     
     client = hass.data[DOMAIN].get(entry.entry_id)
     if client:
-        client.timeout = ClientTimeout(total=api_timeout)
+        # The session is created at setup, so pool changes need a reload
+        current_pool = client.connection_pool.settings if client.connection_pool else None
+        if PoolSettings.from_options(options) != current_pool:
+            _LOGGER.info("Connection pool settings changed - reloading entry %s", entry.entry_id)
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+            return
+        client.timeouts = build_timeout_profiles(options)
+        client.hedge_reads = options.get("hedged_requests", False)
     
     # Update coordinator scan interval if changed
     scan_interval_seconds = options.get("scan_interval", 30)
@@ -89,8 +118,18 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     coordinator_key = f"{DOMAIN}_coordinator_{entry.entry_id}"
     coordinator = hass.data[DOMAIN].get(coordinator_key)
     if coordinator:
-        coordinator.update_interval = scan_interval
-        _LOGGER.info("Updated scan interval to %s seconds for entry %s", scan_interval_seconds, entry.entry_id)
+        auto_scan_interval = options.get("auto_scan_interval", False)
+        coordinator.async_configure_scan_interval(
+            scan_interval,
+            auto=auto_scan_interval,
+            schedule_aware=options.get("schedule_aware_polling", False),
+        )
+        _LOGGER.info(
+            "Updated scan interval to %s seconds (%s) for entry %s",
+            scan_interval_seconds,
+            "auto" if auto_scan_interval else "fixed",
+            entry.entry_id,
+        )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -106,3 +145,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN, None)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete commands still queued for a removed config entry."""
+    await async_remove_journal(hass, entry.entry_id)
@@ -2,20 +2,47 @@ import asyncio
 import base64
 import json
 import logging
+import random
+import time
 import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
 
 import aiohttp
-from aiohttp import ClientError, ClientTimeout
+from aiohttp import ClientError
 
+from .circuit import CircuitBreakers
+from .metrics import ApiMetrics, EndpointMetrics, endpoint_class
+from .payload import (
+    DEVICE_REF_SPEC,
+    DEVICE_SPEC,
+    JSON_DECODER,
+    RESPONSE_SPEC,
+    RESPONSE_SPECS,
+    JsonLoads,
+    json_loads as default_json_loads,
+)
+from .retry import RetryBudget, decorrelated_jitter
+from .scheduler import RequestPriority, RequestScheduler, current_priority
+from .timeouts import TimeoutProfile, build_timeout_profiles
+from .trace import trace_span
 from .const import (
     BASE_URL,
     ENDPOINTS,
+    HEDGE_BUDGET_WINDOW,
+    HEDGE_MAX_RATIO,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
     MAX_RETRIES,
     INITIAL_RETRY_DELAY,
     MAX_RETRY_DELAY,
 )
 
+if TYPE_CHECKING:
+    from .pool import ConnectionPool
+
 _LOGGER = logging.getLogger(__name__)
 
 # Retry configuration
@@ -38,13 +65,56 @@ class EnviDeviceError(EnviApiError):
     pass
 
 
+class EnviConnectionError(EnviApiError):
+    """Raised when the Envi cloud can't be reached.
+    
+    Covers network errors, timeouts and server errors that persisted through
+    all retries, i.e. failures worth retrying later rather than fixing the
+    request.
+    """
+    pass
+
+
+class EnviCircuitOpenError(EnviConnectionError):
+    """Raised instead of sending a request while its endpoint's circuit is open.
+    
+    The API failed repeatedly for this endpoint class and is being given
+    time to recover (see circuit.py).
+    """
+    pass
+
+
+class EnviRateLimitError(EnviApiError):
+    """Raised when the API keeps answering 429 (Too Many Requests).
+    
+    The request itself was fine and is worth sending again once the
+    Retry-After window has passed (see ``EnviApiClient.rate_limit_delay``).
+    """
+    pass
+
+
+class EnviRequestShedError(EnviApiError):
+    """Raised when a discovery request is dropped because the account is rate limited.
+    
+    Callers are expected to carry on with what they already know (e.g. the
+    previous device list) and try again on the next cycle.
+    """
+    pass
+
+
 class EnviApiClient:
     def __init__(
         self, 
         session: aiohttp.ClientSession, 
         username: str, 
         password: str,
-        api_timeout: int = 15
+        api_timeout: int = 15,
+        base_url: str = BASE_URL,
+        transport=None,
+        hedge_reads: bool = False,
+        timeouts: dict[str, TimeoutProfile] | None = None,
+        connection_pool: "ConnectionPool | None" = None,
+        json_loads: JsonLoads | None = None,
     ):
         """Initialize Envi API client.
         
@@ -52,16 +122,48 @@ class EnviApiClient:
             session: aiohttp session
             username: Envi account username
             password: Envi account password
-            api_timeout: API request timeout in seconds (default: 15)
+            api_timeout: Request deadline in seconds for endpoint classes without
+                a default of their own (default: 15); ignored if ``timeouts`` is given
+            base_url: API base URL (override to point at a local simulator)
+            transport: Object with an aiohttp-compatible ``request(method, url, **kwargs)``
+                async context manager used for all HTTP calls (default: ``session``).
+                Swapped at runtime to record or replay traffic (see cassette.py).
+            hedge_reads: Send a second copy of GET requests that are slower than
+                their endpoint's p95 latency and use whichever answers first
+            timeouts: Timeout profile per endpoint class (see timeouts.py)
+            connection_pool: Dedicated pool that ``session`` belongs to, if any
+                (see pool.py); its per-host limit caps concurrent requests
+            json_loads: JSON decoder for response bodies (default: orjson if
+                installed, else the standard library; see payload.py)
         """
         self.session = session
+        self.transport = transport or session
         self.username = username
         self.password = password
-        self.base_url = BASE_URL
+        self.base_url = base_url.rstrip("/")
         self.token: str | None = None
         self.token_expires: datetime | None = None
         self._refresh_lock = asyncio.Lock()
-        self.timeout = ClientTimeout(total=api_timeout)
+        # Connect/read/total timeouts per endpoint class
+        self.timeouts = timeouts or build_timeout_profiles({"api_timeout": api_timeout})
+        self.json_loads = json_loads or default_json_loads
+        # Monotonic time until which the API asked us to back off (429 Retry-After)
+        self._rate_limited_until = 0.0
+        # Per-endpoint-class request counters and latency histograms
+        self.metrics = ApiMetrics()
+        # Hands out request slots by priority (user commands first)
+        self.scheduler = RequestScheduler()
+        self.connection_pool = connection_pool
+        if connection_pool is not None:
+            # Queue in the scheduler (by priority), not in the connector (FIFO)
+            self.scheduler.limit = min(self.scheduler.limit, connection_pool.settings.limit_per_host)
+        # Fail fast per endpoint class while the API is down
+        self.breakers = CircuitBreakers()
+        # Retries allowed account-wide, earned by successful requests
+        self.retry_budget = RetryBudget()
+        self.hedge_reads = hedge_reads
+        # Hedges allowed, earned by successful reads
+        self.hedge_budget = RetryBudget(HEDGE_MAX_RATIO, HEDGE_BUDGET_WINDOW, min_retries=0)
 
     async def authenticate(self) -> None:
         """Authenticate with the Envi API and obtain an access token.
@@ -71,9 +173,14 @@ class EnviApiClient:
         otherwise defaults to 365 days.
         
         Raises:
-            EnviAuthenticationError: If authentication fails (invalid credentials,
-                network error, or API rejection)
+            EnviAuthenticationError: If authentication fails (invalid credentials
+                or API rejection)
+            EnviConnectionError: If the API can't be reached
+            EnviCircuitOpenError: If recent logins failed to reach the API
         """
+        breaker = self.breakers["auth"]
+        if not breaker.allow():
+            raise EnviCircuitOpenError(f"Login skipped - API unreachable, retrying in {breaker.retry_in():.0f} s")
         fresh_device_id = f"ha_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
         payload = {
             "username": self.username,
@@ -89,24 +196,55 @@ class EnviApiClient:
             "User-Agent": "HomeAssistant-Envi/1.0",
         }
         _LOGGER.debug("Envi login attempt - device_id: %s", fresh_device_id)
+        metrics = self.metrics["auth"]
+        metrics.requests += 1
+        if self.token is not None:
+            self.metrics.auth_refreshes += 1
+        profile = self.timeouts["auth"]
+        start = time.monotonic()
         try:
-            async with self.session.post(url, json=payload, headers=headers, timeout=self.timeout) as resp:
-                resp_text = await resp.text()
-                _LOGGER.debug("Envi login HTTP %s - %.1000s", resp.status, resp_text)
-                if resp.status != 200:
-                    raise EnviAuthenticationError(f"Login failed (HTTP {resp.status})")
-                data = json.loads(resp_text)
-                if data.get("status") != "success":
-                    msg = data.get("msg", "unknown error")
-                    raise EnviAuthenticationError(f"Envi rejected login: {msg}")
-                self.token = data["data"]["token"]
-                jwt_exp = self._parse_jwt_expiry(self.token)
-                self.token_expires = jwt_exp or (datetime.now(timezone.utc) + timedelta(hours=24))
-                _LOGGER.info(
-                    "Envi login successful - token valid until %s",
-                    self.token_expires.strftime("%Y-%m-%d %H:%M"),
-                )
+            remaining = self._remaining(profile.deadline(), "auth/login")
+            with trace_span("auth"), breaker.attempt():
+                async with self.transport.request(
+                    "POST", url, json=payload, headers=headers, timeout=profile.client_timeout(remaining)
+                ) as resp:
+                    body = await resp.read()
+                    metrics.observe_latency(time.monotonic() - start)
+                    metrics.bytes_received += len(body)
+                    # Body not logged: it carries the access token
+                    _LOGGER.debug("Envi login HTTP %s (%s bytes)", resp.status, len(body))
+                    if resp.status in RETRYABLE_STATUS_CODES:
+                        # Server trouble or rate limiting says nothing about the credentials
+                        if resp.status != 429:
+                            metrics.server_errors += 1
+                            breaker.record_failure()
+                        raise EnviConnectionError(f"Login failed (HTTP {resp.status})")
+                    breaker.record_success()
+                    if resp.status != 200:
+                        raise EnviAuthenticationError(f"Login failed (HTTP {resp.status})")
+                    data = self.json_loads(body)
+                    if data.get("status") != "success":
+                        msg = data.get("msg", "unknown error")
+                        raise EnviAuthenticationError(f"Envi rejected login: {msg}")
+                    self.token = data["data"]["token"]
+                    jwt_exp = self._parse_jwt_expiry(self.token)
+                    self.token_expires = jwt_exp or (datetime.now(timezone.utc) + timedelta(hours=24))
+                    _LOGGER.info(
+                        "Envi login successful - token valid until %s",
+                        self.token_expires.strftime("%Y-%m-%d %H:%M"),
+                    )
+        except EnviConnectionError as err:
+            metrics.errors += 1
+            _LOGGER.error("Envi authentication failed - API unavailable: %s", err)
+            raise
         except Exception as err:
+            metrics.errors += 1
+            if isinstance(err, asyncio.TimeoutError):
+                metrics.timeouts += 1
+            if isinstance(err, RETRYABLE_EXCEPTIONS):
+                breaker.record_failure()
+                _LOGGER.error("Envi authentication failed - API unreachable: %s", err)
+                raise EnviConnectionError(f"Authentication failed - API unreachable: {err}") from err
             _LOGGER.error("Envi authentication failed", exc_info=True)
             raise EnviAuthenticationError("Authentication failed") from err
 
@@ -115,7 +253,7 @@ class EnviApiClient:
         try:
             payload_part = token.split(".")[1]
             payload_part += "=" * (-len(payload_part) % 4)
-            claims = json.loads(base64.urlsafe_b64decode(payload_part))
+            claims = self.json_loads(base64.urlsafe_b64decode(payload_part))
             exp = claims.get("exp")
             if exp:
                 return datetime.fromtimestamp(int(exp), tz=timezone.utc)
@@ -136,15 +274,82 @@ class EnviApiClient:
         if not isinstance(data, dict):
             raise EnviApiError(f"Invalid response format from {endpoint}: expected dict, got {type(data).__name__}")
         
-        # For device list endpoint, check for 'data' key
-        if "device/list" in endpoint:
-            if "data" not in data:
-                _LOGGER.warning("Device list response missing 'data' key: %s", data.keys())
+        # Envelope fields, plus 'data' for the endpoints whose data we read (see payload.py)
+        spec = RESPONSE_SPECS.get(endpoint_class(endpoint), RESPONSE_SPEC)
+        for problem in spec.problems(data):
+            _LOGGER.warning("Unexpected %s: %s", endpoint, problem)
+
+    def as_diagnostics(self) -> dict:
+        """Return client state for the diagnostics download (no credentials).
+        
+        Returns:
+            Token expiry, timeout, rate-limit window and retry configuration
+        """
+        now = datetime.now(timezone.utc)
+        return {
+            "base_url": self.base_url,
+            "authenticated": self.token is not None,
+            "token_expires": self.token_expires.isoformat() if self.token_expires else None,
+            "token_expires_in_s": (
+                round((self.token_expires - now).total_seconds()) if self.token_expires else None
+            ),
+            "timeouts": {name: profile.as_dict() for name, profile in self.timeouts.items()},
+            "rate_limited_for_s": round(self.rate_limit_delay(), 1),
+            "retry": {
+                "max_retries": MAX_RETRIES,
+                "initial_delay_s": INITIAL_RETRY_DELAY,
+                "max_delay_s": MAX_RETRY_DELAY,
+                "backoff": "decorrelated_jitter",
+                "retryable_status_codes": list(RETRYABLE_STATUS_CODES),
+                "budget": self.retry_budget.as_dict(),
+            },
+            "transport": type(self.transport).__name__,
+            "json_decoder": JSON_DECODER if self.json_loads is default_json_loads else repr(self.json_loads),
+            "connection_pool": (
+                self.connection_pool.as_dict() if self.connection_pool else {"dedicated": False}
+            ),
+            "hedge_reads": self.hedge_reads,
+            "hedge_budget": self.hedge_budget.as_dict(),
+            "scheduler": self.scheduler.as_dict(),
+            "circuits": self.breakers.as_dict(),
+        }
+
+    def rate_limit_delay(self) -> float:
+        """Return how many seconds callers should wait before the next request.
+        
+        Non-zero only while a 429 Retry-After window reported by the API is
+        still running. Bulk operations use this to pause their fan-out instead
+        of piling more requests onto a rate-limited account.
+        """
+        return max(0.0, self._rate_limited_until - time.monotonic())
+
+    @staticmethod
+    def _remaining(deadline: float, endpoint: str) -> float:
+        """Return the seconds left before ``deadline``.
         
-        # For device endpoints, check for 'data' key
-        if endpoint.startswith("device/") and not endpoint.endswith("/list"):
-            if "data" not in data:
-                _LOGGER.warning("Device response missing 'data' key: %s", data.keys())
+        Raises:
+            EnviConnectionError: If the deadline has passed
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise EnviConnectionError(f"Deadline exceeded for {endpoint}")
+        return remaining
+
+    @asynccontextmanager
+    async def _slot(self, priority: RequestPriority, deadline: float, endpoint: str):
+        """Hold a scheduler slot, waiting for it no longer than the request's deadline.
+        
+        Raises:
+            EnviConnectionError: If the deadline passes before a slot is granted
+        """
+        async with AsyncExitStack() as stack:
+            try:
+                await stack.enter_async_context(
+                    self.scheduler.slot(priority, timeout=self._remaining(deadline, endpoint))
+                )
+            except asyncio.TimeoutError:
+                raise EnviConnectionError(f"Deadline exceeded for {endpoint} while queued") from None
+            yield
 
     async def _request(self, method: str, endpoint: str, **kwargs) -> dict:
         """Internal request with automatic token refresh, retry logic, and error handling.
@@ -153,8 +358,19 @@ class EnviApiClient:
         - Automatic token refresh
         - Retry with exponential backoff for transient errors
         - Rate limiting protection (429 handling)
+        - Priority scheduling (see scheduler.py)
+        - Per-endpoint-class timeouts and request deadline (see timeouts.py)
         - Comprehensive error handling
+        
+        Raises:
+            EnviRequestShedError: If this is a discovery request and the API
+                asked us to back off
         """
+        if current_priority(method) >= RequestPriority.DISCOVERY and self.rate_limit_delay() > 0:
+            self.scheduler.shed += 1
+            _LOGGER.debug("Rate limited - skipping discovery request %s %s", method, endpoint)
+            raise EnviRequestShedError(f"Skipped {endpoint} while rate limited")
+
         if self.token is None:
             await self.authenticate()
 
@@ -174,96 +390,281 @@ class EnviApiClient:
         kwargs["headers"] = headers
         url = f"{self.base_url}/{endpoint}"
 
-        # Retry loop with exponential backoff
+        metrics = self.metrics.for_endpoint(endpoint)
+        # Shared by all attempts (and hedged copies) of this request
+        deadline = self.timeouts[endpoint_class(endpoint)].deadline()
+        try:
+            if self.hedge_reads and method.upper() == "GET":
+                return await self._request_hedged(endpoint, url, metrics, deadline, **kwargs)
+            return await self._request_with_retries(method, endpoint, url, metrics, deadline, **kwargs)
+        except Exception:
+            metrics.errors += 1
+            raise
+
+    async def _request_hedged(
+        self, endpoint: str, url: str, metrics: EndpointMetrics, deadline: float, **kwargs
+    ) -> dict:
+        """Send a GET, and a second copy if the first is slower than usual.
+        
+        Once the endpoint class has enough recent latency samples, a request
+        still unanswered at its recent p95 latency is sent again (if the
+        hedge budget allows) and the first successful answer wins; the other
+        copy is cancelled. Only used for reads, which are safe to send twice.
+        Both copies share the request's deadline.
+        
+        The p95 is per-attempt HTTP latency, so the hedge delay is counted
+        from when the first copy actually goes out: time spent waiting for a
+        scheduler slot or a 429 window doesn't count. A hedge is only sent
+        if it can start without queuing behind other requests, since one
+        that waits for a slot wouldn't answer any sooner.
+        
+        Raises:
+            EnviApiError: The error of the last copy to fail, if none succeeded
+        """
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(
+            self._request_with_retries("GET", endpoint, url, metrics, deadline, sent=sent, **kwargs)
+        )
+        tasks = {primary}
+        try:
+            sending = asyncio.ensure_future(sent.wait())
+            try:
+                await asyncio.wait({primary, sending}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                sending.cancel()
+            recent = metrics.recent_latency.histogram()
+            delay = recent.percentile(HEDGE_PERCENTILE) if recent.count >= HEDGE_MIN_SAMPLES else None
+            if delay is not None and not primary.done():
+                done, _ = await asyncio.wait(tasks, timeout=max(delay, HEDGE_MIN_DELAY))
+                if (
+                    not done
+                    and self.scheduler.can_start(current_priority("GET"))
+                    and self.hedge_budget.try_spend()
+                ):
+                    metrics.hedged += 1
+                    _LOGGER.debug("GET %s slower than p95 (%.0f ms) - sending a hedged request", endpoint, delay * 1000)
+                    hedge_kwargs = {**kwargs, "headers": dict(kwargs["headers"])}
+                    with trace_span("hedge", endpoint=endpoint, delay=round(delay, 3)):
+                        tasks.add(asyncio.ensure_future(
+                            self._request_with_retries("GET", endpoint, url, metrics, deadline, **hedge_kwargs)
+                        ))
+
+            error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            metrics.hedge_wins += 1
+                        self.hedge_budget.record_success()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        metrics: EndpointMetrics,
+        deadline: float,
+        sent: asyncio.Event | None = None,
+        **kwargs,
+    ) -> dict:
+        """Send a request, retrying transient failures with jittered backoff.
+        
+        Retry delays use decorrelated jitter (never shorter than a 429's
+        Retry-After), and every retry must be granted by the account's retry
+        budget; once that is spent the failure is raised straight away (see
+        retry.py).
+        
+        Every attempt is counted in ``metrics``. Latency is measured per
+        attempt, up to the response headers for error statuses and up to the
+        full body for successful responses. Backoff sleeps happen after the
+        response is released, so a sleeping retry doesn't hold a connection
+        or a scheduler slot, and are traced separately from the HTTP attempts.
+        
+        All attempts, slot waits and backoff sleeps must fit before
+        ``deadline`` (time.monotonic()); each attempt's total timeout is the
+        time left, and a retry that wouldn't fit isn't made.
+        
+        Every attempt is first checked against the endpoint's circuit breaker,
+        so once the API is considered down, retries in progress stop instead of
+        sleeping through the rest of their schedule.
+        
+        Each attempt waits for a scheduler slot at the request's priority, but
+        no longer than the deadline allows.
+        Background requests (polls and below) also wait out a running 429
+        window instead of adding to it; user commands go straight out.
+        ``sent``, if given, is set when the first attempt is sent.
+        """
+        headers = kwargs["headers"]
+        priority = current_priority(method)
+        breaker = self.breakers.for_endpoint(endpoint)
+        profile = self.timeouts[breaker.name]
         last_exception = None
+        backoff = INITIAL_RETRY_DELAY
         for attempt in range(MAX_RETRIES + 1):
-            try:
-                async with self.session.request(method.upper(), url, timeout=self.timeout, **kwargs) as resp:
-                    # Handle authentication errors (always retry once)
-                    if resp.status in (401, 403):
-                        if attempt == 0:  # Only retry auth errors once
-                            _LOGGER.info("Token expired - refreshing automatically")
-                            async with self._refresh_lock:
-                                await self.authenticate()
-                                headers["Authorization"] = f"Bearer {self.token}"
-                                kwargs["headers"] = headers
-                            continue  # Retry the request
-                        else:
-                            _LOGGER.error("Authentication failed after retry")
-                            raise EnviAuthenticationError("Authentication failed")
-                    
-                    # Handle rate limiting (429)
-                    if resp.status == 429:
-                        retry_after = int(resp.headers.get("Retry-After", INITIAL_RETRY_DELAY * (2 ** attempt)))
-                        if attempt < MAX_RETRIES:
-                            _LOGGER.warning(
-                                "Rate limited (429). Retrying after %s seconds (attempt %s/%s)",
-                                retry_after, attempt + 1, MAX_RETRIES + 1
-                            )
-                            await asyncio.sleep(min(retry_after, MAX_RETRY_DELAY))
-                            continue
-                        else:
-                            _LOGGER.error("Rate limited (429) - max retries exceeded")
-                            raise EnviApiError("Rate limited - too many requests")
-                    
-                    # Handle server errors (retryable)
-                    if resp.status in RETRYABLE_STATUS_CODES:
+            if priority >= RequestPriority.POLL and (wait := self.rate_limit_delay()) > 0:
+                if wait >= deadline - time.monotonic():
+                    raise EnviRateLimitError("Rate limited - too many requests") from last_exception
+                with trace_span("rate_limit_wait", endpoint=endpoint, delay=round(wait, 3)):
+                    await asyncio.sleep(wait)
+            # Set by attempts that failed in a retryable way
+            retry_delay: float | None = None
+            retry_reason = ""
+            retry_error: EnviApiError | None = None
+            async with self._slot(priority, deadline, endpoint):
+                remaining = self._remaining(deadline, endpoint)
+                # Checked once the slot is granted, so queued requests see a circuit that opened meanwhile
+                if not breaker.allow():
+                    _LOGGER.debug("Envi API %s circuit open - not sending %s %s", breaker.name, method, endpoint)
+                    raise EnviCircuitOpenError(
+                        f"Envi API unreachable ({breaker.name}) - retrying in {breaker.retry_in():.0f} s"
+                    ) from last_exception
+                metrics.requests += 1
+                if attempt:
+                    metrics.retries += 1
+                if sent is not None:
+                    sent.set()
+                start = time.monotonic()
+                with trace_span("http", method=method.upper(), endpoint=endpoint, attempt=attempt) as span, breaker.attempt():
+                    try:
+                        async with self.transport.request(
+                            method.upper(), url, timeout=profile.client_timeout(remaining), **kwargs
+                        ) as resp:
+                            if span is not None:
+                                span.attributes["status"] = resp.status
+                            # Any answer but a server error means the API is up
+                            if resp.status in RETRYABLE_STATUS_CODES and resp.status != 429:
+                                breaker.record_failure()
+                            else:
+                                breaker.record_success()
+                            if resp.status != 200:
+                                metrics.observe_latency(time.monotonic() - start)
+
+                            # Handle authentication errors (always retry once)
+                            if resp.status in (401, 403):
+                                if attempt == 0:  # Only retry auth errors once
+                                    _LOGGER.info("Token expired - refreshing automatically")
+                                    async with self._refresh_lock:
+                                        await self.authenticate()
+                                        headers["Authorization"] = f"Bearer {self.token}"
+                                        kwargs["headers"] = headers
+                                    continue  # Retry the request
+                                else:
+                                    _LOGGER.error("Authentication failed after retry")
+                                    raise EnviAuthenticationError("Authentication failed")
+                        
+                            # Handle rate limiting (429)
+                            if resp.status == 429:
+                                metrics.rate_limited += 1
+                                retry_after = int(resp.headers.get("Retry-After", INITIAL_RETRY_DELAY * (2 ** attempt)))
+                                self._rate_limited_until = max(
+                                    self._rate_limited_until,
+                                    time.monotonic() + min(retry_after, MAX_RETRY_DELAY),
+                                )
+                                if attempt < MAX_RETRIES:
+                                    # Jitter on top of Retry-After so the fleet doesn't retry in lockstep
+                                    retry_delay = min(retry_after + random.uniform(0, INITIAL_RETRY_DELAY), MAX_RETRY_DELAY)
+                                    retry_reason = "Rate limited (429)"
+                                    retry_error = EnviRateLimitError("Rate limited - too many requests")
+                                else:
+                                    _LOGGER.error("Rate limited (429) - max retries exceeded")
+                                    raise EnviRateLimitError("Rate limited - too many requests")
+                        
+                            # Handle server errors (retryable)
+                            elif resp.status in RETRYABLE_STATUS_CODES:
+                                metrics.server_errors += 1
+                                if attempt < MAX_RETRIES:
+                                    retry_delay = backoff = decorrelated_jitter(backoff)
+                                    retry_reason = f"Server error {resp.status}"
+                                    retry_error = EnviConnectionError(f"Server error {resp.status}")
+                                else:
+                                    _LOGGER.error("Server error %s - max retries exceeded", resp.status)
+                                    resp.raise_for_status()
+                        
+                            # Don't raise on 400 - we want to handle it ourselves
+                            elif resp.status == 400:
+                                data = self.json_loads(await resp.read())
+                                msg = data.get("msg", "Bad Request")
+                                msg_code = data.get("msgCode", "unknown")
+                                _LOGGER.error("API returned 400 Bad Request: %s (code: %s). Payload may be invalid.", msg, msg_code)
+                                raise EnviApiError(f"Bad Request: {msg} (code: {msg_code})")
+                        
+                            else:
+                                resp.raise_for_status()
+                                body = await resp.read()
+                                metrics.observe_latency(time.monotonic() - start)
+                                metrics.bytes_received += len(body)
+                                data = self.json_loads(body)
+                            
+                                # Validate response structure
+                                self._validate_response(data, endpoint)
+                            
+                                # Check API-level success status (some endpoints may not use status field)
+                                api_status = data.get("status")
+                                if api_status is not None and api_status != "success":
+                                    msg = data.get("msg", "Unknown error")
+                                    msg_code = data.get("msgCode", "unknown")
+                                    _LOGGER.warning("API returned error: %s (code: %s)", msg, msg_code)
+                                    raise EnviApiError(f"API error: {msg} (code: {msg_code})")
+                            
+                                self.retry_budget.record_success()
+                                return data
+                        
+                    except RETRYABLE_EXCEPTIONS as err:
+                        if isinstance(err, aiohttp.ClientResponseError) and err.status < 500:
+                            # The API understood and refused the request (e.g. 404, 409, 422):
+                            # sending it again won't help, so no retry and no retry budget
+                            _LOGGER.error("API rejected %s %s with HTTP %s", method, endpoint, err.status)
+                            raise EnviApiError(f"Request rejected (HTTP {err.status}): {err.message}") from err
+                        last_exception = err
+                        if not isinstance(err, aiohttp.ClientResponseError):
+                            # HTTP errors were already counted when the response arrived
+                            breaker.record_failure()
+                        if isinstance(err, asyncio.TimeoutError):
+                            metrics.timeouts += 1
+                            metrics.observe_latency(time.monotonic() - start)
                         if attempt < MAX_RETRIES:
-                            delay = min(INITIAL_RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
-                            _LOGGER.warning(
-                                "Server error %s. Retrying after %s seconds (attempt %s/%s)",
-                                resp.status, delay, attempt + 1, MAX_RETRIES + 1
-                            )
-                            await asyncio.sleep(delay)
-                            continue
+                            retry_delay = backoff = decorrelated_jitter(backoff)
+                            retry_reason = f"Network error during API request: {err}"
+                            retry_error = EnviConnectionError(f"Network error: {err}")
                         else:
-                            _LOGGER.error("Server error %s - max retries exceeded", resp.status)
-                            resp.raise_for_status()
-                    
-                    # Don't raise on 400 - we want to handle it ourselves
-                    if resp.status == 400:
-                        data = await resp.json()
-                        msg = data.get("msg", "Bad Request")
-                        msg_code = data.get("msgCode", "unknown")
-                        _LOGGER.error("API returned 400 Bad Request: %s (code: %s). Payload may be invalid.", msg, msg_code)
-                        raise EnviApiError(f"Bad Request: {msg} (code: {msg_code})")
-                    
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    
-                    # Validate response structure
-                    self._validate_response(data, endpoint)
-                    
-                    # Check API-level success status (some endpoints may not use status field)
-                    api_status = data.get("status")
-                    if api_status is not None and api_status != "success":
-                        msg = data.get("msg", "Unknown error")
-                        msg_code = data.get("msgCode", "unknown")
-                        _LOGGER.warning("API returned error: %s (code: %s)", msg, msg_code)
-                        raise EnviApiError(f"API error: {msg} (code: {msg_code})")
-                    
-                    return data
-                    
-            except RETRYABLE_EXCEPTIONS as err:
-                last_exception = err
-                if attempt < MAX_RETRIES:
-                    delay = min(INITIAL_RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
-                    _LOGGER.warning(
-                        "Network error during API request: %s. Retrying after %s seconds (attempt %s/%s)",
-                        err, delay, attempt + 1, MAX_RETRIES + 1
+                            _LOGGER.error("Network error - max retries exceeded: %s", err)
+                            raise EnviConnectionError(f"Network error: {err}") from err
+                    except json.JSONDecodeError as err:
+                        _LOGGER.error("Invalid JSON response from API: %s", err)
+                        raise EnviApiError("Invalid response from API") from err
+
+            if retry_delay is not None:
+                if retry_delay >= deadline - time.monotonic():
+                    _LOGGER.debug(
+                        "%s. No time left before the %s deadline - not retrying %s %s",
+                        retry_reason, breaker.name, method, endpoint,
                     )
-                    await asyncio.sleep(delay)
-                    continue
-                else:
-                    _LOGGER.error("Network error - max retries exceeded: %s", err)
-                    raise EnviApiError(f"Network error: {err}") from err
-            except json.JSONDecodeError as err:
-                _LOGGER.error("Invalid JSON response from API: %s", err)
-                raise EnviApiError("Invalid response from API") from err
+                    raise retry_error from last_exception
+                if not self.retry_budget.try_spend():
+                    metrics.retries_denied += 1
+                    _LOGGER.debug(
+                        "%s. Retry budget spent - not retrying %s %s", retry_reason, method, endpoint
+                    )
+                    raise retry_error from last_exception
+                _LOGGER.warning(
+                    "%s. Retrying after %.1f seconds (attempt %s/%s)",
+                    retry_reason, retry_delay, attempt + 1, MAX_RETRIES + 1
+                )
+                with trace_span("retry_sleep", endpoint=endpoint, delay=retry_delay):
+                    await asyncio.sleep(retry_delay)
         
         # If we exhausted retries, raise the last exception
         if last_exception:
-            raise EnviApiError(f"Request failed after {MAX_RETRIES + 1} attempts: {last_exception}") from last_exception
+            raise EnviConnectionError(
+                f"Request failed after {MAX_RETRIES + 1} attempts: {last_exception}"
+            ) from last_exception
         raise EnviApiError("Request failed - unknown error")
 
     async def fetch_all_device_ids(self) -> list[str]:
@@ -280,11 +681,11 @@ class EnviApiClient:
             if not isinstance(device, dict):
                 _LOGGER.warning("Invalid device entry: expected dict, got %s", type(device).__name__)
                 continue
+            if problems := DEVICE_REF_SPEC.problems(device):
+                _LOGGER.warning("Invalid device entry %s: %s", device, "; ".join(problems))
             device_id = device.get("id")
             if device_id:
                 device_ids.append(str(device_id))
-            else:
-                _LOGGER.warning("Device entry missing 'id' field: %s", device)
         
         return device_ids
 
@@ -298,9 +699,9 @@ class EnviApiClient:
             _LOGGER.error("Invalid device data format for device %s: expected dict, got %s", device_id, type(device_data).__name__)
             return {}
         
-        # Validate required fields
-        if "id" not in device_data and "serial_no" not in device_data:
-            _LOGGER.warning("Device data missing identifier fields: %s", list(device_data.keys()))
+        # Validate the fields the entities read
+        if problems := DEVICE_SPEC.problems(device_data):
+            _LOGGER.warning("Unexpected data for device %s: %s", device_id, "; ".join(problems))
         
         return device_data
 
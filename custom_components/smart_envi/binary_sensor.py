@@ -7,13 +7,15 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorDeviceClass,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED, SIGNAL_DEVICES_REMOVED
 from .coordinator import EnviDataUpdateCoordinator
+from .models import EnviDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,29 +37,6 @@ class EnviBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self._device_name = device_name
         self._attr_unique_id = f"{DOMAIN}_{device_id}_{sensor_type}"
         self._attr_name = f"{device_name} {self._get_sensor_name()}"
-    
-    def _parse_inverted_bool(self, value, default_on: bool = True) -> bool:
-        """Parse API boolean values with inverted semantics.
-        
-        API returns True when feature is OFF, False when ON.
-        
-        Args:
-            value: API value (bool, int, str, or None)
-            default_on: Default value if None or unexpected type
-            
-        Returns:
-            Inverted boolean (True = feature ON, False = feature OFF)
-        """
-        if value is None:
-            return default_on
-        if isinstance(value, bool):
-            return not value
-        if isinstance(value, (int, str)):
-            if value in (1, "true", "True", "1"):
-                return False  # API True = OFF
-            if value in (0, "false", "False", "0"):
-                return True   # API False = ON
-        return not bool(value)
 
     def _get_sensor_name(self) -> str:
         """Get human-readable sensor name."""
@@ -79,18 +58,31 @@ class EnviBinarySensor(CoordinatorEntity, BinarySensorEntity):
             manufacturer="EHEAT",
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Populate initial state from cached coordinator data.
+        
+        Avoids update_before_add, which would request a coordinator refresh
+        for every entity added (including heaters discovered at runtime).
+        """
+        await super().async_added_to_hass()
+        self._update_from_coordinator()
+
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self._update_from_coordinator()
         self.async_write_ha_state()
 
     def _update_from_coordinator(self) -> None:
-        """Update sensor state from coordinator data."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if not data:
+        """Update sensor state from the device model."""
+        device = self.coordinator.get_device(self.device_id)
+        if device is None:
+            self._attr_available = False
             return
-        # Override in subclasses
-        pass
+        self._attr_available = True
+        self._update_from_device(device)
+
+    def _update_from_device(self, device: EnviDevice) -> None:
+        """Update state from the device model (override in subclasses)."""
 
 
 class EnviFreezeProtectBinarySensor(EnviBinarySensor):
@@ -109,25 +101,10 @@ class EnviFreezeProtectBinarySensor(EnviBinarySensor):
         """Initialize freeze protection sensor."""
         super().__init__(coordinator, device_id, "freeze_protect", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update freeze protection state."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            freeze_protect = data.get("freeze_protect_setting")
-            # API returns inverted values: True=OFF, False=ON
-            self._attr_is_on = self._parse_inverted_bool(freeze_protect, default_on=True)
-            
-            _LOGGER.debug(
-                "Freeze protect for %s (%s): raw=%s (type=%s), is_on=%s (inverted)",
-                self.device_id,
-                self._device_name,
-                freeze_protect,
-                type(freeze_protect).__name__,
-                self._attr_is_on
-            )
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        # The model already undoes the API's inverted value (True=OFF)
+        self._attr_is_on = device.freeze_protect
 
 
 class EnviChildLockBinarySensor(EnviBinarySensor):
@@ -145,26 +122,10 @@ class EnviChildLockBinarySensor(EnviBinarySensor):
         """Initialize child lock sensor."""
         super().__init__(coordinator, device_id, "child_lock", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update child lock state."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            child_lock = data.get("child_lock_setting")
-            # API returns inverted values: True=OFF, False=ON
-            # Default to False (unlocked) if None
-            self._attr_is_on = self._parse_inverted_bool(child_lock, default_on=False)
-            
-            _LOGGER.debug(
-                "Child lock for %s (%s): raw=%s (type=%s), is_on=%s (inverted)",
-                self.device_id,
-                self._device_name,
-                child_lock,
-                type(child_lock).__name__,
-                self._attr_is_on
-            )
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        # The model already undoes the API's inverted value (True=OFF)
+        self._attr_is_on = device.child_lock
 
 
 class EnviScheduleActiveBinarySensor(EnviBinarySensor):
@@ -183,14 +144,9 @@ class EnviScheduleActiveBinarySensor(EnviBinarySensor):
         """Initialize schedule active sensor."""
         super().__init__(coordinator, device_id, "schedule_active", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update schedule active state."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            self._attr_is_on = data.get("is_schedule_active", False)
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_is_on = device.schedule_active
 
 
 class EnviHoldBinarySensor(EnviBinarySensor):
@@ -209,14 +165,9 @@ class EnviHoldBinarySensor(EnviBinarySensor):
         """Initialize hold sensor."""
         super().__init__(coordinator, device_id, "hold", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update hold state."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            self._attr_is_on = data.get("is_hold", False)
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_is_on = device.hold
 
 
 class EnviOnlineBinarySensor(EnviBinarySensor):
@@ -235,16 +186,15 @@ class EnviOnlineBinarySensor(EnviBinarySensor):
         super().__init__(coordinator, device_id, "online", device_name)
 
     def _update_from_coordinator(self) -> None:
-        """Update online state."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            # Device is online if we have data and device_status is 1
-            device_status = data.get("device_status", 0)
-            self._attr_is_on = device_status == 1 and self.coordinator.last_update_success
-            self._attr_available = True
-        else:
+        """Show the heater as offline while there is no data for it."""
+        super()._update_from_coordinator()
+        if not self._attr_available:
             self._attr_is_on = False
-            self._attr_available = False
+
+    def _update_from_device(self, device: EnviDevice) -> None:
+        """Update online state."""
+        # Device is online if we have data and the cloud reports it connected
+        self._attr_is_on = device.online and self.coordinator.last_update_success
 
 
 async def async_setup_entry(
@@ -252,18 +202,70 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities,
 ):
-    """Set up Envi binary sensors from a config entry."""
-    _LOGGER.debug("Setting up binary sensors for entry %s", entry.entry_id)
+    """Set up Envi binary sensors from a config entry.
     
-    # Get or create coordinator
-    coordinator_key = f"{DOMAIN}_coordinator_{entry.entry_id}"
+    Binary sensors for heaters discovered later by the coordinator are
+    added incrementally, without reloading the config entry.
+    """
+    _LOGGER.debug("Setting up binary sensors for entry %s", entry.entry_id)
     
     # Get coordinator (should already be created in __init__.py)
+    coordinator_key = f"{DOMAIN}_coordinator_{entry.entry_id}"
     coordinator = hass.data.get(DOMAIN, {}).get(coordinator_key)
     if not coordinator:
         _LOGGER.error("Coordinator not found for entry %s", entry.entry_id)
         return
     
+    known_device_ids: set[str] = set()
+
+    @callback
+    def _async_add_devices(device_ids: list[str]) -> None:
+        """Create binary sensors for devices not seen before."""
+        new_ids = [device_id for device_id in device_ids if device_id not in known_device_ids]
+        if not new_ids:
+            return
+
+        # Create binary sensors for each device
+        binary_sensors = []
+        for device_id in new_ids:
+            try:
+                device = coordinator.get_device(device_id)
+                device_name = device.name if device and device.name else f"Heater {device_id}"
+                _LOGGER.debug("Creating binary sensors for device %s (%s)", device_id, device_name)
+
+                # Create all binary sensors for this device
+                binary_sensors.extend(
+                    [
+                        EnviFreezeProtectBinarySensor(coordinator, device_id, device_name),
+                        EnviChildLockBinarySensor(coordinator, device_id, device_name),
+                        EnviScheduleActiveBinarySensor(coordinator, device_id, device_name),
+                        EnviHoldBinarySensor(coordinator, device_id, device_name),
+                        EnviOnlineBinarySensor(coordinator, device_id, device_name),
+                    ]
+                )
+                known_device_ids.add(device_id)
+            except Exception as e:
+                _LOGGER.error("Error creating binary sensors for device %s: %s", device_id, e, exc_info=True)
+
+        if not binary_sensors:
+            _LOGGER.error("No binary sensors created!")
+            return
+
+        _LOGGER.info("Created %s binary sensors for %s devices", len(binary_sensors), len(new_ids))
+        async_add_entities(binary_sensors)
+
+    @callback
+    def _async_remove_devices(device_ids: list[str]) -> None:
+        """Forget removed devices so they are re-created if they come back."""
+        known_device_ids.difference_update(device_ids)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_REMOVED.format(entry.entry_id), _async_remove_devices)
+    )
+
     device_ids = coordinator.device_ids
 
     if not device_ids:
@@ -271,32 +273,4 @@ async def async_setup_entry(
         return
 
     _LOGGER.info("Found %s devices for binary sensors: %s", len(device_ids), device_ids)
-
-    # Create binary sensors for each device
-    binary_sensors = []
-    for device_id in device_ids:
-        try:
-            device_data = coordinator.get_device_data(device_id) or {}
-            device_name = device_data.get("name", f"Heater {device_id}")
-            _LOGGER.debug("Creating binary sensors for device %s (%s)", device_id, device_name)
-
-            # Create all binary sensors for this device
-            binary_sensors.extend(
-                [
-                    EnviFreezeProtectBinarySensor(coordinator, device_id, device_name),
-                    EnviChildLockBinarySensor(coordinator, device_id, device_name),
-                    EnviScheduleActiveBinarySensor(coordinator, device_id, device_name),
-                    EnviHoldBinarySensor(coordinator, device_id, device_name),
-                    EnviOnlineBinarySensor(coordinator, device_id, device_name),
-                ]
-            )
-        except Exception as e:
-            _LOGGER.error("Error creating binary sensors for device %s: %s", device_id, e, exc_info=True)
-
-    if not binary_sensors:
-        _LOGGER.error("No binary sensors created!")
-        return
-
-    _LOGGER.info("Created %s binary sensors for %s devices", len(binary_sensors), len(device_ids))
-    async_add_entities(binary_sensors, update_before_add=True)
-
+    _async_add_devices(device_ids)
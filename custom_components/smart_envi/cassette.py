@@ -0,0 +1,316 @@
+"""HTTP cassette recording and replay for the Envi API client.
+
+A cassette is a compact JSON (optionally gzipped) file with the sequence of
+requests the client made and the responses it got back, including how long each
+response took. Credentials and tokens are redacted before anything is written.
+
+Recording wraps the client's transport::
+
+    recorder = CassetteRecorder(client.transport)
+    client.transport = recorder
+    ...
+    client.transport = recorder.transport
+    await hass.async_add_executor_job(recorder.save, "envi.cassette.json.gz")
+
+A recording is kept in memory, so it stops by itself once it holds
+MAX_RECORDED_INTERACTIONS interactions or has run for MAX_RECORDING_DURATION;
+later requests pass through unrecorded and the cassette notes how many were
+missed.
+
+Replaying swaps the transport for a player, so a captured incident (a 429
+storm, a slow ``device/list``) can be run offline against the client and
+coordinator with the original or scaled latency::
+
+    client.transport = CassettePlayer.load("envi.cassette.json.gz", latency_scale=0.5)
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+REDACTED = "**REDACTED**"
+
+# Keys whose values are replaced anywhere in request or response bodies
+REDACT_KEYS = frozenset({
+    "password",
+    "username",
+    "email",
+    "token",
+    "access_token",
+    "refresh_token",
+    "serial_no",
+})
+# Response headers worth keeping (everything else is dropped)
+KEEP_HEADERS = ("Content-Type", "Retry-After")
+
+# A forgotten recording stops at whichever limit comes first
+MAX_RECORDED_INTERACTIONS = 20000
+MAX_RECORDING_DURATION = 3600  # seconds
+
+
+class CassetteError(Exception):
+    """Raised when a cassette can't be replayed (no matching interaction)."""
+
+
+def redact(value: Any) -> Any:
+    """Return a copy of a JSON value with credentials and tokens redacted."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in REDACT_KEYS and value[key] is not None else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def _redact_body(body: bytes) -> str:
+    """Redact a response body, keeping non-JSON bodies as-is."""
+    text = body.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(redact(json.loads(text)), separators=(",", ":"))
+    except ValueError:
+        return text
+
+
+class CassetteResponse:
+    """Minimal stand-in for ``aiohttp.ClientResponse`` backed by a recorded body."""
+
+    def __init__(self, method: str, url: str, status: int, headers: dict, body: str) -> None:
+        """Initialize the response."""
+        self.method = method
+        self.url = URL(url)
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self._body = body
+
+    async def read(self) -> bytes:
+        """Return the body as bytes."""
+        return self._body.encode("utf-8")
+
+    async def text(self, encoding: str | None = None) -> str:
+        """Return the body as text."""
+        return self._body
+
+    async def json(self, *, loads=json.loads, **kwargs) -> Any:
+        """Decode the body as JSON."""
+        return loads(self._body)
+
+    def raise_for_status(self) -> None:
+        """Raise ``aiohttp.ClientResponseError`` for 4xx/5xx statuses."""
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url),
+                (),
+                status=self.status,
+                message=f"HTTP {self.status}",
+                headers=self.headers,
+            )
+
+
+def _request_path(url: str) -> str:
+    """Return the part of a URL used to match interactions (path, no host)."""
+    return URL(url).path_qs
+
+
+class CassetteRecorder:
+    """Transport wrapper that records every request/response it passes through."""
+
+    def __init__(
+        self,
+        transport: Any,
+        max_interactions: int = MAX_RECORDED_INTERACTIONS,
+        max_duration: float = MAX_RECORDING_DURATION,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            transport: Transport to forward requests to (usually the
+                ``aiohttp.ClientSession`` the client was using)
+            max_interactions: Interactions to record before stopping
+            max_duration: Seconds to record before stopping
+        """
+        self.transport = transport
+        self.max_interactions = max_interactions
+        self.max_duration = max_duration
+        self.interactions: list[dict] = []
+        # Interactions started but not yet in ``interactions``
+        self._in_flight = 0
+        # Why recording stopped early, and how many requests went unrecorded since
+        self.truncated: str | None = None
+        self.dropped = 0
+        self._started = time.monotonic()
+
+    @property
+    def recording(self) -> bool:
+        """Whether requests are still being recorded."""
+        if self.truncated is None:
+            if len(self.interactions) + self._in_flight >= self.max_interactions:
+                self._truncate(f"reached {self.max_interactions} interactions")
+            elif time.monotonic() - self._started >= self.max_duration:
+                self._truncate(f"ran for {self.max_duration:.0f} seconds")
+        return self.truncated is None
+
+    def _truncate(self, reason: str) -> None:
+        """Stop recording further requests."""
+        self.truncated = reason
+        _LOGGER.warning(
+            "API recording %s - no longer recording (call stop_api_recording to save what was captured)",
+            reason,
+        )
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs) -> AsyncIterator[CassetteResponse]:
+        """Forward a request and record the response."""
+        if not self.recording:
+            self.dropped += 1
+            async with self.transport.request(method, url, **kwargs) as resp:
+                yield resp
+            return
+
+        interaction: dict[str, Any] = {
+            "offset": round(time.monotonic() - self._started, 4),
+            "method": method.upper(),
+            "path": _request_path(url),
+        }
+        if kwargs.get("json") is not None:
+            interaction["request"] = redact(kwargs["json"])
+
+        start = time.monotonic()
+        self._in_flight += 1
+        try:
+            async with self.transport.request(method, url, **kwargs) as resp:
+                body = await resp.read()
+                interaction["duration"] = round(time.monotonic() - start, 4)
+                interaction["status"] = resp.status
+                interaction["headers"] = {
+                    header: resp.headers[header] for header in KEEP_HEADERS if header in resp.headers
+                }
+                interaction["body"] = _redact_body(body)
+                response = CassetteResponse(
+                    method, url, resp.status, dict(resp.headers), body.decode("utf-8", errors="replace")
+                )
+        except asyncio.TimeoutError:
+            interaction["duration"] = round(time.monotonic() - start, 4)
+            interaction["error"] = "timeout"
+            self.interactions.append(interaction)
+            raise
+        except aiohttp.ClientError as err:
+            interaction["duration"] = round(time.monotonic() - start, 4)
+            interaction["error"] = type(err).__name__
+            self.interactions.append(interaction)
+            raise
+        finally:
+            self._in_flight -= 1
+
+        self.interactions.append(interaction)
+        yield response
+
+    def to_dict(self) -> dict:
+        """Return the cassette document."""
+        cassette: dict[str, Any] = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        if self.truncated is not None:
+            cassette["truncated"] = {"reason": self.truncated, "dropped": self.dropped}
+        return cassette
+
+    def save(self, path: str) -> None:
+        """Write the cassette to ``path`` (gzipped if it ends with ``.gz``).
+
+        Does blocking I/O; run in the executor from the event loop.
+        """
+        data = json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wb") as file:
+            file.write(data)
+        _LOGGER.info("Saved %s recorded API interactions to %s", len(self.interactions), path)
+
+
+class CassettePlayer:
+    """Transport that replays recorded interactions instead of calling the API.
+
+    Requests are matched by method and path; repeated requests to the same
+    path get the recorded responses in order, so a retry sequence (429, 429,
+    200) replays exactly as it happened. Each response is delayed by its
+    recorded duration times ``latency_scale``.
+    """
+
+    def __init__(self, cassette: dict, latency_scale: float = 1.0, loop_responses: bool = False) -> None:
+        """Initialize the player.
+
+        Args:
+            cassette: Cassette document (see ``CassetteRecorder.to_dict``)
+            latency_scale: Multiplier for recorded response durations
+                (0 replays as fast as possible)
+            loop_responses: Start over for a path once its recorded responses
+                are used up, instead of raising ``CassetteError``. Lets a
+                short recording drive many coordinator cycles.
+        """
+        if cassette.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version: {cassette.get('version')}")
+        self.latency_scale = latency_scale
+        self.loop_responses = loop_responses
+        self._recorded: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        for interaction in cassette.get("interactions", []):
+            self._recorded[(interaction["method"], interaction["path"])].append(interaction)
+        self._queues: dict[tuple[str, str], deque] = {}
+        self.rewind()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> CassettePlayer:
+        """Load a cassette file (gzipped if it ends with ``.gz``).
+
+        Does blocking I/O; run in the executor from the event loop.
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as file:
+            return cls(json.loads(file.read()), **kwargs)
+
+    def rewind(self) -> None:
+        """Make every recorded interaction available again."""
+        self._queues = {key: deque(items) for key, items in self._recorded.items()}
+
+    @property
+    def remaining(self) -> int:
+        """Number of recorded interactions not replayed yet."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _next_interaction(self, method: str, path: str) -> dict:
+        """Pop the next recorded interaction for a request."""
+        key = (method.upper(), path)
+        queue = self._queues.get(key)
+        if not queue and self.loop_responses and key in self._recorded:
+            queue = self._queues[key] = deque(self._recorded[key])
+        if not queue:
+            raise CassetteError(f"No recorded response for {method.upper()} {path}")
+        return queue.popleft()
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs) -> AsyncIterator[CassetteResponse]:
+        """Replay the next recorded response for this request."""
+        interaction = self._next_interaction(method, _request_path(url))
+        delay = interaction.get("duration", 0) * self.latency_scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        error = interaction.get("error")
+        if error == "timeout":
+            raise asyncio.TimeoutError
+        if error:
+            raise aiohttp.ClientConnectionError(f"Recorded {error}")
+
+        yield CassetteResponse(
+            method, url, interaction["status"], interaction.get("headers", {}), interaction.get("body", "")
+        )
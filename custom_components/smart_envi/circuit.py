@@ -0,0 +1,173 @@
+"""Circuit breakers for the Envi API client.
+
+During an Envi outage every request would otherwise run the full retry
+schedule on its own: a poll of a large fleet turns into hundreds of sleeping
+retries, a warning per attempt and a coordinator cycle that takes minutes.
+``EnviApiClient`` keeps one ``CircuitBreaker`` per endpoint class (see
+metrics.py) instead:
+
+* **closed**: requests go out normally; consecutive failed attempts (network
+  errors, timeouts, 5xx) are counted and any answer from the API resets the
+  count;
+* **open**: after CIRCUIT_FAILURE_THRESHOLD failures in a row, requests of
+  that class fail immediately with ``EnviCircuitOpenError``, including
+  retries already in progress;
+* **half-open**: once the open period has passed, a single request is let
+  through as a probe. If it gets an answer the circuit closes, otherwise it
+  opens again for twice as long (up to CIRCUIT_MAX_RESET_TIMEOUT).
+
+Breakers are per client, i.e. per account, so one account's outage doesn't
+affect another.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .const import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_MAX_RESET_TIMEOUT, CIRCUIT_RESET_TIMEOUT
+from .metrics import ENDPOINT_CLASSES, endpoint_class
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one endpoint class."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        max_reset_timeout: float = CIRCUIT_MAX_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize a closed breaker.
+
+        Args:
+            name: Endpoint class the breaker guards (used in logs)
+            failure_threshold: Consecutive failed attempts that open the circuit
+            reset_timeout: Seconds the circuit stays open the first time
+            max_reset_timeout: Upper bound for the open period after failed probes
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.reset_timeout = reset_timeout
+        self._open_until = 0.0
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allow(self) -> bool:
+        """Check whether a request attempt may go out now.
+
+        An open circuit whose period has passed turns half-open and admits
+        the caller as its probe; other callers are rejected until the probe
+        has an outcome.
+        """
+        if self.state == STATE_OPEN and time.monotonic() >= self._open_until:
+            self.state = STATE_HALF_OPEN
+            _LOGGER.debug("Envi API %s circuit half-open - sending a probe request", self.name)
+        if self.state == STATE_HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        if self.state == STATE_CLOSED:
+            return True
+        self.rejected += 1
+        return False
+
+    @contextmanager
+    def attempt(self) -> Iterator[None]:
+        """Wrap one allowed attempt, freeing the probe slot if it ends without an outcome.
+
+        An attempt that is cancelled, or fails for a reason that says nothing
+        about the API's health, must not leave a half-open circuit waiting
+        for a probe that will never report back. Call right after ``allow``.
+        """
+        probe = self._probing
+        try:
+            yield
+        finally:
+            if probe:
+                self._probing = False
+
+    def record_success(self) -> None:
+        """The API answered: close the circuit and reset the failure count."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Envi API %s circuit closed - the API is answering again", self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.reset_timeout = self.base_reset_timeout
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """An attempt failed at the network or server level."""
+        self._probing = False
+        if self.state == STATE_HALF_OPEN:
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open("probe failed")
+            return
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures >= self.failure_threshold:
+            self.trips += 1
+            self._open(f"{self.failures} consecutive failures")
+
+    def _open(self, reason: str) -> None:
+        """Reject requests for the current reset timeout."""
+        self.state = STATE_OPEN
+        self._open_until = time.monotonic() + self.reset_timeout
+        _LOGGER.warning(
+            "Envi API %s circuit opened (%s) - failing fast for %s seconds",
+            self.name,
+            reason,
+            int(self.reset_timeout),
+        )
+
+    def as_dict(self) -> dict:
+        """Return breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in_s": round(self.retry_in(), 1),
+            "reset_timeout_s": self.reset_timeout,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakers:
+    """One circuit breaker per endpoint class of an account."""
+
+    def __init__(self) -> None:
+        """Create closed breakers for all endpoint classes."""
+        self.breakers = {name: CircuitBreaker(name) for name in ENDPOINT_CLASSES}
+
+    def __getitem__(self, name: str) -> CircuitBreaker:
+        """Return the breaker of an endpoint class."""
+        return self.breakers[name]
+
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        """Return the breaker guarding an endpoint path."""
+        return self.breakers[endpoint_class(endpoint)]
+
+    def open_circuits(self) -> list[str]:
+        """Endpoint classes currently failing fast or probing."""
+        return [name for name, breaker in self.breakers.items() if breaker.state != STATE_CLOSED]
+
+    def as_dict(self) -> dict:
+        """Return all breaker states for diagnostics."""
+        return {name: breaker.as_dict() for name, breaker in self.breakers.items()}
@@ -1,18 +1,31 @@
 import logging
-from typing import ClassVar
+import time
+from collections.abc import Awaitable
+from typing import Any, ClassVar
 
 from homeassistant.components.climate import ClimateEntity, ClimateEntityFeature
 from homeassistant.components.climate.const import HVACMode
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, MIN_TEMPERATURE, MAX_TEMPERATURE
-from .api import EnviApiError, EnviDeviceError, EnviAuthenticationError
+from .const import (
+    CONFIRM_TEMPERATURE_TOLERANCE,
+    DOMAIN,
+    MAX_TEMPERATURE,
+    MIN_TEMPERATURE,
+    OPTIMISTIC_STATE_TIMEOUT,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_DEVICES_REMOVED,
+)
+from .api import EnviApiError, EnviConnectionError, EnviDeviceError, EnviAuthenticationError
 from .coordinator import EnviDataUpdateCoordinator
+from .models import EnviDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +44,13 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
     including temperature control and on/off functionality. It uses the
     DataUpdateCoordinator pattern for efficient data updates.
     
+    Commanded values are shown optimistically: they appear in the UI before
+    the API call, stay marked in the ``pending_changes`` attribute until the
+    cloud reports them, and are rolled back if the write fails or the cloud
+    still disagrees after OPTIMISTIC_STATE_TIMEOUT. Commands that fail
+    because the Envi cloud is unreachable are queued in the coordinator's
+    command journal (``queued_commands`` attribute) and replayed later.
+    
     Attributes:
         _attr_hvac_modes: Available HVAC modes (OFF, HEAT)
         _attr_supported_features: Supported climate features
@@ -70,23 +90,26 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
         self.client = coordinator.client
         self.device_id = str(device_id)
         
-        # Get initial device data from coordinator
-        device_data = coordinator.get_device_data(device_id) or {}
+        # Get initial device state from coordinator
+        device = coordinator.get_device(device_id)
         
         # Get device name from data if available
-        device_name = device_data.get("name", f"Smart Envi {device_id}")
+        device_name = device.name if device and device.name else f"Smart Envi {device_id}"
         self._attr_name = device_name
         self._attr_unique_id = f"{DOMAIN}_{device_id}"
         
         # Temperature unit handling
-        self._temperature_unit_api = device_data.get("temperature_unit", "F").upper()
+        self._temperature_unit_api = device.temperature_unit if device else "F"
         
         self._current_temperature = None
         self._target_temperature = None
         self._attr_hvac_mode = HVACMode.OFF
-        self._serial_no = device_data.get("serial_no")
-        self._firmware_version = device_data.get("firmware_version")
-        self._model_no = device_data.get("model_no")
+        self._serial_no = device.serial_no if device else None
+        self._firmware_version = device.firmware_version if device else None
+        self._model_no = device.model_no if device else None
+        # Commanded values not yet reported by the cloud: field -> (value, deadline)
+        self._optimistic: dict[str, tuple[Any, float]] = {}
+        self._unsub_optimistic_deadline = None
         
         # Update from coordinator data
         self._update_from_coordinator()
@@ -98,20 +121,19 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
         all entity attributes including temperature, HVAC mode, and extra state
         attributes. Handles temperature unit conversion automatically.
         """
-        data = self.coordinator.get_device_data(self.device_id)
-        if not data:
+        device = self.coordinator.get_device(self.device_id)
+        if device is None:
             return
         
         # Get temperature unit from device
-        temp_unit = data.get("temperature_unit", "F").upper()
-        self._temperature_unit_api = temp_unit
+        self._temperature_unit_api = device.temperature_unit
         
         # Get temperatures and convert if needed
-        ambient_temp = data.get("ambient_temperature")
-        target_temp = data.get("current_temperature")
+        ambient_temp = device.ambient_temperature
+        target_temp = device.target_temperature
         
         # Convert to Fahrenheit if device reports in Celsius
-        if temp_unit == "C":
+        if device.celsius:
             if ambient_temp is not None:
                 self._current_temperature = self.client.convert_temperature(ambient_temp, "C", "F")
             if target_temp is not None:
@@ -121,7 +143,10 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
             self._target_temperature = target_temp
         
         # Update HVAC mode
-        self._attr_hvac_mode = HVACMode.HEAT if data.get("state") == 1 else HVACMode.OFF
+        self._attr_hvac_mode = HVACMode.HEAT if device.is_on else HVACMode.OFF
+        
+        # Overlay commanded values the cloud hasn't confirmed yet
+        self._apply_optimistic_state()
         
         # Update icon based on state
         if self._attr_hvac_mode == HVACMode.HEAT:
@@ -130,50 +155,128 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
             self._attr_icon = "mdi:radiator-off"
         
         # Update device info
-        self._firmware_version = data.get("firmware_version")
-        self._model_no = data.get("model_no")
-        self._serial_no = data.get("serial_no", self._serial_no)
+        self._firmware_version = device.firmware_version
+        self._model_no = device.model_no
+        self._serial_no = device.serial_no or self._serial_no
         
         # Update name if it changed
-        if data.get("name") and data.get("name") != self._attr_name:
-            self._attr_name = data.get("name")
+        if device.name and device.name != self._attr_name:
+            self._attr_name = device.name
         
         # Update extra state attributes with additional device information
-        self._update_extra_attributes(data)
+        self._update_extra_attributes(device)
+        self._attr_extra_state_attributes["pending_changes"] = sorted(self._optimistic)
+        self._attr_extra_state_attributes["queued_commands"] = self.coordinator.journal.async_pending_for(self.device_id)
+
+    def _apply_optimistic_state(self) -> None:
+        """Reconcile pending commanded values with what the cloud reports.
+        
+        A pending value is dropped once the cloud reports it, rolled back with
+        a warning once its deadline has passed, and shown in place of the
+        reported value otherwise.
+        """
+        if not self._optimistic:
+            return
+        now = time.monotonic()
+        reported = {"target_temperature": self._target_temperature, "hvac_mode": self._attr_hvac_mode}
+        for field, (value, deadline) in list(self._optimistic.items()):
+            if _values_match(reported[field], value):
+                del self._optimistic[field]
+                _LOGGER.debug("Heater %s confirmed %s=%s", self.device_id, field, value)
+            elif now >= deadline:
+                del self._optimistic[field]
+                _LOGGER.warning(
+                    "Heater %s did not confirm %s=%s within %s seconds; reverting to reported value %s",
+                    self.device_id,
+                    field,
+                    value,
+                    OPTIMISTIC_STATE_TIMEOUT,
+                    reported[field],
+                )
+            elif field == "target_temperature":
+                self._target_temperature = value
+            else:
+                self._attr_hvac_mode = value
+
+        if self.hass is not None:
+            self._async_schedule_optimistic_deadline()
+
+    @callback
+    def _async_schedule_optimistic_deadline(self) -> None:
+        """Arm a timer for the earliest pending deadline (or cancel it)."""
+        if self._unsub_optimistic_deadline is not None:
+            self._unsub_optimistic_deadline()
+            self._unsub_optimistic_deadline = None
+        if not self._optimistic:
+            return
+        delay = min(deadline for _value, deadline in self._optimistic.values()) - time.monotonic()
+        self._unsub_optimistic_deadline = async_call_later(
+            self.hass, max(0.0, delay), self._async_handle_optimistic_deadline
+        )
+
+    @callback
+    def _async_handle_optimistic_deadline(self, _now) -> None:
+        """Re-evaluate pending values when a deadline passes."""
+        self._unsub_optimistic_deadline = None
+        self._handle_coordinator_update()
+
+    async def _async_write_optimistic(self, field: str, value: Any, write: Awaitable) -> None:
+        """Show a commanded value right away, then send it to the API.
+        
+        Args:
+            field: "target_temperature" or "hvac_mode"
+            value: Commanded value as shown in Home Assistant
+            write: API call performing the write
+            
+        Raises:
+            Exception: Whatever the write raised, after rolling the value back
+        """
+        self._optimistic[field] = (value, time.monotonic() + OPTIMISTIC_STATE_TIMEOUT)
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+        try:
+            await write
+        except Exception:
+            self._optimistic.pop(field, None)
+            self._update_from_coordinator()
+            self.async_write_ha_state()
+            raise
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the optimistic state timer."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_optimistic_deadline is not None:
+            self._unsub_optimistic_deadline()
+            self._unsub_optimistic_deadline = None
 
-    def _update_extra_attributes(self, data: dict) -> None:
+    def _update_extra_attributes(self, device: EnviDevice) -> None:
         """Update extra state attributes with device information."""
-        schedule = data.get("schedule", {})
-        schedule_name = None
-        schedule_temp = None
-        if isinstance(schedule, dict):
-            schedule_name = schedule.get("name") or schedule.get("title")
-            schedule_temp = schedule.get("temperature")
+        schedule = device.schedule
         
         self._attr_extra_state_attributes = {
-            "signal_strength": data.get("signal_strength"),
-            "wifi_ssid": data.get("ssid"),
-            "location": data.get("location_name") or data.get("relative_location_name"),
-            "firmware_version": data.get("firmware_version"),
-            "model": data.get("model_no"),
-            "serial_number": data.get("serial_no"),
-            "mode": MODE_MAP.get(data.get("current_mode"), f"Mode {data.get('current_mode')}"),
-            "mode_number": data.get("current_mode"),
-            "temperature_unit": data.get("temperature_unit", "F"),
-            "schedule_active": data.get("is_schedule_active", False),
-            "schedule_name": schedule_name,
-            "schedule_temperature": schedule_temp,
-            "freeze_protect": not data.get("freeze_protect_setting", True),  # Inverted
-            "child_lock": not data.get("child_lock_setting", True),  # Inverted
-            "hold": data.get("is_hold", False),
-            "geofence_active": data.get("is_geofence_active", False),
-            "last_update": data.get("device_status_res_at") or data.get("device_status_req_at"),
+            "signal_strength": device.signal_strength,
+            "wifi_ssid": device.ssid,
+            "location": device.location,
+            "firmware_version": device.firmware_version,
+            "model": device.model_no,
+            "serial_number": device.serial_no,
+            "mode": MODE_MAP.get(device.mode, f"Mode {device.mode}"),
+            "mode_number": device.mode,
+            "temperature_unit": device.temperature_unit,
+            "schedule_active": device.schedule_active,
+            "schedule_name": schedule.name if schedule else None,
+            "schedule_temperature": schedule.temperature if schedule else None,
+            "freeze_protect": device.freeze_protect,
+            "child_lock": device.child_lock,
+            "hold": device.hold,
+            "geofence_active": device.geofence_active,
+            "last_update": device.last_update,
         }
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.get_device_data(self.device_id) is not None
+        return self.coordinator.last_update_success and self.coordinator.get_device(self.device_id) is not None
 
     @property
     def current_temperature(self) -> float | None:
@@ -192,10 +295,8 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
         
         # Build device name with location if available
         device_name = self._attr_name
-        location = None
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            location = data.get("location_name") or data.get("relative_location_name")
+        device = self.coordinator.get_device(self.device_id)
+        location = device.location if device else None
         if location and location not in device_name:
             device_name = f"{device_name} ({location})"
         
@@ -244,16 +345,22 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
             temp_to_send = temperature
             
         try:
-            await self.client.set_temperature(self.device_id, temp_to_send)
-            self._target_temperature = temperature  # Store in Fahrenheit for HA
+            # Shown in Fahrenheit right away, rolled back if the write fails
+            await self._async_write_optimistic(
+                "target_temperature", temperature, self.client.set_temperature(self.device_id, temp_to_send)
+            )
             _LOGGER.debug("Set temperature to %s°F (%s°%s) for %s", 
                          temperature, temp_to_send, self._temperature_unit_api, self.device_id)
-            # Refresh this device's data immediately
-            await self.coordinator.async_refresh_device(self.device_id)
-            self._update_from_coordinator()
+            # A setpoint queued during an outage must not be replayed over this one
+            self.coordinator.journal.async_discard(self.device_id, ("temperature",))
+            # Probe the device until the cloud reflects the new setpoint
+            self.coordinator.async_confirm_write(self.device_id, {"current_temperature": temp_to_send})
         except EnviDeviceError as e:
             _LOGGER.exception("Device error setting temperature: %s", e)
             raise HomeAssistantError(f"Failed to set temperature: {e}") from e
+        except EnviConnectionError:
+            # Cloud unreachable: queue the command and replay it when the API is back
+            self.coordinator.journal.async_enqueue(self.device_id, {"temperature": temp_to_send})
         except EnviApiError as e:
             _LOGGER.exception("API error setting temperature: %s", e)
             raise HomeAssistantError(f"Failed to set temperature: {e}") from e
@@ -273,20 +380,25 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
         try:
             if hvac_mode == HVACMode.HEAT:
                 _LOGGER.debug("Turning on heater %s", self.device_id)
-                await self.client.set_state(self.device_id, 1)
-                self._attr_hvac_mode = hvac_mode
+                await self._async_write_optimistic("hvac_mode", hvac_mode, self.client.set_state(self.device_id, 1))
                 _LOGGER.debug("Turned on heater %s", self.device_id)
             else:
                 _LOGGER.debug("Turning off heater %s", self.device_id)
-                await self.client.set_state(self.device_id, 0)
-                self._attr_hvac_mode = hvac_mode
+                await self._async_write_optimistic("hvac_mode", hvac_mode, self.client.set_state(self.device_id, 0))
                 _LOGGER.debug("Turned off heater %s", self.device_id)
-            # Refresh this device's data immediately
-            await self.coordinator.async_refresh_device(self.device_id)
-            self._update_from_coordinator()
+            self.coordinator.journal.async_discard(self.device_id, ("state",))
+            # Probe the device until the cloud reflects the new state
+            self.coordinator.async_confirm_write(
+                self.device_id, {"state": 1 if hvac_mode == HVACMode.HEAT else 0}
+            )
         except EnviDeviceError as e:
             _LOGGER.exception("Device error setting HVAC mode: %s", e)
             raise HomeAssistantError(f"Failed to set HVAC mode: {e}") from e
+        except EnviConnectionError:
+            # Cloud unreachable: queue the command and replay it when the API is back
+            self.coordinator.journal.async_enqueue(
+                self.device_id, {"state": 1 if hvac_mode == HVACMode.HEAT else 0}
+            )
         except EnviApiError as e:
             _LOGGER.exception("API error setting HVAC mode: %s", e)
             raise HomeAssistantError(f"Failed to set HVAC mode: {e}") from e
@@ -294,12 +406,23 @@ class EnviHeater(CoordinatorEntity, ClimateEntity):
             _LOGGER.exception("Unexpected error setting HVAC mode: %s", e)
             raise HomeAssistantError(f"Failed to set HVAC mode: {e!s}") from e
 
+def _values_match(reported: Any, commanded: Any) -> bool:
+    """Check whether a reported value matches a commanded one."""
+    if isinstance(commanded, (int, float)) and isinstance(reported, (int, float)):
+        return abs(reported - commanded) <= CONFIRM_TEMPERATURE_TOLERANCE
+    return reported == commanded
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities
 ):
-    """Set up all Envi heaters from a config entry."""
+    """Set up all Envi heaters from a config entry.
+    
+    Heaters discovered later by the coordinator are added incrementally,
+    without reloading the config entry.
+    """
     # Get coordinator (should already be created in __init__.py)
     coordinator_key = f"{DOMAIN}_coordinator_{entry.entry_id}"
     coordinator = hass.data[DOMAIN].get(coordinator_key)
@@ -307,6 +430,33 @@ async def async_setup_entry(
         _LOGGER.error("Coordinator not found for entry %s", entry.entry_id)
         return
     
+    known_device_ids: set[str] = set()
+
+    @callback
+    def _async_add_devices(device_ids: list[str]) -> None:
+        """Create heater entities for devices not seen before."""
+        new_ids = [device_id for device_id in device_ids if device_id not in known_device_ids]
+        if not new_ids:
+            return
+        known_device_ids.update(new_ids)
+        
+        # Create entities using coordinator
+        heaters = [EnviHeater(coordinator, device_id) for device_id in new_ids]
+        _LOGGER.info("Created %s heater entities", len(heaters))
+        async_add_entities(heaters)
+
+    @callback
+    def _async_remove_devices(device_ids: list[str]) -> None:
+        """Forget removed devices so they are re-created if they come back."""
+        known_device_ids.difference_update(device_ids)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_REMOVED.format(entry.entry_id), _async_remove_devices)
+    )
+
     # Get device IDs from coordinator
     device_ids = coordinator.device_ids
     if not device_ids:
@@ -314,9 +464,4 @@ async def async_setup_entry(
         return
 
     _LOGGER.info("Found %s Smart Envi heaters: %s", len(device_ids), device_ids)
-    
-    # Create entities using coordinator
-    heaters = [EnviHeater(coordinator, device_id) for device_id in device_ids]
-    
-    _LOGGER.info("Created %s heater entities", len(heaters))
-    async_add_entities(heaters)
+    _async_add_devices(device_ids)
@@ -13,7 +13,7 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import entity_registry
 from homeassistant.exceptions import HomeAssistantError
 
-from .api import EnviApiClient, EnviAuthenticationError, EnviApiError, EnviDeviceError, EnviApiError, EnviDeviceError
+from .api import EnviApiClient, EnviAuthenticationError, EnviApiError, EnviDeviceError
 from .const import (
     DOMAIN,
     DEFAULT_SCAN_INTERVAL,
@@ -22,9 +22,25 @@ from .const import (
     MAX_SCAN_INTERVAL,
     MIN_API_TIMEOUT,
     MAX_API_TIMEOUT,
+    CONFIGURABLE_TIMEOUT_CLASSES,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    MIN_SOCKET_TIMEOUT,
+    MAX_SOCKET_TIMEOUT,
+    DEFAULT_POOL_LIMIT_PER_HOST,
+    MIN_POOL_LIMIT_PER_HOST,
+    MAX_POOL_LIMIT_PER_HOST,
+    DEFAULT_POOL_KEEPALIVE,
+    MIN_POOL_KEEPALIVE,
+    MAX_POOL_KEEPALIVE,
+    DEFAULT_POOL_DNS_CACHE_TTL,
+    MAX_POOL_DNS_CACHE_TTL,
     MIN_TEMPERATURE,
     MAX_TEMPERATURE,
 )
+from .coordinator import EnviDataUpdateCoordinator
+from .schedule import diff_schedule
+from .timeouts import build_timeout_profiles, timeout_overrides
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -86,7 +102,83 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
         self._device_id: str | None = None
         self._entity_id: str | None = None
         self._schedule_id: int | None = None
-        self._all_schedules: list[dict] = []
+        # Session-scoped request cache: the schedule list is loaded at most once
+        # per options flow and device payloads come from the coordinator
+        self._schedule_list: list[dict] | None = None
+        self._device_cache: dict[str, dict] = {}
+
+    def _get_coordinator(self) -> EnviDataUpdateCoordinator | None:
+        """Get the coordinator for this config entry, if loaded."""
+        coordinator_key = f"{DOMAIN}_coordinator_{self.config_entry.entry_id}"
+        return self.hass.data.get(DOMAIN, {}).get(coordinator_key)
+
+    async def _async_get_schedule_list(self, client: EnviApiClient) -> list[dict]:
+        """Get the schedule list, fetching it at most once per flow session.
+        
+        Seeded from the coordinator's schedule index, which only hits
+        schedule/list when its own cache is stale.
+        
+        Args:
+            client: API client used when no coordinator is available
+            
+        Returns:
+            List of schedule dictionaries
+        """
+        if self._schedule_list is None:
+            coordinator = self._get_coordinator()
+            if coordinator is not None:
+                self._schedule_list = list((await coordinator.async_get_schedules()).values())
+            else:
+                self._schedule_list = await client.get_schedule_list()
+            _LOGGER.debug("Loaded %s schedules for options flow", len(self._schedule_list))
+        return self._schedule_list
+
+    async def _async_find_schedule(self, client: EnviApiClient, schedule_id: int | str) -> dict:
+        """Find a schedule in the session's schedule list.
+        
+        Args:
+            client: API client used when no coordinator is available
+            schedule_id: Schedule ID to look up
+            
+        Returns:
+            Schedule dictionary
+            
+        Raises:
+            EnviDeviceError: If the schedule is not found
+        """
+        for schedule in await self._async_get_schedule_list(client):
+            if isinstance(schedule, dict) and str(schedule.get("id")) == str(schedule_id):
+                return schedule
+        raise EnviDeviceError(f"Schedule {schedule_id} not found")
+
+    async def _async_get_device_data(self, client: EnviApiClient, device_id: str) -> dict:
+        """Get a device payload from the coordinator cache or one live fetch.
+        
+        Args:
+            client: API client used when the coordinator has no data
+            device_id: Device ID to look up
+            
+        Returns:
+            Device data dictionary
+        """
+        if device_id not in self._device_cache:
+            coordinator = self._get_coordinator()
+            data = coordinator.get_device_data(device_id) if coordinator is not None else None
+            if data is None:
+                data = await client.get_device_state(device_id)
+            self._device_cache[device_id] = data
+        return self._device_cache[device_id]
+
+    def _forget_schedule(self, schedule_id: int | str) -> None:
+        """Drop a deleted schedule from the session and coordinator caches."""
+        if self._schedule_list is not None:
+            self._schedule_list = [
+                schedule for schedule in self._schedule_list
+                if str(schedule.get("id")) != str(schedule_id)
+            ]
+        coordinator = self._get_coordinator()
+        if coordinator is not None:
+            coordinator.async_remove_schedule(schedule_id)
     
     def _format_time_entries_for_display(self, times: list[dict]) -> str:
         """Format time entries list into display string.
@@ -128,7 +220,6 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
         
         return "|".join(time_parts)
     
->>>>>>> c02d638 (Fix CodeRabbit review issues: Extract formatting, fix exceptions, coordinator check)
     def _parse_time_entries(self, time_entries_str: str) -> tuple[list[dict], dict[str, str]]:
         """Parse time entries string into structured list.
         
@@ -196,6 +287,8 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
             step_id="init",
             menu_options={
                 "integration": "Integration Settings (Scan Interval, API Timeout)",
+                "timeouts": "Request Timeouts",
+                "connection": "Connection Pool",
                 "schedule": "Edit Device Schedule",
             },
         )
@@ -204,30 +297,48 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
         """Handle integration menu selection - redirect to integration_options."""
         return await self.async_step_integration_options(user_input)
     
+    async def async_step_timeouts(self, user_input: dict | None = None) -> FlowResult:
+        """Handle timeouts menu selection - redirect to timeout_options."""
+        return await self.async_step_timeout_options(user_input)
+
+    async def async_step_connection(self, user_input: dict | None = None) -> FlowResult:
+        """Handle connection menu selection - redirect to connection_options."""
+        return await self.async_step_connection_options(user_input)
+
     async def async_step_schedule(self, user_input: dict | None = None) -> FlowResult:
         """Handle schedule menu selection - redirect to select_device."""
         return await self.async_step_select_device(user_input)
 
     async def async_step_integration_options(self, user_input: dict | None = None) -> FlowResult:
-        """Manage integration options (scan interval, API timeout)."""
+        """Manage integration options (scan interval, polling modes, API timeout)."""
         _LOGGER.debug("Integration options step called, user_input: %s", user_input)
         errors: dict[str, str] = {}
         
         if user_input is not None:
             # Validation is handled by vol.Schema with vol.Coerce and vol.Range
             # If we reach here, input is valid
+            options = self.config_entry.options or {}
             return self.async_create_entry(
                 title="",
                 data={
+                    # Drop per-class timeouts that merely repeat the old API
+                    # timeout, so those classes follow the new one
+                    **timeout_overrides({}, options),
                     "scan_interval": user_input["scan_interval"],
+                    "auto_scan_interval": user_input["auto_scan_interval"],
+                    "schedule_aware_polling": user_input["schedule_aware_polling"],
                     "api_timeout": user_input["api_timeout"],
+                    "hedged_requests": user_input["hedged_requests"],
                 },
             )
 
         # Get current values from config entry
         options = self.config_entry.options or {}
         current_scan_interval = options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
+        current_auto_scan_interval = bool(options.get("auto_scan_interval", False))
+        current_schedule_aware_polling = bool(options.get("schedule_aware_polling", False))
         current_api_timeout = options.get("api_timeout", DEFAULT_API_TIMEOUT)
+        current_hedged_requests = bool(options.get("hedged_requests", False))
         
         # Ensure values are integers for defaults
         try:
@@ -250,6 +361,16 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Coerce(int),
                 vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
             ),
+            vol.Required(
+                "auto_scan_interval",
+                default=current_auto_scan_interval,
+                description=" \n\nLet the integration tune the scan interval (within 10-300 seconds), starting from the value above. It polls faster while heater data keeps changing and slows down when nothing changes or the API rate limits requests.",
+            ): bool,
+            vol.Required(
+                "schedule_aware_polling",
+                default=current_schedule_aware_polling,
+                description=" \n\nRefresh heaters right after their schedule changes the setpoint, and poll half as often in between.",
+            ): bool,
             vol.Required(
                 "api_timeout",
                 default=current_api_timeout,
@@ -258,6 +379,11 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Coerce(int),
                 vol.Range(min=MIN_API_TIMEOUT, max=MAX_API_TIMEOUT),
             ),
+            vol.Required(
+                "hedged_requests",
+                default=current_hedged_requests,
+                description=" \n\nSend a second copy of a device read that is slower than usual and use whichever answers first. Cuts slow polls at the cost of a few extra requests (at most 5% of reads).",
+            ): bool,
         })
         
         return self.async_show_form(
@@ -266,6 +392,65 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
             errors=errors,
         )
 
+    async def async_step_timeout_options(self, user_input: dict | None = None) -> FlowResult:
+        """Manage connect/read timeouts and the request deadline of each endpoint class."""
+        options = self.config_entry.options or {}
+        if user_input is not None:
+            # Only deadlines that differ from their default are stored
+            return self.async_create_entry(title="", data=timeout_overrides(user_input, options))
+
+        # Current values, falling back to the defaults the client uses
+        profiles = build_timeout_profiles(options)
+        socket_timeout = vol.All(vol.Coerce(int), vol.Range(min=MIN_SOCKET_TIMEOUT, max=MAX_SOCKET_TIMEOUT))
+        request_timeout = vol.All(vol.Coerce(int), vol.Range(min=MIN_API_TIMEOUT, max=MAX_API_TIMEOUT))
+        schema = {
+            vol.Required(
+                "connect_timeout",
+                default=int(options.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT)),
+            ): socket_timeout,
+            vol.Required(
+                "read_timeout",
+                default=int(options.get("read_timeout", DEFAULT_READ_TIMEOUT)),
+            ): socket_timeout,
+        }
+        for name in CONFIGURABLE_TIMEOUT_CLASSES:
+            schema[vol.Required(f"{name}_timeout", default=int(profiles[name].total))] = request_timeout
+
+        return self.async_show_form(
+            step_id="timeout_options",
+            data_schema=vol.Schema(schema),
+        )
+
+    async def async_step_connection_options(self, user_input: dict | None = None) -> FlowResult:
+        """Manage the dedicated connection pool (applied by reloading the entry)."""
+        options = self.config_entry.options or {}
+        if user_input is not None:
+            return self.async_create_entry(title="", data={**options, **user_input})
+
+        data_schema = vol.Schema({
+            vol.Required(
+                "dedicated_connection_pool",
+                default=bool(options.get("dedicated_connection_pool", False)),
+            ): bool,
+            vol.Required(
+                "pool_limit_per_host",
+                default=int(options.get("pool_limit_per_host", DEFAULT_POOL_LIMIT_PER_HOST)),
+            ): vol.All(vol.Coerce(int), vol.Range(min=MIN_POOL_LIMIT_PER_HOST, max=MAX_POOL_LIMIT_PER_HOST)),
+            vol.Required(
+                "pool_keepalive",
+                default=int(options.get("pool_keepalive", DEFAULT_POOL_KEEPALIVE)),
+            ): vol.All(vol.Coerce(int), vol.Range(min=MIN_POOL_KEEPALIVE, max=MAX_POOL_KEEPALIVE)),
+            vol.Required(
+                "pool_dns_cache_ttl",
+                default=int(options.get("pool_dns_cache_ttl", DEFAULT_POOL_DNS_CACHE_TTL)),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_POOL_DNS_CACHE_TTL)),
+        })
+
+        return self.async_show_form(
+            step_id="connection_options",
+            data_schema=data_schema,
+        )
+
     async def async_step_select_device(self, user_input: dict | None = None) -> FlowResult:
         """Select device to edit schedule."""
         errors: dict[str, str] = {}
@@ -334,11 +519,11 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                 errors=errors,
             )
         
-        # Get current schedule
+        # Get current schedule from the session cache
         if self._schedule_data is None and self._device_id:
             try:
-                # Get device state to find schedule info
-                device_data = await client.get_device_state(self._device_id)
+                # Device payload comes from the coordinator, not a live GET
+                device_data = await self._async_get_device_data(client, self._device_id)
                 schedule_info = device_data.get("schedule", {})
                 
                 schedule_id = None
@@ -355,53 +540,23 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                     "times": schedule_info.get("times", []) if isinstance(schedule_info, dict) else [],
                 }
                 
-                # Try to get full schedule details if schedule_id exists
+                # Merge full schedule details from the session's schedule list
                 if schedule_id:
                     try:
-<<<<<<< HEAD
-                        schedule_list = await client.get_schedule_list()
-                        for schedule in schedule_list:
-                            if isinstance(schedule, dict) and schedule.get("id") == schedule_id:
-                                self._schedule_data.update({
-                                    "enabled": schedule.get("enabled", self._schedule_data["enabled"]),
-                                    "name": schedule.get("name") or self._schedule_data["name"],
-                                    "temperature": schedule.get("temperature") or self._schedule_data["temperature"],
-                                    "times": schedule.get("times", self._schedule_data["times"]),
-                                })
-                                break
-                    except Exception as e:
-                        _LOGGER.debug("Could not fetch full schedule details: %s", e)
-=======
-                        # Use get_schedule() directly for more reliable data
-                        schedule = await client.get_schedule(schedule_id)
-                        _LOGGER.debug("Full schedule from API: %s", schedule)
-                        
-                        if isinstance(schedule, dict):
-                            # Extract events from schedule_data structure
-                            times = self._extract_events_from_schedule(schedule)
-                            
-                            _LOGGER.debug("Extracted times from schedule_data: %s", times)
-                            
-                            # Schedule is enabled if it exists and has events
-                            schedule_enabled = len(times) > 0
-                            
-                            self._schedule_data.update({
-                                "enabled": schedule_enabled,
-                                "name": schedule.get("name") or self._schedule_data["name"],
-                                "times": times,
-                            })
-                            _LOGGER.debug("Final schedule data: %s", self._schedule_data)
+                        schedule = await self._async_find_schedule(client, schedule_id)
+                        self._schedule_data.update({
+                            "enabled": schedule.get("enabled", self._schedule_data["enabled"]),
+                            "name": schedule.get("name") or self._schedule_data["name"],
+                            "temperature": schedule.get("temperature") or self._schedule_data["temperature"],
+                            "times": schedule.get("times", self._schedule_data["times"]),
+                        })
                     except (EnviApiError, EnviDeviceError) as e:
                         _LOGGER.warning("Could not fetch full schedule details for schedule_id %s: %s", schedule_id, e)
                         # Continue with device state schedule info
-                    except Exception as e:
-                        _LOGGER.error("Unexpected error fetching schedule details: %s", e, exc_info=True)
-                        # Continue with device state schedule info
             except (EnviApiError, EnviDeviceError) as e:
                 _LOGGER.error("Failed to get schedule: %s", e)
                 errors["base"] = "failed_to_load_schedule"
                 self._schedule_data = {}
->>>>>>> c02d638 (Fix CodeRabbit review issues: Extract formatting, fix exceptions, coordinator check)
             except Exception as e:
                 _LOGGER.exception("Unexpected error loading schedule")
                 errors["base"] = "failed_to_load_schedule"
@@ -431,20 +586,29 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                     # Get schedule_id for update or use device_id for creation
                     schedule_id = self._schedule_data.get("schedule_id") if self._schedule_data else None
                     
+                    written = True
                     if schedule_id:
-                        # Update existing schedule
-                        await client.update_schedule(schedule_id, schedule_data)
+                        # Update existing schedule with only the changed fields
+                        changes = diff_schedule(self._schedule_data, schedule_data)
+                        if changes:
+                            await client.update_schedule(schedule_id, changes)
+                            coordinator = self._get_coordinator()
+                            if coordinator is not None:
+                                coordinator.async_store_schedule(schedule_id, changes)
+                        else:
+                            written = False
                     else:
                         # Create new schedule
                         schedule_data["device_id"] = self._device_id
                         await client.create_schedule(schedule_data)
+                        coordinator = self._get_coordinator()
+                        if coordinator is not None:
+                            coordinator.async_invalidate_schedules()
                     
                     # Refresh device data
-                    coordinator_key = f"{DOMAIN}_coordinator_{self.config_entry.entry_id}"
-                    coordinator = domain_data.get(coordinator_key)
-                    if (coordinator 
-                        and hasattr(coordinator, "async_refresh_device")
-                        and hasattr(coordinator, "device_ids")
+                    coordinator = self._get_coordinator()
+                    if (written
+                        and coordinator is not None
                         and self._device_id in coordinator.device_ids):
                         await coordinator.async_refresh_device(self._device_id)
                     
@@ -512,15 +676,13 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                 errors=errors,
             )
         
-        # Fetch all schedules
-        if not self._all_schedules:
-            try:
-                self._all_schedules = await client.get_schedule_list()
-                _LOGGER.debug("Fetched %s schedules", len(self._all_schedules))
-            except Exception as e:
-                _LOGGER.error("Failed to fetch schedules: %s", e, exc_info=True)
-                errors["base"] = "failed_to_load_schedules"
-                self._all_schedules = []
+        # Fetch all schedules (once per flow session)
+        try:
+            all_schedules = await self._async_get_schedule_list(client)
+        except Exception as e:
+            _LOGGER.error("Failed to fetch schedules: %s", e, exc_info=True)
+            errors["base"] = "failed_to_load_schedules"
+            all_schedules = []
         
         # If user selected a schedule, go to view/edit
         if user_input is not None:
@@ -550,7 +712,7 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                         friendly_name = state.attributes.get("friendly_name", entity_id)
                         device_map[device_id] = friendly_name
         
-        for schedule in self._all_schedules:
+        for schedule in all_schedules:
             if not isinstance(schedule, dict):
                 continue
             schedule_id = schedule.get("id")
@@ -598,7 +760,7 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
         # Load schedule data if not already loaded
         if self._schedule_data is None:
             try:
-                schedule = await client.get_schedule(self._schedule_id)
+                schedule = await self._async_find_schedule(client, self._schedule_id)
                 self._schedule_data = {
                     "schedule_id": schedule.get("id"),
                     "device_id": schedule.get("device_id"),
@@ -626,11 +788,11 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
                 try:
                     await client.delete_schedule(self._schedule_id)
                     _LOGGER.info("Deleted schedule %s", self._schedule_id)
-                    # Refresh coordinator
-                    coordinator_key = f"{DOMAIN}_coordinator_{self.config_entry.entry_id}"
-                    coordinator = domain_data.get(coordinator_key)
-                    if coordinator:
-                        await coordinator.async_refresh()
+                    self._forget_schedule(self._schedule_id)
+                    # Refresh the affected device only
+                    coordinator = self._get_coordinator()
+                    if coordinator is not None and self._device_id in coordinator.device_ids:
+                        await coordinator.async_refresh_device(self._device_id)
                     return self.async_create_entry(
                         title="",
                         data=self.config_entry.options or {},
@@ -695,7 +857,7 @@ class EnviHeaterOptionsFlowHandler(config_entries.OptionsFlow):
             client = domain_data.get(self.config_entry.entry_id)
             if client:
                 try:
-                    schedule = await client.get_schedule(self._schedule_id)
+                    schedule = await self._async_find_schedule(client, self._schedule_id)
                     _LOGGER.debug("Loaded schedule data: %s", schedule)
                     
                     # Normalize enabled field (handle 0/1, "true"/"false", boolean)
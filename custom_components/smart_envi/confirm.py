@@ -0,0 +1,165 @@
+"""Post-write confirmation for Smart Envi heaters.
+
+A write to the Envi API is accepted before the heater has synced it, so a
+device GET right after the write usually still returns the old values (and
+an old ``device_status_res_at``). ``WriteConfirmationTracker`` probes the
+device on a short exponential schedule instead, stopping as soon as the
+payload reflects the write or the device reports a newer sync, and notifies
+listeners once at the end rather than after every probe.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import CONFIRM_PROBE_DELAYS, CONFIRM_TEMPERATURE_TOLERANCE, DOMAIN
+from .scheduler import RequestPriority, request_priority
+
+if TYPE_CHECKING:
+    from .coordinator import EnviDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def device_synced_at(data: dict | None) -> str | None:
+    """Return the time the cloud last synced with the heater, from a payload."""
+    if not data:
+        return None
+    return data.get("device_status_res_at")
+
+
+@dataclass
+class PendingWrite:
+    """A write waiting to show up in the device payload."""
+
+    expected: dict[str, Any]  # payload fields and the values the write should produce
+    baseline_synced_at: str | None  # device_status_res_at when the write was issued
+    issued_at: float = field(default_factory=time.monotonic)
+    probes: int = 0
+    task: asyncio.Task | None = None
+
+
+class WriteConfirmationTracker:
+    """Probe heaters after writes until the cloud confirms them."""
+
+    def __init__(
+        self,
+        coordinator: EnviDataUpdateCoordinator,
+        delays: tuple[float, ...] = CONFIRM_PROBE_DELAYS,
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            coordinator: Coordinator used to fetch and cache device data
+            delays: Seconds to wait before each probe
+        """
+        self.coordinator = coordinator
+        self.delays = delays
+        self.pending: dict[str, PendingWrite] = {}
+        self.confirmed = 0
+        self.unconfirmed = 0
+        self.probes = 0
+
+    def async_track(self, device_id: str, expected: dict[str, Any]) -> asyncio.Task:
+        """Start confirming a write that was just accepted by the API.
+
+        A newer write to the same device supersedes the pending one: the
+        expected fields are merged and the probe schedule starts over.
+
+        Args:
+            device_id: Device that was written to
+            expected: Device payload fields and the values the write should
+                produce (e.g. ``{"state": 1}``)
+
+        Returns:
+            Task resolving to True once confirmed, or False if the probes ran
+            out (cancelled if superseded by another write)
+        """
+        device_id = str(device_id)
+        previous = self.pending.pop(device_id, None)
+        if previous is not None:
+            if previous.task is not None:
+                previous.task.cancel()
+            pending = PendingWrite({**previous.expected, **expected}, previous.baseline_synced_at)
+        else:
+            pending = PendingWrite(dict(expected), device_synced_at(self.coordinator.get_device_data(device_id)))
+
+        self.pending[device_id] = pending
+        pending.task = self.coordinator.hass.async_create_background_task(
+            self._async_probe(device_id, pending), f"{DOMAIN} confirm write {device_id}"
+        )
+        return pending.task
+
+    async def _async_probe(self, device_id: str, pending: PendingWrite) -> bool:
+        """Probe the device until the write is confirmed or the schedule ends."""
+        try:
+            # Probes go ahead of regular polls, but behind new user commands
+            with request_priority(RequestPriority.CONFIRMATION):
+                for delay in self.delays:
+                    await asyncio.sleep(delay)
+                    pending.probes += 1
+                    self.probes += 1
+                    data = await self.coordinator.async_refresh_device(device_id, notify=False)
+                    if data is not None and self._is_confirmed(pending, data):
+                        self.confirmed += 1
+                        _LOGGER.debug(
+                            "Write to device %s confirmed after %s probes (%.1f s)",
+                            device_id,
+                            pending.probes,
+                            time.monotonic() - pending.issued_at,
+                        )
+                        return True
+            self.unconfirmed += 1
+            _LOGGER.debug(
+                "Write to device %s not confirmed after %s probes; leaving it to regular polling",
+                device_id,
+                pending.probes,
+            )
+            return False
+        finally:
+            if self.pending.get(device_id) is pending:
+                del self.pending[device_id]
+                self.coordinator.async_update_listeners()
+
+    @staticmethod
+    def _is_confirmed(pending: PendingWrite, data: dict) -> bool:
+        """Check whether a payload reflects a pending write."""
+        synced_at = device_synced_at(data)
+        if synced_at is not None and synced_at != pending.baseline_synced_at:
+            return True
+        for key, value in pending.expected.items():
+            actual = data.get(key)
+            if isinstance(value, (int, float)) and isinstance(actual, (int, float)):
+                if abs(actual - value) > CONFIRM_TEMPERATURE_TOLERANCE:
+                    return False
+            elif actual != value:
+                return False
+        return True
+
+    def async_cancel_all(self) -> None:
+        """Stop all probes (e.g. on unload) without notifying listeners."""
+        pending, self.pending = self.pending, {}
+        for write in pending.values():
+            if write.task is not None:
+                write.task.cancel()
+
+    def as_dict(self) -> dict:
+        """Return tracker state for diagnostics."""
+        now = time.monotonic()
+        return {
+            "probe_delays_s": list(self.delays),
+            "confirmed": self.confirmed,
+            "unconfirmed": self.unconfirmed,
+            "probes": self.probes,
+            "pending": {
+                device_id: {
+                    "expected": write.expected,
+                    "age_s": round(now - write.issued_at, 1),
+                    "probes": write.probes,
+                }
+                for device_id, write in self.pending.items()
+            },
+        }
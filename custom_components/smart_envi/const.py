@@ -15,6 +15,28 @@ MAX_SCAN_INTERVAL = 300  # seconds - 5 minutes max
 MIN_API_TIMEOUT = 5  # seconds
 MAX_API_TIMEOUT = 60  # seconds
 
+# Timeout profiles (see timeouts.py): per-attempt connect and socket-read
+# timeouts, and request deadlines for endpoint classes that shouldn't use
+# api_timeout (logins may be slow on poor links, device reads should be quick)
+DEFAULT_CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_READ_TIMEOUT = 10  # seconds
+MIN_SOCKET_TIMEOUT = 1  # seconds - lower bound for connect and read timeouts
+MAX_SOCKET_TIMEOUT = 30  # seconds
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    "auth": 30,
+    "device_get": 8,
+}
+# Endpoint classes whose request deadline can be set in the options flow
+CONFIGURABLE_TIMEOUT_CLASSES = ("auth", "device_list", "device_get", "device_update", "schedule")
+
+# Auto scan interval (see interval.py)
+AUTO_SCAN_WINDOW = 5  # cycles observed before each tighten/relax decision
+AUTO_SCAN_CHANGE_THRESHOLD = 0.6  # share of cycles with changed payloads needed to tighten
+AUTO_SCAN_TIGHTEN_FACTOR = 0.75
+AUTO_SCAN_RELAX_FACTOR = 1.5
+AUTO_SCAN_BACKOFF_FACTOR = 2.0  # applied immediately on a 429
+AUTO_SCAN_MAX_DUTY_CYCLE = 0.25  # a cycle may take at most this share of the interval
+
 # Temperature limits in Fahrenheit
 MIN_TEMPERATURE = 50
 MAX_TEMPERATURE = 86
@@ -24,6 +46,88 @@ BASE_URL = "https://app-apis.enviliving.com/apis/v1"
 MAX_RETRIES = 3
 INITIAL_RETRY_DELAY = 1  # seconds
 MAX_RETRY_DELAY = 30  # seconds
+# Retry budget (see retry.py): retries allowed per successful request over a
+# sliding window, plus a flat allowance per window
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_WINDOW = 60  # seconds
+RETRY_BUDGET_MIN_RETRIES = 10
+
+# Hedged reads (optional): a GET still unanswered at its endpoint class's p95
+# latency (counted from when it is sent, over recent samples only) gets a
+# second copy; hedges are capped to a share of successful reads
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20  # recent latency samples needed before hedging an endpoint class
+HEDGE_LATENCY_WINDOW = 300  # seconds of latency samples the p95 is computed from
+HEDGE_LATENCY_SLICE = 30  # seconds - granularity at which old samples expire
+HEDGE_MIN_DELAY = 0.05  # seconds - never hedge sooner than this
+HEDGE_MAX_RATIO = 0.05
+HEDGE_BUDGET_WINDOW = 60  # seconds
+
+# Bulk operations: cap concurrent writes so a fleet-wide change doesn't trip rate limiting
+BULK_MAX_CONCURRENCY = 5
+
+# Request scheduler (see scheduler.py): requests in flight per account, and how
+# many of those slots only user commands may take
+SCHEDULER_MAX_CONCURRENCY = 32
+SCHEDULER_INTERACTIVE_RESERVED = 2
+
+# Dedicated connection pool (optional, see pool.py): per-host connection limit
+# (also the scheduler's concurrency limit), keep-alive long enough to span the
+# scan interval, and DNS cache TTL
+DEFAULT_POOL_LIMIT_PER_HOST = SCHEDULER_MAX_CONCURRENCY
+MIN_POOL_LIMIT_PER_HOST = SCHEDULER_INTERACTIVE_RESERVED + 2  # room for background requests
+MAX_POOL_LIMIT_PER_HOST = 100
+DEFAULT_POOL_KEEPALIVE = 120  # seconds
+MIN_POOL_KEEPALIVE = 5  # seconds
+MAX_POOL_KEEPALIVE = 600  # seconds
+DEFAULT_POOL_DNS_CACHE_TTL = 300  # seconds
+MAX_POOL_DNS_CACHE_TTL = 3600  # seconds
+
+# Circuit breakers (see circuit.py): consecutive failed attempts that stop
+# requests to an endpoint class, and how long it stays stopped before a probe
+# (doubling after each failed probe)
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30  # seconds
+CIRCUIT_MAX_RESET_TIMEOUT = 300  # seconds
+
+# Dynamic device discovery: dispatcher signals (formatted with the entry ID)
+SIGNAL_DEVICES_ADDED = f"{DOMAIN}_devices_added_{{}}"
+SIGNAL_DEVICES_REMOVED = f"{DOMAIN}_devices_removed_{{}}"
+# Sent when a heater's scheduled setpoint changes (formatted with the entry ID)
+SIGNAL_SCHEDULE_TIMELINE = f"{DOMAIN}_schedule_timeline_{{}}"
+# Consecutive polls a heater must be missing from device/list before it is removed
+DEVICE_REMOVAL_GRACE_CYCLES = 3
+
+# Per-account "Envi Cloud" service device holding API diagnostic sensors
+# (identifier is this prefix + config entry ID)
+ACCOUNT_DEVICE_PREFIX = "account_"
+
+# Schedule index cache: how long a fetched schedule/list stays authoritative
+SCHEDULE_CACHE_TTL = 300  # seconds
+
+# Schedule-aware polling: refresh heaters this long after a schedule transition
+# (gives the heater time to apply the new setpoint) and poll less often between
+SCHEDULE_TRANSITION_DELAY = 30  # seconds
+SCHEDULE_RELAXED_INTERVAL_FACTOR = 2
+
+# Write confirmation: seconds to wait before each probe of a freshly written
+# heater, and how close a reported temperature must be to count as applied
+CONFIRM_PROBE_DELAYS = (1, 2, 4, 8)
+CONFIRM_TEMPERATURE_TOLERANCE = 0.5
+# Optimistic climate state: how long a commanded value is shown before it is
+# rolled back if the cloud still reports otherwise (outlasts the probes above)
+OPTIMISTIC_STATE_TIMEOUT = 20  # seconds
+
+# Write-behind journal for commands issued while the Envi cloud is unreachable
+JOURNAL_STORAGE_VERSION = 1
+JOURNAL_SAVE_DELAY = 1  # seconds - coalesces bursts of queued commands into one write
+JOURNAL_HEALTH_CHECK_INTERVAL = 30  # seconds - first API check after a failure (doubles)
+JOURNAL_MAX_HEALTH_CHECK_INTERVAL = 600  # seconds
+JOURNAL_REPLAY_INTERVAL = 1  # seconds between replayed devices
+JOURNAL_MAX_AGE = timedelta(hours=6)  # older commands are discarded, not replayed
+
+# Coordinator cycle tracing: number of recent update cycles kept for diagnostics
+TRACE_BUFFER_SIZE = 20
 
 # API Endpoints
 ENDPOINTS = {
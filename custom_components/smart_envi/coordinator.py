@@ -3,17 +3,58 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import EnviApiClient, EnviApiError, EnviAuthenticationError, EnviDeviceError
-from .const import DOMAIN, SCAN_INTERVAL
+from .api import EnviApiClient, EnviApiError, EnviAuthenticationError, EnviCircuitOpenError, EnviDeviceError, EnviRequestShedError
+from .const import (
+    ACCOUNT_DEVICE_PREFIX,
+    BULK_MAX_CONCURRENCY,
+    DEVICE_REMOVAL_GRACE_CYCLES,
+    DOMAIN,
+    MAX_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+    SCHEDULE_CACHE_TTL,
+    SCHEDULE_RELAXED_INTERVAL_FACTOR,
+    SCHEDULE_TRANSITION_DELAY,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_DEVICES_REMOVED,
+    SIGNAL_SCHEDULE_TIMELINE,
+    TRACE_BUFFER_SIZE,
+)
+from .confirm import WriteConfirmationTracker
+from .interval import CycleObservation, ScanIntervalTuner
+from .scheduler import RequestPriority, request_priority
+from .timeouts import request_deadline
+from .journal import CommandJournal
+from .models import EnviDevice
+from .schedule import ScheduleTimeline
+from .trace import CycleTrace, trace_span
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class DeviceFetchStats:
+    """Fetch bookkeeping for one device, kept for diagnostics."""
+
+    fetched_at: float | None = None  # monotonic time of the last successful fetch
+    latency: float | None = None  # seconds the last successful fetch took
+    failure_streak: int = 0
+    last_error: str | None = None
+
+
 class EnviDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Envi device data."""
 
@@ -41,9 +82,258 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
         self.client = client
         self.entry_id = entry_id
         self.device_data: dict[str, dict] = {}
+        # Decoded model of each payload in device_data (see get_device)
+        self._devices: dict[str, EnviDevice] = {}
         self.device_ids: list[str] = []
+        # Consecutive polls each previously known device has been missing for
+        self._missing_cycles: dict[str, int] = {}
+        # Schedule index keyed by schedule ID (as string), filled from schedule/list
+        self.schedules: dict[str, dict] = {}
+        self._schedules_fetched_at: float | None = None
+        self._schedules_lock = asyncio.Lock()
+        # Timed spans of the most recent update cycles (see trace.py)
+        self.traces: deque[CycleTrace] = deque(maxlen=TRACE_BUFFER_SIZE)
+        self._dispatch_trace: CycleTrace | None = None
+        # Per-device fetch latency, cache age and failure streaks
+        self.fetch_stats: dict[str, DeviceFetchStats] = {}
+        # Auto scan interval (None when the interval is fixed)
+        self.interval_tuner: ScanIntervalTuner | None = None
+        self._rate_limited_seen = 0
+        # Local setpoint timelines of heaters with an active schedule, plus one
+        # shared timer that announces the next scheduled setpoint change
+        self.schedule_timelines: dict[str, ScheduleTimeline] = {}
+        self._timeline_change_at: datetime | None = None
+        self._unsub_timeline_timer: CALLBACK_TYPE | None = None
+        # Schedule-aware polling: next schedule transition per device (UTC)
+        self.schedule_aware = False
+        self.next_transitions: dict[str, datetime] = {}
+        self._transitions_handled_until: datetime | None = None
+        self._transition_refresh_at: datetime | None = None
+        self._unsub_transition_refresh: CALLBACK_TYPE | None = None
+        # Short probes after writes until the cloud reflects them
+        self.write_confirmations = WriteConfirmationTracker(self)
+        # Commands queued while the Envi cloud is unreachable (load with async_load)
+        self.journal = CommandJournal(self, entry_id)
+
+    def async_configure_scan_interval(
+        self,
+        scan_interval: timedelta,
+        auto: bool = False,
+        schedule_aware: bool = False,
+    ) -> None:
+        """Set a fixed scan interval, or start auto-tuning from it.
+        
+        Args:
+            scan_interval: Configured interval (the starting point in auto mode)
+            auto: Let the coordinator adjust the interval from observed cycle
+                duration, rate limiting and payload changes
+            schedule_aware: Refresh heaters just after their schedule
+                transitions and poll at a relaxed interval in between
+        """
+        self.schedule_aware = schedule_aware
+        if schedule_aware:
+            scan_interval = min(
+                scan_interval * SCHEDULE_RELAXED_INTERVAL_FACTOR, timedelta(seconds=MAX_SCAN_INTERVAL)
+            )
+            self._transitions_handled_until = dt_util.utcnow()
+            self._async_plan_transition_refresh()
+        else:
+            self._async_cancel_transition_refresh()
+            self.next_transitions = {}
+
+        self.update_interval = scan_interval
+        if not auto:
+            self.interval_tuner = None
+            return
+        self.interval_tuner = ScanIntervalTuner(scan_interval.total_seconds())
+        self.update_interval = timedelta(seconds=self.interval_tuner.interval)
+        self._rate_limited_seen = self._count_rate_limited()
+
+    def _count_rate_limited(self) -> int:
+        """Total 429 responses the client has seen so far."""
+        return sum(metrics.rate_limited for metrics in self.client.metrics.endpoints.values())
+
+    def _tune_scan_interval(self, trace: CycleTrace, success: bool) -> None:
+        """Feed a finished cycle to the interval tuner and apply its decision."""
+        rate_limited = self._count_rate_limited()
+        observation = CycleObservation(
+            duration=trace.duration or 0.0,
+            rate_limited=rate_limited - self._rate_limited_seen,
+            changed_ratio=trace.attributes.get("changed_devices", 0) / max(1, trace.attributes.get("devices", 0)),
+            success=success,
+        )
+        self._rate_limited_seen = rate_limited
+        interval = self.interval_tuner.observe(observation, retry_after=self.client.rate_limit_delay())
+        if interval is not None:
+            self.update_interval = timedelta(seconds=interval)
 
     async def _async_update_data(self) -> dict[str, dict]:
+        """Fetch data from Envi API, tracing the cycle.
+        
+        The trace is kept in ``self.traces``; listener dispatch, which the
+        base class runs after this method returns, is added to it by
+        ``async_update_listeners``. In auto mode the finished cycle is also
+        fed to the interval tuner, which may change ``update_interval``
+        before the next refresh is scheduled.
+        
+        Schedule timers are armed only after the cycle's trace and request
+        deadline are no longer active: timers copy the current context, and a
+        refresh they start later must not inherit a deadline that has long
+        passed.
+        
+        Returns:
+            Dictionary mapping device_id to device data
+        """
+        trace = CycleTrace()
+        self.traces.append(trace)
+        success = False
+        # A cycle's requests must finish before the next cycle is due
+        with trace.activate(), request_deadline(self.update_interval.total_seconds()):
+            try:
+                data = await self._async_poll_devices(trace)
+                success = True
+            finally:
+                trace.finish()
+                self._dispatch_trace = trace
+                if self.interval_tuner is not None:
+                    self._tune_scan_interval(trace, success)
+
+        self._async_update_timelines()
+        if self.schedule_aware:
+            self._async_plan_transition_refresh()
+        return data
+
+    @callback
+    def _async_plan_transition_refresh(self) -> None:
+        """Compute each heater's next schedule transition and arm one timer.
+        
+        The timer fires SCHEDULE_TRANSITION_DELAY after the earliest
+        transition. Transitions that happened more than that delay ago are
+        skipped, since the poll that triggered this planning already saw
+        their effect.
+        """
+        now = dt_util.utcnow()
+        after = now - timedelta(seconds=SCHEDULE_TRANSITION_DELAY)
+        if self._transitions_handled_until is not None:
+            after = max(after, self._transitions_handled_until)
+        after = dt_util.as_local(after)
+
+        self.next_transitions = {
+            device_id: dt_util.as_utc(timeline.next_change(after)[0])
+            for device_id, timeline in self.schedule_timelines.items()
+        }
+
+        refresh_at = min(self.next_transitions.values(), default=None)
+        if refresh_at is not None:
+            refresh_at += timedelta(seconds=SCHEDULE_TRANSITION_DELAY)
+        if refresh_at == self._transition_refresh_at:
+            return
+
+        self._async_cancel_transition_refresh()
+        if refresh_at is None:
+            return
+        self._transition_refresh_at = refresh_at
+        self._unsub_transition_refresh = async_track_point_in_utc_time(
+            self.hass, self._async_handle_transition_refresh, refresh_at
+        )
+        _LOGGER.debug("Next schedule transition refresh at %s", refresh_at.isoformat())
+
+    @callback
+    def _async_cancel_transition_refresh(self) -> None:
+        """Cancel the pending schedule transition refresh, if any."""
+        if self._unsub_transition_refresh is not None:
+            self._unsub_transition_refresh()
+            self._unsub_transition_refresh = None
+        self._transition_refresh_at = None
+
+    async def _async_handle_transition_refresh(self, now: datetime) -> None:
+        """Refresh the heaters whose schedule just changed their setpoint."""
+        self._unsub_transition_refresh = None
+        refresh_at, self._transition_refresh_at = self._transition_refresh_at, None
+        if refresh_at is None or not self.schedule_aware:
+            return
+
+        transition = refresh_at - timedelta(seconds=SCHEDULE_TRANSITION_DELAY)
+        device_ids = [
+            device_id for device_id, when in self.next_transitions.items() if when <= transition
+        ]
+        self._transitions_handled_until = transition
+        if device_ids:
+            _LOGGER.debug("Refreshing %s devices after schedule transition: %s", len(device_ids), device_ids)
+            await self.async_refresh_devices(device_ids)
+        self._async_plan_transition_refresh()
+
+    @callback
+    def _async_update_timelines(self) -> None:
+        """Rebuild setpoint timelines whose schedule changed and re-arm the timer.
+        
+        Timelines are only rebuilt when a heater's payload schedule differs
+        from the one its timeline was built from, so steady polling costs a
+        dictionary comparison per heater.
+        """
+        timelines: dict[str, ScheduleTimeline] = {}
+        for device_id, data in self.device_data.items():
+            if not self.get_device(device_id).schedule_active:
+                continue
+            schedule_info = data.get("schedule")
+            timeline = self.schedule_timelines.get(device_id)
+            if timeline is None or timeline.source != schedule_info:
+                timeline = ScheduleTimeline.from_schedule(schedule_info)
+            if timeline is not None:
+                timelines[device_id] = timeline
+        self.schedule_timelines = timelines
+        self._async_arm_timeline_timer()
+
+    @callback
+    def _async_arm_timeline_timer(self) -> None:
+        """Arm the shared timer for the earliest upcoming scheduled change."""
+        now = dt_util.now()
+        change_at = min(
+            (timeline.next_change(now)[0] for timeline in self.schedule_timelines.values()),
+            default=None,
+        )
+        change_at = dt_util.as_utc(change_at) if change_at is not None else None
+        if change_at == self._timeline_change_at:
+            return
+
+        if self._unsub_timeline_timer is not None:
+            self._unsub_timeline_timer()
+            self._unsub_timeline_timer = None
+        self._timeline_change_at = change_at
+        if change_at is not None:
+            self._unsub_timeline_timer = async_track_point_in_utc_time(
+                self.hass, self._async_handle_timeline_change, change_at
+            )
+
+    @callback
+    def _async_handle_timeline_change(self, now: datetime) -> None:
+        """Announce a scheduled setpoint change and arm the timer for the next one."""
+        self._unsub_timeline_timer = None
+        self._timeline_change_at = None
+        async_dispatcher_send(self.hass, SIGNAL_SCHEDULE_TIMELINE.format(self.entry_id))
+        self._async_arm_timeline_timer()
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled refreshes, schedule timers, write confirmations and journal replay."""
+        self._async_cancel_transition_refresh()
+        self.write_confirmations.async_cancel_all()
+        self.journal.async_shutdown()
+        if self._unsub_timeline_timer is not None:
+            self._unsub_timeline_timer()
+            self._unsub_timeline_timer = None
+        await super().async_shutdown()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, timing the dispatch of a traced cycle."""
+        trace, self._dispatch_trace = self._dispatch_trace, None
+        if trace is None:
+            super().async_update_listeners()
+            return
+        with trace.activate(), trace_span("dispatch", listeners=len(self._listeners)):
+            super().async_update_listeners()
+
+    async def _async_poll_devices(self, trace: CycleTrace) -> dict[str, dict]:
         """Fetch data from Envi API.
 
         This method fetches device IDs first, then fetches data for all devices
@@ -58,8 +348,17 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
                 data is available (even from cache)
         """
         try:
-            # Always fetch device IDs first to handle new devices
-            device_ids_raw = await self.client.fetch_all_device_ids()
+            # Always fetch device IDs first to handle new devices, unless the
+            # API is rate limiting us (or device/list is failing fast) and we
+            # already know the fleet
+            try:
+                with trace_span("device_list"), request_priority(RequestPriority.DISCOVERY):
+                    device_ids_raw = await self.client.fetch_all_device_ids()
+            except (EnviRequestShedError, EnviCircuitOpenError) as err:
+                if not self.device_ids:
+                    raise
+                _LOGGER.debug("%s - polling the %s known devices without device/list", err, len(self.device_ids))
+                device_ids_raw = self.device_ids
             # Ensure all device IDs are strings
             device_ids = [str(did) for did in device_ids_raw]
             _LOGGER.debug("Fetched %s device IDs: %s", len(device_ids), device_ids)
@@ -71,7 +370,9 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
                     return self.device_data
                 raise UpdateFailed("No devices found in Envi account")
             
-            # Update device_ids list
+            # Update device_ids list, remembering what changed for announcement
+            previous_ids = set(self.device_ids)
+            added_ids = [did for did in device_ids if did not in previous_ids] if previous_ids else []
             self.device_ids = device_ids
 
             # Fetch data for all devices in parallel using asyncio.gather
@@ -80,46 +381,71 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
             for device_id in device_ids:
                 tasks.append(self._fetch_device_data_safe(device_id))
             
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            with trace_span("device_fetches", devices=len(device_ids)):
+                results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Process results and handle failures gracefully
-            successful_updates = 0
-            failed_devices = []
-            for i, device_id in enumerate(device_ids):
-                result = results[i]
-                if isinstance(result, Exception):
-                    failed_devices.append((device_id, str(result)))
-                    _LOGGER.warning(
-                        "Error fetching device %s: %s. Keeping cached data if available.",
-                        device_id,
-                        result,
-                    )
-                    # Keep previous data if available (graceful degradation)
-                    if device_id in self.device_data:
-                        device_data[device_id] = self.device_data[device_id]
-                        _LOGGER.debug("Using cached data for device %s", device_id)
-                    else:
-                        _LOGGER.error(
-                            "Device %s failed and no cached data available. "
-                            "Device will appear unavailable.",
+            with trace_span("process"):
+                successful_updates = 0
+                changed_devices = 0
+                failed_devices = []
+                for i, device_id in enumerate(device_ids):
+                    result = results[i]
+                    if isinstance(result, Exception):
+                        failed_devices.append((device_id, str(result)))
+                        # An open circuit is reported once by the breaker, not per device
+                        _LOGGER.log(
+                            logging.DEBUG if isinstance(result, EnviCircuitOpenError) else logging.WARNING,
+                            "Error fetching device %s: %s. Keeping cached data if available.",
                             device_id,
+                            result,
                         )
+                        # Keep previous data if available (graceful degradation)
+                        if device_id in self.device_data:
+                            device_data[device_id] = self.device_data[device_id]
+                            _LOGGER.debug("Using cached data for device %s", device_id)
+                        else:
+                            _LOGGER.error(
+                                "Device %s failed and no cached data available. "
+                                "Device will appear unavailable.",
+                                device_id,
+                            )
+                    else:
+                        previous = self.device_data.get(device_id)
+                        if result != previous:
+                            changed_devices += 1
+                            device_data[device_id] = result
+                        else:
+                            # Keep the unchanged payload so its decoded model is reused
+                            device_data[device_id] = previous
+                        successful_updates += 1
+            
+                # Log summary
+                if failed_devices:
+                    _LOGGER.warning(
+                        "Update completed with %s successful and %s failed devices",
+                        successful_updates,
+                        len(failed_devices),
+                    )
                 else:
-                    device_data[device_id] = result
-                    successful_updates += 1
-            
-            # Log summary
-            if failed_devices:
-                _LOGGER.warning(
-                    "Update completed with %s successful and %s failed devices",
-                    successful_updates,
-                    len(failed_devices),
-                )
-            else:
-                _LOGGER.debug("Successfully updated all %s devices", successful_updates)
+                    _LOGGER.debug("Successfully updated all %s devices", successful_updates)
 
-            # Store the data
-            self.device_data = device_data
+                # Store the data, dropping models of devices no longer polled
+                self.device_data = device_data
+                for device_id in self._devices.keys() - device_data.keys():
+                    del self._devices[device_id]
+
+                # Announce new heaters so platforms can add their entities, and
+                # retire heaters that have been gone for several polls
+                if added_ids:
+                    _LOGGER.info("Discovered %s new devices: %s", len(added_ids), added_ids)
+                    async_dispatcher_send(self.hass, SIGNAL_DEVICES_ADDED.format(self.entry_id), added_ids)
+                self._async_track_missing_devices(previous_ids)
+            trace.attributes.update(
+                devices=len(device_ids),
+                failed_devices=len(failed_devices),
+                changed_devices=changed_devices,
+            )
 
             # Only fail if we have no data at all (not even cached)
             if not device_data:
@@ -139,7 +465,58 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Unexpected error during update: %s", err, exc_info=True)
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
-    async def async_refresh_device(self, device_id: str) -> dict | None:
+    def _async_track_missing_devices(self, previous_ids: set[str]) -> None:
+        """Retire devices missing from device/list for several consecutive polls.
+        
+        A heater is only removed after DEVICE_REMOVAL_GRACE_CYCLES misses so a
+        single incomplete device list doesn't wipe user customizations.
+        
+        Args:
+            previous_ids: Device IDs known before this poll
+        """
+        current_ids = set(self.device_ids)
+        for device_id in previous_ids - current_ids:
+            self._missing_cycles[device_id] = self._missing_cycles.get(device_id, 0)
+        for device_id in current_ids:
+            self._missing_cycles.pop(device_id, None)
+
+        removed_ids = []
+        for device_id in list(self._missing_cycles):
+            self._missing_cycles[device_id] += 1
+            if self._missing_cycles[device_id] >= DEVICE_REMOVAL_GRACE_CYCLES:
+                del self._missing_cycles[device_id]
+                removed_ids.append(device_id)
+        if not removed_ids:
+            return
+
+        for device_id in removed_ids:
+            self.fetch_stats.pop(device_id, None)
+        _LOGGER.info("Removing %s devices no longer in the account: %s", len(removed_ids), removed_ids)
+        async_dispatcher_send(self.hass, SIGNAL_DEVICES_REMOVED.format(self.entry_id), removed_ids)
+        self.async_remove_stale_devices(keep=current_ids | set(self._missing_cycles))
+
+    def async_remove_stale_devices(self, keep: set[str] | None = None) -> None:
+        """Remove device registry entries for heaters no longer in the account.
+        
+        Removing the device also removes all of its entities. The account's
+        service device (API diagnostics) is never removed.
+        
+        Args:
+            keep: Device IDs to keep (defaults to the current device IDs)
+        """
+        keep = set(self.device_ids) if keep is None else keep
+        dev_reg = device_registry.async_get(self.hass)
+        for device in device_registry.async_entries_for_config_entry(dev_reg, self.entry_id):
+            device_ids = {
+                identifier
+                for domain, identifier in device.identifiers
+                if domain == DOMAIN and not identifier.startswith(ACCOUNT_DEVICE_PREFIX)
+            }
+            if device_ids and not device_ids & keep:
+                _LOGGER.info("Removing stale device %s (%s)", device.name, ", ".join(device_ids))
+                dev_reg.async_update_device(device.id, remove_config_entry_id=self.entry_id)
+
+    async def async_refresh_device(self, device_id: str, notify: bool = True) -> dict | None:
         """Manually refresh a specific device.
         
         This method fetches fresh data for a single device and updates the
@@ -148,34 +525,196 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
         
         Args:
             device_id: Device ID to refresh
+            notify: Notify listeners (write confirmation probes skip this and
+                notify once when they finish)
             
         Returns:
             Updated device data dictionary, or None if refresh failed
         """
         device_id_str = str(device_id)
+        started = time.monotonic()
         try:
             data = await self.client.get_device_state(device_id_str)
             
             # Validate data
             if not data or not isinstance(data, dict):
                 _LOGGER.warning("Invalid data received for device %s", device_id_str)
+                self._record_fetch_failure(device_id_str, "invalid data")
                 return None
             
+            self._record_fetch_success(device_id_str, started)
             self.device_data[device_id_str] = data
+            self._async_update_timelines()
             # Notify listeners that this device's data changed
-            self.async_update_listeners()
+            if notify:
+                self.async_update_listeners()
             _LOGGER.debug("Successfully refreshed device %s", device_id_str)
             return data
         except EnviAuthenticationError as err:
             _LOGGER.error("Authentication failed while refreshing device %s: %s", device_id_str, err)
+            self._record_fetch_failure(device_id_str, err)
+            return None
+        except EnviCircuitOpenError as err:
+            _LOGGER.debug("Skipped refreshing device %s: %s", device_id_str, err)
+            self._record_fetch_failure(device_id_str, err)
             return None
         except EnviApiError as err:
             _LOGGER.error("API error refreshing device %s: %s", device_id_str, err)
+            self._record_fetch_failure(device_id_str, err)
             return None
         except Exception as err:
             _LOGGER.error("Unexpected error refreshing device %s: %s", device_id_str, err, exc_info=True)
+            self._record_fetch_failure(device_id_str, err)
             return None
 
+    async def async_refresh_devices(self, device_ids: list[str]) -> dict[str, Exception | None]:
+        """Refresh several devices and notify listeners once.
+        
+        Fetches run with bounded concurrency and are traced as their own
+        cycle. Devices that fail keep their cached data.
+        
+        Args:
+            device_ids: Device IDs to refresh
+            
+        Returns:
+            Mapping of device ID to None on success, or the exception raised
+        """
+        trace = CycleTrace("refresh_devices")
+        self.traces.append(trace)
+        with trace.activate():
+            try:
+                raw_results = await self.async_run_bounded({
+                    str(device_id): (lambda device_id=str(device_id): self._fetch_device_data_safe(device_id))
+                    for device_id in device_ids
+                })
+            finally:
+                trace.finish()
+
+        results: dict[str, Exception | None] = {}
+        for device_id, result in raw_results.items():
+            if isinstance(result, Exception):
+                results[device_id] = result
+            else:
+                self.device_data[device_id] = result
+                results[device_id] = None
+        trace.attributes.update(
+            devices=len(results),
+            failed_devices=sum(1 for error in results.values() if error is not None),
+        )
+
+        if len(results) > trace.attributes["failed_devices"]:
+            self._async_update_timelines()
+            self._dispatch_trace = trace
+            self.async_update_listeners()
+        return results
+
+    def async_confirm_write(self, device_id: str, expected: dict[str, Any]) -> asyncio.Task:
+        """Probe a device after a write until its payload reflects the write.
+        
+        Replaces a single immediate refresh, which usually returns the values
+        from before the heater synced. Probes follow CONFIRM_PROBE_DELAYS and
+        stop as soon as the expected values show up or
+        ``device_status_res_at`` advances; listeners are notified once.
+        
+        Args:
+            device_id: Device that was written to
+            expected: Device payload fields and the values the write should
+                produce (e.g. ``{"current_temperature": 70}``)
+                
+        Returns:
+            Task resolving to whether the write was confirmed
+        """
+        return self.write_confirmations.async_track(device_id, expected)
+
+    def _record_fetch_success(self, device_id: str, started: float) -> None:
+        """Record a successful device fetch that started at ``started`` (monotonic)."""
+        stats = self.fetch_stats.setdefault(device_id, DeviceFetchStats())
+        stats.fetched_at = time.monotonic()
+        stats.latency = stats.fetched_at - started
+        stats.failure_streak = 0
+        stats.last_error = None
+
+    def _record_fetch_failure(self, device_id: str, error: Exception | str) -> None:
+        """Record a failed device fetch."""
+        stats = self.fetch_stats.setdefault(device_id, DeviceFetchStats())
+        stats.failure_streak += 1
+        stats.last_error = str(error)
+
+    async def async_run_bounded(
+        self,
+        jobs: dict[str, Callable[[], Awaitable[Any]]],
+        limit: int = BULK_MAX_CONCURRENCY,
+    ) -> dict[str, Any]:
+        """Run API jobs with bounded concurrency and rate-limit awareness.
+        
+        At most ``limit`` jobs run at once. Before starting each job, any
+        Retry-After window reported by the API client is honoured so a bulk
+        operation slows down instead of hammering a rate-limited account.
+        
+        Args:
+            jobs: Mapping of key (usually a device ID) to a zero-argument
+                coroutine factory
+            limit: Maximum number of jobs in flight at the same time
+            
+        Returns:
+            Mapping of key to the job result, or to the exception it raised
+        """
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def _run(key: str, job: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                delay = self.client.rate_limit_delay()
+                if delay:
+                    _LOGGER.debug("Rate limited - delaying job %s by %.1f seconds", key, delay)
+                    await asyncio.sleep(delay)
+                return await job()
+
+        keys = list(jobs)
+        results = await asyncio.gather(
+            *(_run(key, jobs[key]) for key in keys), return_exceptions=True
+        )
+        return dict(zip(keys, results))
+
+    async def async_bulk_update_devices(self, payloads: dict[str, dict]) -> dict[str, Exception | None]:
+        """Apply update payloads to many devices and refresh once at the end.
+        
+        Unlike calling ``update_device`` followed by ``async_refresh_device``
+        for every heater, this fans the writes out with bounded concurrency and
+        then performs a single coordinator refresh, so listeners are notified
+        once for the whole batch.
+        
+        Args:
+            payloads: Mapping of device ID to update payload (temperature,
+                state and/or mode)
+                
+        Returns:
+            Mapping of device ID to None on success, or the exception raised
+        """
+        jobs = {
+            str(device_id): (lambda device_id=str(device_id), payload=payload: self.client.update_device(device_id, payload))
+            for device_id, payload in payloads.items()
+        }
+        raw_results = await self.async_run_bounded(jobs)
+
+        results: dict[str, Exception | None] = {}
+        for device_id, result in raw_results.items():
+            if isinstance(result, Exception):
+                _LOGGER.warning("Bulk update failed for device %s: %s", device_id, result)
+                results[device_id] = result
+            else:
+                results[device_id] = None
+
+        succeeded = sum(1 for error in results.values() if error is None)
+        _LOGGER.info(
+            "Bulk update completed: %s succeeded, %s failed",
+            succeeded,
+            len(results) - succeeded,
+        )
+        if succeeded:
+            # One consolidated refresh instead of one GET + listener fan-out per device
+            await self.async_refresh()
+        return results
+
     async def _fetch_device_data_safe(self, device_id: str) -> dict:
         """Safely fetch device data with error handling and validation.
         
@@ -195,29 +734,223 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
             Exception: For unexpected errors
         """
         device_id_str = str(device_id)
+        started = time.monotonic()
         try:
-            data = await self.client.get_device_state(device_id_str)
+            with trace_span("device_fetch", track=device_id_str):
+                data = await self.client.get_device_state(device_id_str)
             
             # Validate we got meaningful data
             if not data or not isinstance(data, dict):
                 _LOGGER.warning("Empty or invalid data for device %s", device_id_str)
                 raise EnviDeviceError(f"Invalid data for device {device_id_str}")
             
-            _LOGGER.debug("Fetched data for device %s: %s", device_id_str, data.get("name", "Unknown"))
+            self._record_fetch_success(device_id_str, started)
             return data
         except EnviDeviceError as err:
             # Device-specific errors - don't retry, but log
             _LOGGER.warning("Device error for %s: %s", device_id_str, err)
+            self._record_fetch_failure(device_id_str, err)
+            raise
+        except EnviCircuitOpenError as err:
+            # API known to be down - fail fast, the cached payload is served
+            _LOGGER.debug("Skipped fetching device %s: %s", device_id_str, err)
+            self._record_fetch_failure(device_id_str, err)
             raise
         except EnviApiError as err:
             # API errors - may be transient, log but don't retry here (retry handled in API client)
             _LOGGER.warning("API error fetching device %s: %s", device_id_str, err)
+            self._record_fetch_failure(device_id_str, err)
             raise
         except Exception as err:
             # Unexpected errors - log with full context
             _LOGGER.warning("Unexpected error fetching device %s: %s", device_id_str, err, exc_info=True)
+            self._record_fetch_failure(device_id_str, err)
             raise
 
+    async def async_get_schedules(self, force: bool = False) -> dict[str, dict]:
+        """Get the schedule index, fetching schedule/list only when stale.
+        
+        The index is shared by all callers and refreshed at most once per
+        SCHEDULE_CACHE_TTL, so re-applying schedules for every heater costs a
+        single list download instead of one per call.
+        
+        Args:
+            force: Fetch a fresh schedule list even if the cache is still valid
+            
+        Returns:
+            Dictionary mapping schedule ID (as string) to schedule data
+            
+        Raises:
+            EnviApiError: If fetching the schedule list fails
+        """
+        async with self._schedules_lock:
+            if (
+                not force
+                and self._schedules_fetched_at is not None
+                and time.monotonic() - self._schedules_fetched_at < SCHEDULE_CACHE_TTL
+            ):
+                return self.schedules
+
+            schedule_list = await self.client.get_schedule_list()
+            self.schedules = {
+                str(schedule["id"]): schedule
+                for schedule in schedule_list
+                if isinstance(schedule, dict) and schedule.get("id") is not None
+            }
+            self._schedules_fetched_at = time.monotonic()
+            _LOGGER.debug("Cached %s schedules", len(self.schedules))
+            return self.schedules
+
+    def get_device_schedule_id(self, device_id: str) -> str | None:
+        """Get the schedule ID reported in a device's cached payload.
+        
+        Args:
+            device_id: Device ID to look up
+            
+        Returns:
+            Schedule ID as string, or None if the device has no schedule
+        """
+        device = self.get_device(device_id)
+        if device is None or device.schedule is None:
+            return None
+        return device.schedule.schedule_id
+
+    async def async_get_device_schedule(self, device_id: str) -> dict | None:
+        """Get the current schedule of a device from the cached schedule index.
+        
+        Uses the schedule ID from the coordinator's cached device payload, so no
+        live device GET is needed. Falls back to matching on device_id for
+        schedules the device payload doesn't reference yet.
+        
+        Args:
+            device_id: Device ID to look up
+            
+        Returns:
+            Schedule dictionary, or None if the device has no schedule
+        """
+        schedules = await self.async_get_schedules()
+        device_id_str = str(device_id)
+        schedule_id = self.get_device_schedule_id(device_id_str)
+        if schedule_id and schedule_id in schedules:
+            return schedules[schedule_id]
+        for schedule in schedules.values():
+            if str(schedule.get("device_id")) == device_id_str:
+                return schedule
+        if schedule_id:
+            # Referenced by the device but not in the list yet - treat as known
+            return {"id": schedule_id, "device_id": device_id_str}
+        return None
+
+    def async_store_schedule(self, schedule_id: str | int, changes: dict) -> None:
+        """Merge a successful schedule write into the cached index.
+        
+        Args:
+            schedule_id: ID of the schedule that was written
+            changes: Fields that were sent to the API
+        """
+        key = str(schedule_id)
+        self.schedules[key] = {**self.schedules.get(key, {"id": schedule_id}), **changes}
+
+    def async_remove_schedule(self, schedule_id: str | int) -> None:
+        """Drop a deleted schedule from the cached index."""
+        self.schedules.pop(str(schedule_id), None)
+
+    def async_invalidate_schedules(self) -> None:
+        """Force the next schedule index access to fetch schedule/list again."""
+        self._schedules_fetched_at = None
+
+    async def async_apply_schedule_plan(self, plan: dict[str, list]) -> dict[str, Exception | None]:
+        """Execute a schedule reconciliation plan with bounded concurrency.
+        
+        Args:
+            plan: Plan as returned by ``plan_schedule_import`` with ``add``,
+                ``update`` and ``delete`` operations
+                
+        Returns:
+            Mapping of operation key (e.g. "update:123") to None on success, or
+            the exception raised
+        """
+        jobs: dict[str, Callable[[], Awaitable[Any]]] = {}
+        for index, payload in enumerate(plan.get("add", [])):
+            jobs[f"add:{payload['device_id']}:{index}"] = (
+                lambda payload=payload: self.client.create_schedule(payload)
+            )
+        for schedule_id, changes in plan.get("update", []):
+            jobs[f"update:{schedule_id}"] = (
+                lambda schedule_id=schedule_id, changes=changes: self.client.update_schedule(schedule_id, changes)
+            )
+        for schedule_id in plan.get("delete", []):
+            jobs[f"delete:{schedule_id}"] = (
+                lambda schedule_id=schedule_id: self.client.delete_schedule(schedule_id)
+            )
+        if not jobs:
+            return {}
+
+        raw_results = await self.async_run_bounded(jobs)
+        results: dict[str, Exception | None] = {}
+        for key, result in raw_results.items():
+            if isinstance(result, Exception):
+                _LOGGER.warning("Schedule operation %s failed: %s", key, result)
+                results[key] = result
+            else:
+                results[key] = None
+
+        # IDs of created schedules are only known from a fresh list; device
+        # payloads carry the active schedule, so refresh those once as well
+        self.async_invalidate_schedules()
+        await self.async_request_refresh()
+        return results
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return coordinator state for the diagnostics download.
+        
+        Returns:
+            Poll settings and status, per-device cache age, last fetch latency
+            and failure streak, schedule cache state and the last finished
+            cycle's timing
+        """
+        now = time.monotonic()
+
+        def _age(timestamp: float | None) -> float | None:
+            return round(now - timestamp, 1) if timestamp is not None else None
+
+        devices = {}
+        for device_id in self.device_ids:
+            stats = self.fetch_stats.get(device_id, DeviceFetchStats())
+            devices[device_id] = {
+                "cached": device_id in self.device_data,
+                "cache_age_s": _age(stats.fetched_at),
+                "last_fetch_latency_ms": round(stats.latency * 1000, 1) if stats.latency is not None else None,
+                "failure_streak": stats.failure_streak,
+                "last_error": stats.last_error,
+            }
+
+        finished = [trace for trace in self.traces if trace.duration is not None]
+        return {
+            "update_interval_s": self.update_interval.total_seconds() if self.update_interval else None,
+            "last_update_success": self.last_update_success,
+            "last_exception": str(self.last_exception) if self.last_exception else None,
+            "device_count": len(self.device_ids),
+            "devices": devices,
+            "missing_devices": dict(self._missing_cycles),
+            "schedules": {
+                "cached": len(self.schedules),
+                "cache_age_s": _age(self._schedules_fetched_at),
+                "ttl_s": SCHEDULE_CACHE_TTL,
+                "timelines": len(self.schedule_timelines),
+                "next_change_at": self._timeline_change_at.isoformat() if self._timeline_change_at else None,
+            },
+            "bulk_max_concurrency": BULK_MAX_CONCURRENCY,
+            "write_confirmations": self.write_confirmations.as_dict(),
+            "command_journal": self.journal.as_dict(),
+            "auto_scan_interval": self.interval_tuner.as_dict() if self.interval_tuner else None,
+            "schedule_transitions": {
+                "next_refresh_at": self._transition_refresh_at.isoformat() if self._transition_refresh_at else None,
+                "devices": {device_id: when.isoformat() for device_id, when in self.next_transitions.items()},
+            } if self.schedule_aware else None,
+            "last_cycle": finished[-1].summary() if finished else None,
+        }
+
     def get_device_data(self, device_id: str) -> dict | None:
         """Get cached device data for a specific device.
         
@@ -229,3 +962,24 @@ class EnviDataUpdateCoordinator(DataUpdateCoordinator):
         """
         return self.device_data.get(str(device_id))
 
+    def get_device(self, device_id: str) -> EnviDevice | None:
+        """Get the decoded model of a device's cached payload.
+        
+        The model is built once per payload and shared by every caller until
+        the payload changes (see models.py).
+        
+        Args:
+            device_id: Device ID to retrieve the model for
+            
+        Returns:
+            Device model, or None if device not found or not yet cached
+        """
+        device_id = str(device_id)
+        data = self.device_data.get(device_id)
+        if not data:
+            return None
+        device = self._devices.get(device_id)
+        if device is None or device.raw is not data:
+            device = self._devices[device_id] = EnviDevice.from_payload(data)
+        return device
+
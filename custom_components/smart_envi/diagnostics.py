@@ -0,0 +1,48 @@
+"""Diagnostics support for Smart Envi integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD, "token", "access_token", "refresh_token", "serial_no", "email"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Collects what would otherwise have to be pieced together from debug logs:
+    API client state (token expiry, rate-limit window, retry settings),
+    request metrics, coordinator caches (per-device cache age, last fetch
+    latency and failure streak, schedule cache) and cycle timing.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry to dump
+
+    Returns:
+        Redacted diagnostics dictionary
+    """
+    client = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    coordinator = hass.data.get(DOMAIN, {}).get(f"{DOMAIN}_coordinator_{entry.entry_id}")
+    traces = list(coordinator.traces) if coordinator else []
+
+    return async_redact_data(
+        {
+            "entry": {
+                "data": dict(entry.data),
+                "options": dict(entry.options),
+            },
+            "client": client.as_diagnostics() if client else None,
+            "api_metrics": client.metrics.as_dict() if client else None,
+            "coordinator": coordinator.as_diagnostics() if coordinator else None,
+            "cycle_traces": [trace.summary() for trace in traces[:-1]],
+            "last_cycle_trace": traces[-1].as_dict() if traces else None,
+        },
+        TO_REDACT,
+    )
@@ -0,0 +1,166 @@
+"""Self-tuning scan interval for the Smart Envi coordinator.
+
+In auto mode the coordinator reports every update cycle to a
+``ScanIntervalTuner``: how long the cycle took, how many requests were
+rate limited (HTTP 429) and how many heaters returned a payload different
+from the cached one. The tuner keeps a short window of those observations
+and moves the interval within [MIN_SCAN_INTERVAL, MAX_SCAN_INTERVAL]:
+
+* a 429 doubles the interval straight away (and never undercuts Retry-After);
+* cycles that take a large share of the interval push it out;
+* data that keeps changing on a healthy API tightens it;
+* a window in which nothing changed relaxes it.
+
+Apart from rate limiting, the interval is only reconsidered once a full
+window has been observed since the last adjustment, so it doesn't oscillate
+on single noisy cycles.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from .const import (
+    AUTO_SCAN_BACKOFF_FACTOR,
+    AUTO_SCAN_CHANGE_THRESHOLD,
+    AUTO_SCAN_MAX_DUTY_CYCLE,
+    AUTO_SCAN_RELAX_FACTOR,
+    AUTO_SCAN_TIGHTEN_FACTOR,
+    AUTO_SCAN_WINDOW,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class CycleObservation:
+    """What the tuner learned from one update cycle."""
+
+    duration: float  # seconds
+    rate_limited: int  # 429 responses during the cycle
+    changed_ratio: float  # share of heaters whose payload changed (0-1)
+    success: bool
+
+
+@dataclass
+class IntervalAdjustment:
+    """One change of the scan interval."""
+
+    at: datetime
+    previous: float  # seconds
+    interval: float  # seconds
+    reason: str
+
+    def as_dict(self) -> dict:
+        """Return the adjustment as a plain dictionary."""
+        return {
+            "at": self.at.isoformat(),
+            "previous_s": self.previous,
+            "interval_s": self.interval,
+            "reason": self.reason,
+        }
+
+
+class ScanIntervalTuner:
+    """Adjust a scan interval from observed cycle duration, 429s and data churn."""
+
+    def __init__(
+        self,
+        initial: float,
+        minimum: float = MIN_SCAN_INTERVAL,
+        maximum: float = MAX_SCAN_INTERVAL,
+        window: int = AUTO_SCAN_WINDOW,
+    ) -> None:
+        """Initialize the tuner.
+
+        Args:
+            initial: Starting interval in seconds (usually the configured
+                scan interval)
+            minimum: Lowest interval the tuner may choose
+            maximum: Highest interval the tuner may choose
+            window: Number of cycles considered per decision
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self.interval = self._clamp(initial)
+        self.observations: deque[CycleObservation] = deque(maxlen=window)
+        self.adjustments: deque[IntervalAdjustment] = deque(maxlen=window)
+        self._cycles_since_adjustment = 0
+
+    def _clamp(self, seconds: float) -> float:
+        """Round to whole seconds inside the allowed range."""
+        return float(min(self.maximum, max(self.minimum, math.ceil(seconds))))
+
+    @property
+    def last_adjustment(self) -> IntervalAdjustment | None:
+        """Most recent interval change, if any."""
+        return self.adjustments[-1] if self.adjustments else None
+
+    def observe(self, observation: CycleObservation, retry_after: float = 0.0) -> float | None:
+        """Record a cycle and return the new interval if it should change.
+
+        Args:
+            observation: Measurements of the cycle that just finished
+            retry_after: Seconds the API asked the client to wait (Retry-After)
+
+        Returns:
+            New interval in seconds, or None to keep the current one
+        """
+        self.observations.append(observation)
+        self._cycles_since_adjustment += 1
+
+        if observation.rate_limited:
+            target = max(self.interval * AUTO_SCAN_BACKOFF_FACTOR, retry_after)
+            return self._adjust(target, "rate_limited")
+
+        if self._cycles_since_adjustment < self.window:
+            return None
+
+        cycles = list(self.observations)
+        durations = [cycle.duration for cycle in cycles if cycle.success]
+        slowest = max(durations, default=0.0)
+        # Fastest interval the API sustains: cycles may fill at most this share of it
+        floor = slowest / AUTO_SCAN_MAX_DUTY_CYCLE
+
+        if floor > self.interval:
+            return self._adjust(floor, "slow_cycles")
+
+        healthy = all(cycle.success and not cycle.rate_limited for cycle in cycles)
+        changing = sum(1 for cycle in cycles if cycle.changed_ratio > 0) / len(cycles)
+        if healthy and changing >= AUTO_SCAN_CHANGE_THRESHOLD:
+            return self._adjust(max(self.interval * AUTO_SCAN_TIGHTEN_FACTOR, floor), "data_changing")
+        if not changing:
+            return self._adjust(self.interval * AUTO_SCAN_RELAX_FACTOR, "no_changes")
+        return None
+
+    def _adjust(self, target: float, reason: str) -> float | None:
+        """Move to ``target`` (clamped) and log the change."""
+        interval = self._clamp(target)
+        self._cycles_since_adjustment = 0
+        if interval == self.interval:
+            return None
+
+        previous, self.interval = self.interval, interval
+        self.adjustments.append(IntervalAdjustment(datetime.now(timezone.utc), previous, interval, reason))
+        _LOGGER.info("Adjusted scan interval from %ss to %ss (%s)", int(previous), int(interval), reason)
+        return interval
+
+    def as_dict(self) -> dict:
+        """Return tuner state for diagnostics and sensor attributes."""
+        cycles = list(self.observations)
+        return {
+            "interval_s": self.interval,
+            "min_s": self.minimum,
+            "max_s": self.maximum,
+            "window_cycles": len(cycles),
+            "changing_cycles": sum(1 for cycle in cycles if cycle.changed_ratio > 0),
+            "rate_limited": sum(cycle.rate_limited for cycle in cycles),
+            "max_cycle_s": round(max((cycle.duration for cycle in cycles), default=0.0), 3),
+            "adjustments": [adjustment.as_dict() for adjustment in self.adjustments],
+        }
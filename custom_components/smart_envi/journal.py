@@ -0,0 +1,274 @@
+"""Write-behind command journal for Smart Envi heaters.
+
+When the Envi cloud can't be reached, heater commands (setpoint, on/off,
+mode) are journaled instead of being lost. The journal:
+
+* is persisted in Home Assistant storage, so queued commands survive a
+  restart;
+* keeps one entry per device and field, so a newer setpoint replaces an
+  older one that was never delivered;
+* checks the API with ``test_connection`` on a backoff schedule while
+  commands are pending, and replays them in the order they were queued,
+  one device at a time and paced so the recovering API isn't flooded.
+
+Commands older than JOURNAL_MAX_AGE are discarded instead of replayed: a
+setpoint from yesterday is more likely to surprise than to help.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import EnviApiError, EnviConnectionError, EnviRateLimitError
+from .scheduler import RequestPriority, request_priority
+from .const import (
+    DOMAIN,
+    JOURNAL_HEALTH_CHECK_INTERVAL,
+    JOURNAL_MAX_AGE,
+    JOURNAL_MAX_HEALTH_CHECK_INTERVAL,
+    JOURNAL_REPLAY_INTERVAL,
+    JOURNAL_SAVE_DELAY,
+    JOURNAL_STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import EnviDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Writable fields and the device payload fields that report them back
+JOURNAL_FIELDS = {
+    "temperature": "current_temperature",
+    "state": "state",
+    "mode": "current_mode",
+}
+
+
+def _storage_key(entry_id: str) -> str:
+    """Return the storage key of a config entry's journal."""
+    return f"{DOMAIN}.journal.{entry_id}"
+
+
+async def async_remove_journal(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete a config entry's journal from storage (entry removed)."""
+    await Store(hass, JOURNAL_STORAGE_VERSION, _storage_key(entry_id)).async_remove()
+
+
+class CommandJournal:
+    """Persistent per-device queue of commands that couldn't be delivered."""
+
+    def __init__(self, coordinator: EnviDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize the journal.
+
+        Args:
+            coordinator: Coordinator of the account the commands belong to
+            entry_id: Config entry ID (names the storage file)
+        """
+        self.coordinator = coordinator
+        self.hass = coordinator.hass
+        self._store: Store = Store(self.hass, JOURNAL_STORAGE_VERSION, _storage_key(entry_id))
+        # device_id -> field -> {"value", "seq", "queued_at"}
+        self.entries: dict[str, dict[str, dict[str, Any]]] = {}
+        self._seq = 0
+        self._health_check_interval = JOURNAL_HEALTH_CHECK_INTERVAL
+        self._unsub_health_check: CALLBACK_TYPE | None = None
+        self._replay_lock = asyncio.Lock()
+        self.replayed = 0
+        self.discarded = 0
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued field writes."""
+        return sum(len(fields) for fields in self.entries.values())
+
+    async def async_load(self) -> None:
+        """Load queued commands from storage and start health checks if any."""
+        data = await self._store.async_load() or {}
+        self.entries = data.get("entries", {})
+        self._seq = max(
+            (entry["seq"] for fields in self.entries.values() for entry in fields.values()),
+            default=0,
+        )
+        if self.entries:
+            _LOGGER.info("Loaded %s queued heater commands from storage", self.pending_count)
+            self._async_schedule_health_check(0)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the journal as stored."""
+        return {"entries": self.entries}
+
+    @callback
+    def async_enqueue(self, device_id: str, payload: dict[str, Any]) -> None:
+        """Queue a command that couldn't be delivered.
+
+        Fields already queued for the device are replaced, so only the latest
+        value of each field is replayed.
+
+        Args:
+            device_id: Target device
+            payload: Update payload (``temperature``, ``state`` and/or ``mode``)
+        """
+        device_id = str(device_id)
+        fields = self.entries.setdefault(device_id, {})
+        queued_at = dt_util.utcnow().isoformat()
+        for field, value in payload.items():
+            if field not in JOURNAL_FIELDS:
+                continue
+            self._seq += 1
+            fields[field] = {"value": value, "seq": self._seq, "queued_at": queued_at}
+        _LOGGER.warning(
+            "Envi cloud unreachable - queued %s for device %s (%s commands pending)",
+            payload,
+            device_id,
+            self.pending_count,
+        )
+        self._store.async_delay_save(self._data_to_save, JOURNAL_SAVE_DELAY)
+        self._health_check_interval = JOURNAL_HEALTH_CHECK_INTERVAL
+        if self._unsub_health_check is None:
+            self._async_schedule_health_check(JOURNAL_HEALTH_CHECK_INTERVAL)
+        self.coordinator.async_update_listeners()
+
+    @callback
+    def _async_schedule_health_check(self, delay: float) -> None:
+        """Check the API again after ``delay`` seconds."""
+        if self._unsub_health_check is not None:
+            self._unsub_health_check()
+        self._unsub_health_check = async_call_later(self.hass, delay, self._async_handle_health_check)
+
+    async def _async_handle_health_check(self, _now) -> None:
+        """Replay queued commands if the API is reachable, otherwise back off."""
+        self._unsub_health_check = None
+        if not self.entries:
+            return
+        if not await self.coordinator.client.test_connection():
+            self._health_check_interval = min(self._health_check_interval * 2, JOURNAL_MAX_HEALTH_CHECK_INTERVAL)
+            _LOGGER.debug(
+                "Envi cloud still unreachable; next check in %s seconds", self._health_check_interval
+            )
+            self._async_schedule_health_check(self._health_check_interval)
+            return
+        await self.async_replay()
+
+    async def async_replay(self) -> None:
+        """Deliver queued commands in the order they were queued.
+
+        Stops at the first connection error or persistent rate limiting and
+        schedules another health check; commands the API rejects outright
+        (e.g. a 400) are dropped.
+        """
+        async with self._replay_lock:
+            cutoff = dt_util.utcnow() - JOURNAL_MAX_AGE
+            devices = sorted(self.entries, key=lambda device_id: min(
+                (entry["seq"] for entry in self.entries[device_id].values()), default=0
+            ))
+            for index, device_id in enumerate(devices):
+                fields = self.entries.get(device_id, {})
+                payload = {}
+                for field, entry in list(fields.items()):
+                    if dt_util.parse_datetime(entry["queued_at"]) < cutoff:
+                        _LOGGER.warning(
+                            "Discarding stale queued %s=%s for device %s (queued at %s)",
+                            field, entry["value"], device_id, entry["queued_at"],
+                        )
+                        del fields[field]
+                        self.discarded += 1
+                    else:
+                        payload[field] = entry["value"]
+                if not payload:
+                    self.entries.pop(device_id, None)
+                    continue
+
+                if index:
+                    await asyncio.sleep(max(JOURNAL_REPLAY_INTERVAL, self.coordinator.client.rate_limit_delay()))
+                sent = {field: dict(fields[field]) for field in payload}
+                try:
+                    # Fresh user commands go out ahead of replayed ones
+                    with request_priority(RequestPriority.CONFIRMATION):
+                        await self.coordinator.client.update_device(device_id, payload)
+                except EnviConnectionError as err:
+                    _LOGGER.warning("Replay of queued commands interrupted: %s", err)
+                    self._health_check_interval = JOURNAL_HEALTH_CHECK_INTERVAL
+                    self._async_schedule_health_check(self._health_check_interval)
+                    break
+                except EnviRateLimitError as err:
+                    # A recovering API often rate limits; keep the commands for later
+                    _LOGGER.warning("Replay of queued commands paused: %s", err)
+                    self._health_check_interval = JOURNAL_HEALTH_CHECK_INTERVAL
+                    self._async_schedule_health_check(
+                        max(self._health_check_interval, self.coordinator.client.rate_limit_delay())
+                    )
+                    break
+                except EnviApiError as err:
+                    _LOGGER.error("Envi API rejected queued %s for device %s: %s", payload, device_id, err)
+                    self._async_remove_sent(device_id, sent)
+                    self.discarded += len(sent)
+                    continue
+
+                _LOGGER.info("Replayed queued %s for device %s", payload, device_id)
+                self._async_remove_sent(device_id, sent)
+                self.replayed += len(sent)
+                self.coordinator.async_confirm_write(
+                    device_id, {JOURNAL_FIELDS[field]: value for field, value in payload.items()}
+                )
+
+            self._store.async_delay_save(self._data_to_save, JOURNAL_SAVE_DELAY)
+            self.coordinator.async_update_listeners()
+
+    @callback
+    def _async_remove_sent(self, device_id: str, sent: dict[str, dict]) -> None:
+        """Drop delivered entries, keeping fields re-queued while they were in flight."""
+        fields = self.entries.get(device_id, {})
+        for field, entry in sent.items():
+            if fields.get(field, {}).get("seq") == entry["seq"]:
+                del fields[field]
+        if not fields:
+            self.entries.pop(device_id, None)
+
+    @callback
+    def async_discard(self, device_id: str, fields: tuple[str, ...]) -> None:
+        """Drop queued values superseded by a write that was just delivered.
+
+        Args:
+            device_id: Device that was written to
+            fields: Update payload fields the write set
+        """
+        queued = self.entries.get(str(device_id))
+        if not queued or not any(field in queued for field in fields):
+            return
+        for field in fields:
+            queued.pop(field, None)
+        if not queued:
+            self.entries.pop(str(device_id), None)
+        self._store.async_delay_save(self._data_to_save, JOURNAL_SAVE_DELAY)
+
+    @callback
+    def async_pending_for(self, device_id: str) -> dict[str, Any]:
+        """Return the queued field values of a device."""
+        return {field: entry["value"] for field, entry in self.entries.get(str(device_id), {}).items()}
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop health checks (queued commands stay in storage)."""
+        if self._unsub_health_check is not None:
+            self._unsub_health_check()
+            self._unsub_health_check = None
+
+    def as_dict(self) -> dict:
+        """Return journal state for diagnostics and sensor attributes."""
+        return {
+            "pending": self.pending_count,
+            "replayed": self.replayed,
+            "discarded": self.discarded,
+            "next_health_check_s": self._health_check_interval if self._unsub_health_check else None,
+            "entries": {
+                device_id: {field: {"value": entry["value"], "queued_at": entry["queued_at"]} for field, entry in fields.items()}
+                for device_id, fields in self.entries.items()
+            },
+        }
@@ -0,0 +1,256 @@
+"""Request metrics for the Envi API client.
+
+Counters and latency histograms are kept per endpoint class (auth, device
+list, device reads, device writes, schedules) so a slow ``device/list`` can be
+told apart from slow device reads. Histograms use fixed buckets, so recording
+a request is O(1) and memory doesn't grow with traffic.
+
+Besides the cumulative histogram, each endpoint class keeps a
+``RecentLatency`` covering the last few minutes only, for decisions that
+must follow current conditions (hedged reads).
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+
+from .const import HEDGE_LATENCY_SLICE, HEDGE_LATENCY_WINDOW
+
+# Upper bounds of the latency buckets in seconds (last bucket is open-ended)
+LATENCY_BUCKETS = (
+    0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0,
+)
+
+ENDPOINT_CLASSES = ("auth", "device_list", "device_get", "device_update", "schedule", "other")
+
+
+def endpoint_class(endpoint: str) -> str:
+    """Map an API endpoint path to its metrics class.
+
+    Args:
+        endpoint: Endpoint path relative to the base URL (e.g. "device/123")
+
+    Returns:
+        One of ENDPOINT_CLASSES
+    """
+    if endpoint.startswith("auth/"):
+        return "auth"
+    if endpoint == "device/list":
+        return "device_list"
+    if endpoint.startswith("device/update"):
+        return "device_update"
+    if endpoint.startswith("device/"):
+        return "device_get"
+    if endpoint.startswith("schedule/"):
+        return "schedule"
+    return "other"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with percentile estimates."""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency sample."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        if not self.count or seconds < self.min:
+            self.min = seconds
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add the samples of another histogram to this one."""
+        if not other.count:
+            return
+        if not self.count or other.min < self.min:
+            self.min = other.min
+        for index, bucket_count in enumerate(other.buckets):
+            self.buckets[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float | None:
+        """Estimate a latency percentile.
+
+        Interpolates linearly inside the bucket the percentile falls in,
+        clamped to the smallest and largest samples seen.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if nothing was recorded
+        """
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if not bucket_count:
+                continue
+            if seen + bucket_count >= rank:
+                lower = max(LATENCY_BUCKETS[index - 1] if index else 0.0, self.min)
+                upper = min(LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max, self.max)
+                fraction = (rank - seen) / bucket_count
+                return lower + (upper - lower) * fraction
+            seen += bucket_count
+        return self.max
+
+    def as_dict(self) -> dict:
+        """Return a summary with count, mean, max and p50/p95/p99 in milliseconds."""
+        def _ms(value: float | None) -> float | None:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean_ms": _ms(self.total / self.count) if self.count else None,
+            "max_ms": _ms(self.max) if self.count else None,
+            "p50_ms": _ms(self.percentile(50)),
+            "p95_ms": _ms(self.percentile(95)),
+            "p99_ms": _ms(self.percentile(99)),
+        }
+
+
+class RecentLatency:
+    """Latency histogram over a sliding window, kept as per-slice histograms."""
+
+    __slots__ = ("window", "slice", "_slices")
+
+    def __init__(self, window: float = HEDGE_LATENCY_WINDOW, slice_seconds: float = HEDGE_LATENCY_SLICE) -> None:
+        """Initialize an empty window.
+
+        Args:
+            window: Window length in seconds
+            slice_seconds: Granularity at which old samples expire
+        """
+        self.window = window
+        self.slice = slice_seconds
+        # (slice start, histogram) per slice with samples, oldest first
+        self._slices: deque[tuple[int, LatencyHistogram]] = deque()
+
+    def _expire(self) -> int:
+        """Drop slices outside the window and return the current slice start."""
+        now = int(time.monotonic() // self.slice)
+        oldest = now - int(self.window // self.slice)
+        while self._slices and self._slices[0][0] <= oldest:
+            self._slices.popleft()
+        return now
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency sample."""
+        now = self._expire()
+        if not self._slices or self._slices[-1][0] != now:
+            self._slices.append((now, LatencyHistogram()))
+        self._slices[-1][1].observe(seconds)
+
+    def histogram(self) -> LatencyHistogram:
+        """Return the samples in the window merged into one histogram."""
+        self._expire()
+        merged = LatencyHistogram()
+        for _, histogram in self._slices:
+            merged.merge(histogram)
+        return merged
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters and latency histogram for one endpoint class."""
+
+    requests: int = 0
+    retries: int = 0
+    retries_denied: int = 0  # retries the retry budget refused
+    hedged: int = 0  # second copies sent for slow reads
+    hedge_wins: int = 0  # hedges that answered before the original
+    rate_limited: int = 0
+    server_errors: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    bytes_received: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # Same samples, last few minutes only
+    recent_latency: RecentLatency = field(default_factory=RecentLatency)
+
+    def observe_latency(self, seconds: float) -> None:
+        """Record one attempt's latency in both histograms."""
+        self.latency.observe(seconds)
+        self.recent_latency.observe(seconds)
+
+    def as_dict(self) -> dict:
+        """Return the counters and latency summary."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "retries_denied": self.retries_denied,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+            "recent_latency": self.recent_latency.histogram().as_dict(),
+        }
+
+
+class ApiMetrics:
+    """Per-endpoint-class request metrics for one API client."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {name: EndpointMetrics() for name in ENDPOINT_CLASSES}
+        self.auth_refreshes = 0
+
+    def __getitem__(self, endpoint_class_name: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint class."""
+        return self.endpoints[endpoint_class_name]
+
+    def for_endpoint(self, endpoint: str) -> EndpointMetrics:
+        """Return the metrics for an endpoint path."""
+        return self.endpoints[endpoint_class(endpoint)]
+
+    def totals(self) -> EndpointMetrics:
+        """Return counters summed over all endpoint classes.
+
+        The latency histogram of the result merges all classes as well.
+        """
+        total = EndpointMetrics()
+        for metrics in self.endpoints.values():
+            total.requests += metrics.requests
+            total.retries += metrics.retries
+            total.retries_denied += metrics.retries_denied
+            total.hedged += metrics.hedged
+            total.hedge_wins += metrics.hedge_wins
+            total.rate_limited += metrics.rate_limited
+            total.server_errors += metrics.server_errors
+            total.timeouts += metrics.timeouts
+            total.errors += metrics.errors
+            total.bytes_received += metrics.bytes_received
+            total.latency.merge(metrics.latency)
+        return total
+
+    def as_dict(self) -> dict:
+        """Return all metrics (totals plus the endpoint classes that saw traffic)."""
+        return {
+            "auth_refreshes": self.auth_refreshes,
+            "total": self.totals().as_dict(),
+            "endpoints": {
+                name: metrics.as_dict()
+                for name, metrics in self.endpoints.items()
+                if metrics.requests
+            },
+        }
@@ -0,0 +1,230 @@
+"""Decoded device model for Smart Envi integration.
+
+A ``device/{id}`` payload is read by a climate entity, 13 sensors, 5 binary
+sensors, the coordinator and several services. Instead of each of them
+looking up raw keys with its own fallbacks (``location_name`` vs
+``relative_location_name``, ``device_status_res_at`` vs
+``device_status_req_at``, inverted flags, 0/1 vs booleans), the payload is
+decoded once into an ``EnviDevice``:
+
+* fields are typed and carry explicit defaults, and odd encodings (numbers
+  as strings, flags as ``0``/``1`` or ``"true"``) are tolerated;
+* only known keys are read, so unknown fields cost nothing;
+* the nested ``schedule`` object and the last-update timestamp are only
+  parsed when first used, and the nested light/display settings are handed
+  out as they are.
+
+The coordinator builds one model per payload and hands the same instance to
+every entity (see ``EnviDataUpdateCoordinator.get_device``); the raw payload
+stays available as ``EnviDevice.raw``.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from .schedule import normalize_bool
+
+# Formats seen in ``device_status_res_at`` besides ISO 8601 with an offset
+_TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f",
+)
+
+# Marks a lazily parsed field that hasn't been parsed yet
+_UNPARSED: Any = object()
+
+
+def _float(value: Any) -> float | None:
+    """Return a number as float (also from a numeric string), or None."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: Any) -> int | None:
+    """Return a number as int (also from a numeric string), or None."""
+    number = _float(value)
+    return int(number) if number is not None else None
+
+
+def _str(value: Any) -> str | None:
+    """Return a non-empty value as string, or None."""
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _inverted_flag(value: Any, default: bool) -> bool:
+    """Parse a flag the API reports inverted (True means the feature is off)."""
+    if value is None:
+        return default
+    return not normalize_bool(value)
+
+
+def parse_timestamp(value: Any) -> datetime:
+    """Parse an API timestamp into a timezone-aware datetime.
+
+    Accepts ISO 8601 (with ``Z``, an offset or neither) and
+    ``YYYY-MM-DD HH:MM:SS[.ffffff]``; timestamps without an offset are UTC.
+
+    Args:
+        value: Timestamp from a device payload
+
+    Returns:
+        Timezone-aware datetime
+
+    Raises:
+        ValueError: If the timestamp can't be parsed
+    """
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        for fmt in _TIMESTAMP_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Could not parse timestamp: {text}") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+@dataclass(slots=True)
+class EnviSchedule:
+    """Schedule summary carried in a device payload."""
+
+    schedule_id: str | None = None
+    name: str | None = None
+    enabled: bool = False
+    temperature: float | None = None
+    trigger_time: str | None = None
+    day: Any = None
+    times: list = field(default_factory=list)
+    raw: Mapping[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_payload(cls, value: Any) -> EnviSchedule | None:
+        """Decode the ``schedule`` object of a device payload.
+
+        Returns:
+            The schedule, or None if the device reports none
+        """
+        if not isinstance(value, Mapping) or not value:
+            return None
+        times = value.get("times")
+        return cls(
+            schedule_id=_str(value.get("schedule_id") or value.get("id")),
+            name=_str(value.get("name") or value.get("title")),
+            enabled=normalize_bool(value.get("enabled")),
+            temperature=_float(value.get("temperature")),
+            trigger_time=_str(value.get("trigger_time")),
+            day=value.get("day"),
+            times=times if isinstance(times, list) else [],
+            raw=value,
+        )
+
+
+@dataclass(slots=True)
+class EnviDevice:
+    """Decoded ``device/{id}`` payload.
+
+    Temperatures are in the heater's own unit (see ``temperature_unit``);
+    ``target_temperature`` is the API's ``current_temperature``.
+    """
+
+    raw: Mapping[str, Any] = field(repr=False, compare=False)
+    device_id: str | None = None
+    name: str | None = None
+    serial_no: str | None = None
+    model_no: str | None = None
+    firmware_version: str | None = None
+    temperature_unit: str = "F"
+    ambient_temperature: float | None = None
+    target_temperature: float | None = None
+    is_on: bool = False
+    mode: int | None = None
+    online: bool = False
+    signal_strength: int | None = None
+    ssid: str | None = None
+    location: str | None = None
+    schedule_active: bool = False
+    hold: bool = False
+    geofence_active: bool = False
+    # The API reports these inverted; here True means the feature is on
+    freeze_protect: bool = True
+    child_lock: bool = False
+    # When the cloud last heard from the heater (raw API timestamp)
+    synced_at: str | None = None
+    last_update: str | None = None
+    _schedule: Any = field(default=_UNPARSED, init=False, repr=False, compare=False)
+    _last_update_at: Any = field(default=_UNPARSED, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_payload(cls, data: Mapping[str, Any]) -> EnviDevice:
+        """Decode a device payload, reading only the fields the integration uses."""
+        get = data.get
+        synced_at = _str(get("device_status_res_at"))
+        return cls(
+            raw=data,
+            device_id=_str(get("id")),
+            name=_str(get("name")),
+            serial_no=_str(get("serial_no")),
+            model_no=_str(get("model_no")),
+            firmware_version=_str(get("firmware_version")),
+            temperature_unit="C" if str(get("temperature_unit") or "F").upper() == "C" else "F",
+            ambient_temperature=_float(get("ambient_temperature")),
+            target_temperature=_float(get("current_temperature")),
+            is_on=normalize_bool(get("state")),
+            mode=_int(get("current_mode")),
+            online=_int(get("device_status")) == 1,
+            signal_strength=_int(get("signal_strength")),
+            ssid=_str(get("ssid")),
+            location=_str(get("location_name") or get("relative_location_name")),
+            schedule_active=normalize_bool(get("is_schedule_active")),
+            hold=normalize_bool(get("is_hold")),
+            geofence_active=normalize_bool(get("is_geofence_active")),
+            freeze_protect=_inverted_flag(get("freeze_protect_setting"), default=True),
+            child_lock=_inverted_flag(get("child_lock_setting"), default=False),
+            synced_at=synced_at,
+            last_update=synced_at or _str(get("device_status_req_at")),
+        )
+
+    @property
+    def celsius(self) -> bool:
+        """Whether the heater reports temperatures in Celsius."""
+        return self.temperature_unit == "C"
+
+    @property
+    def schedule(self) -> EnviSchedule | None:
+        """Schedule the heater reports (parsed on first use)."""
+        if self._schedule is _UNPARSED:
+            self._schedule = EnviSchedule.from_payload(self.raw.get("schedule"))
+        return self._schedule
+
+    @property
+    def last_update_at(self) -> datetime | None:
+        """``last_update`` as a datetime (parsed on first use).
+
+        Raises:
+            ValueError: If the timestamp can't be parsed
+        """
+        if self._last_update_at is _UNPARSED:
+            self._last_update_at = parse_timestamp(self.last_update) if self.last_update else None
+        return self._last_update_at
+
+    def setting(self, name: str) -> dict:
+        """Return a nested settings object (e.g. ``night_light_setting``), or {}."""
+        value = self.raw.get(name)
+        return value if isinstance(value, dict) else {}
@@ -0,0 +1,139 @@
+"""JSON decoding and response validation for the Envi API client.
+
+Every poll decodes one ``device/{id}`` response per heater, so on low-power
+hosts the decode and validation cost adds up with fleet size. Two things
+keep it down:
+
+* ``json_loads`` decodes response bytes with orjson when it is installed
+  (Home Assistant ships it) and falls back to the standard library.
+  Either way the bytes are decoded directly, without first building a
+  text copy of the body. The client takes any other decoder with the same
+  signature; it must raise ``json.JSONDecodeError`` (or a subclass, like
+  orjson's) on invalid input.
+* ``PayloadSpec`` lists the expected fields of a JSON object and their types
+  once, at import time. Checking a payload is one pass over that compiled
+  list instead of hand-written checks spread over the client.
+
+Problems found by a spec are reported, not fixed: callers log them and use
+the payload as far as it goes.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+JsonLoads = Callable[[bytes | str], Any]
+
+if orjson is not None:
+    json_loads: JsonLoads = orjson.loads
+    JSON_DECODER = "orjson"
+else:
+    json_loads = json.loads
+    JSON_DECODER = "json"
+
+# JSON numbers may decode to either type
+NUMBER = (int, float)
+# Flags come back as JSON booleans or 0/1
+FLAG = (bool, int)
+
+
+class PayloadSpec:
+    """Expected fields of a JSON object, compiled once."""
+
+    __slots__ = ("name", "_fields", "_required", "_one_of")
+
+    def __init__(
+        self,
+        name: str,
+        fields: Mapping[str, type | tuple[type, ...]],
+        required: Iterable[str] = (),
+        one_of: Iterable[str] = (),
+    ) -> None:
+        """Compile the spec.
+
+        Args:
+            name: What the payload is (used in problem descriptions)
+            fields: Expected type(s) of each field; ``null`` is accepted for any field
+            required: Fields that must be present
+            one_of: Fields of which at least one must be present
+        """
+        self.name = name
+        self._fields = tuple(
+            (key, types if isinstance(types, tuple) else (types,)) for key, types in fields.items()
+        )
+        self._required = tuple(required)
+        self._one_of = tuple(one_of)
+
+    def problems(self, payload: Mapping[str, Any]) -> list[str]:
+        """Check a decoded object against the spec.
+
+        Args:
+            payload: Decoded JSON object
+
+        Returns:
+            Descriptions of missing and mistyped fields (empty if the payload
+            matches)
+        """
+        problems = []
+        for key, types in self._fields:
+            value = payload.get(key)
+            if value is not None and not isinstance(value, types):
+                problems.append(
+                    f"{self.name} field '{key}' has type {type(value).__name__}, "
+                    f"expected {'/'.join(t.__name__ for t in types)}"
+                )
+        for key in self._required:
+            if key not in payload:
+                problems.append(f"{self.name} is missing '{key}' (has {', '.join(payload) or 'no fields'})")
+        if self._one_of and not any(key in payload for key in self._one_of):
+            problems.append(f"{self.name} has none of {', '.join(self._one_of)}")
+        return problems
+
+
+# Envelope of every API response
+RESPONSE_SPEC = PayloadSpec("response", {"status": str, "msg": str, "msgCode": (str, int)})
+
+# Envelopes of the endpoint classes whose ``data`` the client reads
+RESPONSE_SPECS = {
+    "device_list": PayloadSpec(
+        "device list response",
+        {"status": str, "msg": str, "msgCode": (str, int), "data": list},
+        required=("data",),
+    ),
+    "device_get": PayloadSpec(
+        "device response",
+        {"status": str, "msg": str, "msgCode": (str, int), "data": dict},
+        required=("data",),
+    ),
+}
+
+# One entry of ``device/list``
+DEVICE_REF_SPEC = PayloadSpec("device list entry", {"id": (str, int), "name": str}, required=("id",))
+
+# ``data`` of ``device/{id}``: the fields the entities and the coordinator read
+DEVICE_SPEC = PayloadSpec(
+    "device",
+    {
+        "id": (str, int),
+        "serial_no": str,
+        "name": str,
+        "ambient_temperature": NUMBER,
+        "current_temperature": NUMBER,
+        "temperature_unit": str,
+        "state": FLAG,
+        "current_mode": int,
+        "device_status": int,
+        "is_schedule_active": FLAG,
+        "is_hold": FLAG,
+        "freeze_protect_setting": FLAG,
+        "child_lock_setting": FLAG,
+        "schedule": dict,
+    },
+    one_of=("id", "serial_no"),
+)
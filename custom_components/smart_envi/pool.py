@@ -0,0 +1,225 @@
+"""Dedicated HTTP connection pool for an Envi account.
+
+By default the API client uses Home Assistant's shared aiohttp session, whose
+connector is tuned for generic traffic and shared with every other
+integration: idle connections are dropped after 15 seconds, so with a 30
+second scan interval most polls open fresh TLS connections, and DNS answers
+are cached for only 10 seconds.
+
+With the ``dedicated_connection_pool`` option each account gets its own
+``ConnectionPool`` instead:
+
+* a per-host connection limit, which also becomes the request scheduler's
+  concurrency limit so requests queue by priority in the scheduler rather
+  than first-come-first-served in the connector;
+* a keep-alive that outlasts the scan interval, so polls reuse warm
+  connections instead of paying a TCP and TLS handshake per connection;
+* a longer DNS cache TTL;
+* gzip/deflate response compression.
+
+Connection reuse is tracked with an aiohttp ``TraceConfig`` (see
+``ConnectionStats``) and shown in diagnostics and on the API Requests sensor.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    DEFAULT_POOL_DNS_CACHE_TTL,
+    DEFAULT_POOL_KEEPALIVE,
+    DEFAULT_POOL_LIMIT_PER_HOST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """Connection reuse counters fed by aiohttp trace signals."""
+
+    def __init__(self) -> None:
+        """Initialize the counters and the trace config that updates them."""
+        self.requests = 0
+        self.created = 0
+        self.reused = 0
+        self.queued = 0
+        self.queue_wait = 0.0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        self.trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        self.trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        self.trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        self.trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        self.trace_config.on_dns_cache_miss.append(self._on_dns_cache_miss)
+
+    async def _on_request_start(self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any) -> None:
+        """Count a request."""
+        self.requests += 1
+
+    async def _on_connection_create_end(self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any) -> None:
+        """Count a newly opened connection."""
+        self.created += 1
+
+    async def _on_connection_reuseconn(self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any) -> None:
+        """Count a connection taken from the pool."""
+        self.reused += 1
+
+    async def _on_connection_queued_start(self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any) -> None:
+        """Count a request waiting for a free connection."""
+        self.queued += 1
+        ctx.queued_at = time.monotonic()
+
+    async def _on_connection_queued_end(self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any) -> None:
+        """Add the time spent waiting for a connection."""
+        self.queue_wait += time.monotonic() - getattr(ctx, "queued_at", time.monotonic())
+
+    async def _on_dns_cache_hit(self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any) -> None:
+        """Count a DNS cache hit."""
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any) -> None:
+        """Count a DNS lookup."""
+        self.dns_cache_misses += 1
+
+    @property
+    def reuse_rate(self) -> float | None:
+        """Share of connections taken from the pool rather than newly opened."""
+        connections = self.created + self.reused
+        return self.reused / connections if connections else None
+
+    def as_dict(self) -> dict:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "connections_created": self.created,
+            "connections_reused": self.reused,
+            "reuse_rate": round(self.reuse_rate, 3) if self.reuse_rate is not None else None,
+            "queued_for_connection": self.queued,
+            "connection_wait_s": round(self.queue_wait, 3),
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+        }
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connector settings of a dedicated pool."""
+
+    limit_per_host: int = DEFAULT_POOL_LIMIT_PER_HOST
+    keepalive: float = DEFAULT_POOL_KEEPALIVE
+    dns_cache_ttl: int = DEFAULT_POOL_DNS_CACHE_TTL
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> PoolSettings | None:
+        """Read the settings from config entry options.
+
+        Returns:
+            The settings, or None if the dedicated pool is disabled
+        """
+        if not options.get("dedicated_connection_pool", False):
+            return None
+        return cls(
+            limit_per_host=int(options.get("pool_limit_per_host", DEFAULT_POOL_LIMIT_PER_HOST)),
+            keepalive=float(options.get("pool_keepalive", DEFAULT_POOL_KEEPALIVE)),
+            dns_cache_ttl=int(options.get("pool_dns_cache_ttl", DEFAULT_POOL_DNS_CACHE_TTL)),
+        )
+
+    def as_dict(self) -> dict:
+        """Return the settings for diagnostics."""
+        return {
+            "limit_per_host": self.limit_per_host,
+            "keepalive_s": self.keepalive,
+            "dns_cache_ttl_s": self.dns_cache_ttl,
+        }
+
+
+class ConnectionPool:
+    """aiohttp session with a connector of its own, plus reuse tracking."""
+
+    def __init__(self, settings: PoolSettings) -> None:
+        """Create the connector and session.
+
+        Must be called from the event loop.
+
+        Args:
+            settings: Connector settings
+        """
+        self.settings = settings
+        self.stats = ConnectionStats()
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=settings.limit_per_host,
+            keepalive_timeout=settings.keepalive,
+            ttl_dns_cache=settings.dns_cache_ttl,
+            enable_cleanup_closed=True,
+            ssl=ssl_util.get_default_context(),
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=json_dumps,
+            headers={
+                # Identify as Home Assistant, like the shared session does
+                hdrs.USER_AGENT: SERVER_SOFTWARE,
+                hdrs.ACCEPT_ENCODING: "gzip, deflate",
+            },
+            trace_configs=[self.stats.trace_config],
+        )
+
+    async def async_close(self) -> None:
+        """Close the session and every pooled connection."""
+        if not self.session.closed:
+            await self.session.close()
+
+    def as_dict(self) -> dict:
+        """Return settings and reuse counters for diagnostics."""
+        return {"dedicated": True, **self.settings.as_dict(), **self.stats.as_dict()}
+
+
+def async_create_connection_pool(
+    hass: HomeAssistant, entry: ConfigEntry, settings: PoolSettings
+) -> ConnectionPool:
+    """Create a dedicated pool for a config entry.
+
+    The pool is closed when the entry unloads or Home Assistant stops,
+    whichever comes first; unloading also removes the stop listener, so
+    reloads don't leave listeners holding closed pools.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry the pool belongs to
+        settings: Connector settings
+
+    Returns:
+        The new pool
+    """
+    pool = ConnectionPool(settings)
+
+    async def _async_close_pool(event: Event) -> None:
+        await pool.async_close()
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_pool))
+    entry.async_on_unload(pool.async_close)
+    _LOGGER.debug(
+        "Created dedicated Envi connection pool (%s connections per host, %ss keep-alive, %ss DNS cache)",
+        settings.limit_per_host,
+        settings.keepalive,
+        settings.dns_cache_ttl,
+    )
+    return pool
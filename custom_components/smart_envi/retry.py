@@ -0,0 +1,120 @@
+"""Retry pacing for the Envi API client.
+
+Two pieces keep retries from turning a brief glitch into a load spike:
+
+* ``decorrelated_jitter`` spreads retry delays out. With plain exponential
+  backoff, every request that failed in the same blip retries at the same
+  instant and hits the recovering API together; here each delay is drawn
+  between the base delay and three times the previous one, so retries of a
+  large fleet fan out over time while still backing off.
+* ``RetryBudget`` caps retries per account to a fraction of the requests
+  that succeeded over a sliding window (plus a small allowance, so an idle
+  account can still retry). During a brief glitch most requests succeed and
+  the budget is ample; during a real incident successes dry up, the budget
+  runs out and failures are reported at once instead of multiplying load.
+
+The same budget caps hedged reads, with every successful read earning a
+fraction of a hedge.
+"""
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+
+from .const import (
+    INITIAL_RETRY_DELAY,
+    MAX_RETRY_DELAY,
+    RETRY_BUDGET_MIN_RETRIES,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_WINDOW,
+)
+
+
+def decorrelated_jitter(
+    previous: float,
+    base: float = INITIAL_RETRY_DELAY,
+    cap: float = MAX_RETRY_DELAY,
+) -> float:
+    """Return the next retry delay.
+
+    Args:
+        previous: Previous delay in seconds (``base`` before the first retry)
+        base: Smallest delay
+        cap: Largest delay
+
+    Returns:
+        Delay in seconds, uniformly drawn from [base, 3 * previous] and capped
+    """
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+class RetryBudget:
+    """Account-wide allowance of retries, earned by successful requests."""
+
+    def __init__(
+        self,
+        ratio: float = RETRY_BUDGET_RATIO,
+        window: int = RETRY_BUDGET_WINDOW,
+        min_retries: int = RETRY_BUDGET_MIN_RETRIES,
+    ) -> None:
+        """Initialize the budget.
+
+        Args:
+            ratio: Retries allowed per successful request in the window
+            window: Sliding window length in seconds
+            min_retries: Retries allowed per window regardless of successes
+        """
+        self.ratio = ratio
+        self.window = window
+        self.min_retries = min_retries
+        # [second, successes, retries] per second with traffic, oldest first
+        self._buckets: deque[list[int]] = deque()
+        self.denied = 0
+
+    def _bucket(self) -> list[int]:
+        """Return the current second's bucket, dropping those outside the window."""
+        now = int(time.monotonic())
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+
+    def _totals(self) -> tuple[int, int]:
+        """Return (successes, retries) in the window."""
+        self._bucket()
+        return (
+            sum(bucket[1] for bucket in self._buckets),
+            sum(bucket[2] for bucket in self._buckets),
+        )
+
+    def record_success(self) -> None:
+        """Count a successful request."""
+        self._bucket()[1] += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget.
+
+        Returns:
+            True if the retry may go ahead, False if the budget is spent
+        """
+        successes, retries = self._totals()
+        if retries >= self.min_retries + successes * self.ratio:
+            self.denied += 1
+            return False
+        self._bucket()[2] += 1
+        return True
+
+    def as_dict(self) -> dict:
+        """Return budget state for diagnostics."""
+        successes, retries = self._totals()
+        return {
+            "window_s": self.window,
+            "ratio": self.ratio,
+            "min_retries": self.min_retries,
+            "successes": successes,
+            "retries": retries,
+            "available": max(0, int(self.min_retries + successes * self.ratio) - retries),
+            "denied": self.denied,
+        }
@@ -0,0 +1,319 @@
+"""Schedule helpers for Smart Envi integration.
+
+The Envi API is inconsistent about schedule field names and types (``time`` vs
+``trigger_time``, ``temperature`` vs ``temp``, booleans as ``0``/``1`` or
+strings). These helpers normalize schedules into one canonical shape so they
+can be compared and only the fields that actually changed are written back.
+
+``ScheduleTimeline`` evaluates the schedule carried in a device payload
+locally, so the integration knows which setpoint is in effect and when it
+next changes without asking the API.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+from typing import Any
+
+
+def normalize_bool(value: Any, default: bool = False) -> bool:
+    """Normalize API boolean values (bool, 0/1, "true"/"false") to bool."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "on")
+    return bool(value)
+
+
+def normalize_time(value: Any) -> str | None:
+    """Normalize a time value to an ``HH:MM:SS`` string.
+
+    Args:
+        value: ``datetime.time`` or string in ``HH:MM`` / ``HH:MM:SS`` format
+
+    Returns:
+        Time string in ``HH:MM:SS`` format, or None if the value can't be parsed
+    """
+    if isinstance(value, time):
+        return value.strftime("%H:%M:%S")
+    if not isinstance(value, str) or ":" not in value:
+        return None
+    parts = value.strip().split(":")
+    if len(parts) == 2:
+        parts.append("00")
+    if len(parts) != 3:
+        return None
+    try:
+        hours, minutes, seconds = (int(part) for part in parts)
+    except ValueError:
+        return None
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def normalize_time_entries(times: Any) -> list[dict]:
+    """Normalize a list of schedule time entries.
+
+    Entries without a parseable time or temperature are dropped. The result is
+    sorted by time so two schedules with the same entries in a different order
+    compare equal.
+
+    Args:
+        times: List of time entry dicts as returned by the API or a service call
+
+    Returns:
+        Sorted list of ``{"time", "temperature", "enabled"}`` dicts
+    """
+    if not isinstance(times, list):
+        return []
+
+    entries = []
+    for entry in times:
+        if not isinstance(entry, dict):
+            continue
+        time_str = normalize_time(entry.get("time") or entry.get("trigger_time"))
+        temperature = entry.get("temperature", entry.get("temp"))
+        if time_str is None or temperature is None:
+            continue
+        try:
+            temperature = float(temperature)
+        except (TypeError, ValueError):
+            continue
+        entries.append({
+            "time": time_str,
+            "temperature": temperature,
+            "enabled": normalize_bool(entry.get("enabled"), default=True),
+        })
+    entries.sort(key=lambda entry: entry["time"])
+    return entries
+
+
+def normalize_schedule(schedule: dict) -> dict:
+    """Normalize the writable fields of a schedule.
+
+    Only fields present in ``schedule`` are included, so a partial request
+    (e.g. just ``enabled``) stays partial.
+
+    Args:
+        schedule: Schedule dictionary from the API or a service call
+
+    Returns:
+        Dictionary with normalized ``enabled``, ``name`` and ``times`` fields
+    """
+    normalized: dict = {}
+    if "enabled" in schedule:
+        normalized["enabled"] = normalize_bool(schedule["enabled"])
+    if "name" in schedule or "title" in schedule:
+        normalized["name"] = schedule.get("name") or schedule.get("title") or None
+    if "times" in schedule or "time_entries" in schedule:
+        normalized["times"] = normalize_time_entries(schedule.get("times") or schedule.get("time_entries"))
+    return normalized
+
+
+def diff_schedule(current: dict | None, requested: dict) -> dict:
+    """Compute the fields of ``requested`` that differ from ``current``.
+
+    Args:
+        current: Current schedule as cached from the API, or None if unknown
+        requested: Requested schedule (raw or normalized)
+
+    Returns:
+        Normalized dictionary containing only the changed fields. Empty when the
+        requested schedule is already in place and no write is needed.
+    """
+    wanted = normalize_schedule(requested)
+    if current is None:
+        return wanted
+    existing = normalize_schedule(current)
+    return {
+        field: value
+        for field, value in wanted.items()
+        if field not in existing or existing[field] != value
+    }
+
+
+def export_schedule(schedule: dict) -> dict:
+    """Convert an API schedule into the portable export format.
+
+    Args:
+        schedule: Schedule dictionary from schedule/list
+
+    Returns:
+        Dictionary with ``id``, ``device_id`` and the normalized writable fields
+    """
+    exported = {
+        "id": schedule.get("id"),
+        "device_id": str(schedule.get("device_id")) if schedule.get("device_id") is not None else None,
+        "enabled": False,
+        "name": None,
+        "times": [],
+    }
+    exported.update(normalize_schedule(schedule))
+    return exported
+
+
+def plan_schedule_import(
+    current: dict[str, dict],
+    imported: list[dict],
+    delete_missing: bool = False,
+) -> dict[str, list]:
+    """Reconcile imported schedules against the current schedule index.
+
+    Imported schedules are matched to existing ones by ID first, then by
+    device and name. Matched schedules are diffed so only changed fields are
+    written; unmatched ones are created. With ``delete_missing``, existing
+    schedules of the imported devices that weren't matched are deleted.
+
+    Args:
+        current: Current schedule index (schedule ID as string -> schedule)
+        imported: Schedules in export format; each needs a ``device_id``
+        delete_missing: Delete unmatched schedules of the imported devices
+
+    Returns:
+        Plan with ``add`` (payloads), ``update`` ((schedule_id, changes) tuples),
+        ``delete`` (schedule IDs) and ``unchanged`` (schedule IDs) lists
+    """
+    plan: dict[str, list] = {"add": [], "update": [], "delete": [], "unchanged": []}
+    matched: set[str] = set()
+    devices: set[str] = set()
+
+    def _find_match(entry: dict) -> str | None:
+        entry_id = entry.get("id")
+        if entry_id is not None and str(entry_id) in current and str(entry_id) not in matched:
+            existing = current[str(entry_id)]
+            if str(existing.get("device_id")) == entry["device_id"]:
+                return str(entry_id)
+        name = normalize_schedule(entry).get("name")
+        for schedule_id, existing in current.items():
+            if schedule_id in matched or str(existing.get("device_id")) != entry["device_id"]:
+                continue
+            if normalize_schedule(existing).get("name") == name:
+                return schedule_id
+        return None
+
+    for entry in imported:
+        entry = {**entry, "device_id": str(entry["device_id"])}
+        devices.add(entry["device_id"])
+        schedule_id = _find_match(entry)
+        if schedule_id is None:
+            payload = normalize_schedule(entry)
+            payload["device_id"] = entry["device_id"]
+            plan["add"].append(payload)
+            continue
+        matched.add(schedule_id)
+        changes = diff_schedule(current[schedule_id], entry)
+        if changes:
+            plan["update"].append((current[schedule_id].get("id", schedule_id), changes))
+        else:
+            plan["unchanged"].append(current[schedule_id].get("id", schedule_id))
+
+    if delete_missing:
+        for schedule_id, existing in current.items():
+            if schedule_id not in matched and str(existing.get("device_id")) in devices:
+                plan["delete"].append(existing.get("id", schedule_id))
+
+    return plan
+
+
+
+class ScheduleTimeline:
+    """Daily setpoint timeline of a schedule, precomputed for bisect lookups.
+
+    Entries are kept as parallel lists sorted by second of day, so the
+    setpoint in effect and the next change are found in O(log n) without any
+    API call. Schedule times are local times of day, evaluated in the time
+    zone of the datetime passed in.
+    """
+
+    __slots__ = ("seconds", "temperatures", "source")
+
+    def __init__(self, entries: list[tuple[int, float | None]], source: Any = None) -> None:
+        """Initialize the timeline.
+
+        Args:
+            entries: (second of day, temperature) pairs; a later duplicate of
+                the same second replaces an earlier one
+            source: Schedule object the timeline was built from (lets callers
+                skip rebuilding when the schedule hasn't changed)
+        """
+        by_second = dict(entries)
+        self.seconds = sorted(by_second)
+        self.temperatures = [by_second[second] for second in self.seconds]
+        self.source = source
+
+    @classmethod
+    def from_schedule(cls, schedule_info: Any) -> ScheduleTimeline | None:
+        """Build a timeline from the ``schedule`` object of a device payload.
+
+        Uses the enabled ``times`` entries; a schedule without entries but with
+        a ``trigger_time`` becomes a single daily transition to its
+        ``temperature``.
+
+        Args:
+            schedule_info: ``schedule`` object from a device payload
+
+        Returns:
+            Timeline, or None if the schedule is disabled or has no usable times
+        """
+        if not isinstance(schedule_info, dict):
+            return None
+        if not normalize_bool(schedule_info.get("enabled"), default=True):
+            return None
+
+        entries = [
+            (_second_of_day(time.fromisoformat(entry["time"])), entry["temperature"])
+            for entry in normalize_time_entries(schedule_info.get("times"))
+            if entry["enabled"]
+        ]
+        if not entries and (trigger_time := normalize_time(schedule_info.get("trigger_time"))):
+            temperature = schedule_info.get("temperature")
+            try:
+                temperature = float(temperature) if temperature is not None else None
+            except (TypeError, ValueError):
+                temperature = None
+            entries = [(_second_of_day(time.fromisoformat(trigger_time)), temperature)]
+        if not entries:
+            return None
+        return cls(entries, source=schedule_info)
+
+    def __len__(self) -> int:
+        """Return the number of transitions per day."""
+        return len(self.seconds)
+
+    def current(self, moment: datetime) -> float | None:
+        """Get the setpoint in effect at a point in time.
+
+        Before the first transition of the day, the last one of the previous
+        day is still in effect.
+
+        Args:
+            moment: Timezone-aware datetime in the schedule's local time zone
+
+        Returns:
+            Scheduled temperature (None if the entry has no temperature)
+        """
+        return self.temperatures[bisect_right(self.seconds, _second_of_day(moment)) - 1]
+
+    def next_change(self, moment: datetime) -> tuple[datetime, float | None]:
+        """Get the first transition strictly after a point in time.
+
+        Args:
+            moment: Timezone-aware datetime in the schedule's local time zone
+
+        Returns:
+            Tuple of (timezone-aware transition time, scheduled temperature)
+        """
+        index = bisect_right(self.seconds, _second_of_day(moment))
+        day = moment.date()
+        if index == len(self.seconds):
+            index = 0
+            day += timedelta(days=1)
+        second = self.seconds[index]
+        when = datetime.combine(
+            day, time(second // 3600, second // 60 % 60, second % 60), tzinfo=moment.tzinfo
+        )
+        return when, self.temperatures[index]
+
+
+def _second_of_day(value: datetime | time) -> int:
+    """Return the whole seconds since midnight of a time or datetime."""
+    return value.hour * 3600 + value.minute * 60 + value.second
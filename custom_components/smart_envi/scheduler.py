@@ -0,0 +1,181 @@
+"""Priority scheduling of Envi API requests.
+
+Every HTTP attempt made by ``EnviApiClient`` takes a slot from a
+``RequestScheduler`` first. Slots are handed out by priority class rather
+than arrival order, so a heater command issued in the middle of a large poll
+cycle goes out ahead of the device reads still queued for that cycle:
+
+* ``INTERACTIVE``: user commands (setpoint, on/off, schedule edits);
+* ``CONFIRMATION``: probes that confirm a write, and replayed queued commands;
+* ``POLL``: regular device reads;
+* ``DISCOVERY``: the ``device/list`` fetch that looks for added or removed
+  heaters.
+
+Slots are held per attempt, not per request: a request sleeping between
+retries holds no slot and queues again at its own priority afterwards. A
+few slots are reserved for interactive requests, so a user command never
+waits for a background request to finish.
+
+The priority of a request comes from a context variable (see
+``request_priority``), so callers mark a whole operation (a poll cycle, a
+confirmation task) without threading a parameter through every client
+method. Without one, writes are interactive and reads are polls.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+from .const import SCHEDULER_INTERACTIVE_RESERVED, SCHEDULER_MAX_CONCURRENCY
+
+
+class RequestPriority(IntEnum):
+    """Request classes, most urgent first."""
+
+    INTERACTIVE = 0
+    CONFIRMATION = 1
+    POLL = 2
+    DISCOVERY = 3
+
+
+_REQUEST_PRIORITY: ContextVar[RequestPriority | None] = ContextVar("smart_envi_request_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Send the requests made inside the block (and tasks it starts) at ``priority``."""
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+def current_priority(method: str) -> RequestPriority:
+    """Return the priority of a request made now.
+
+    Args:
+        method: HTTP method of the request (decides the default)
+
+    Returns:
+        Priority set with ``request_priority``, otherwise INTERACTIVE for
+        writes and POLL for reads
+    """
+    priority = _REQUEST_PRIORITY.get()
+    if priority is not None:
+        return priority
+    return RequestPriority.POLL if method.upper() == "GET" else RequestPriority.INTERACTIVE
+
+
+class RequestScheduler:
+    """Concurrency slots for API requests, granted in priority order."""
+
+    def __init__(
+        self,
+        limit: int = SCHEDULER_MAX_CONCURRENCY,
+        reserved: int = SCHEDULER_INTERACTIVE_RESERVED,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            limit: Maximum number of requests in flight
+            reserved: Slots only interactive requests may use
+        """
+        self.limit = limit
+        self.reserved = reserved
+        self.in_flight = 0
+        # (priority, arrival order, future) of requests waiting for a slot
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self.requests = {priority.name.lower(): 0 for priority in RequestPriority}
+        self.queued = {priority.name.lower(): 0 for priority in RequestPriority}
+        self.wait_time = {priority.name.lower(): 0.0 for priority in RequestPriority}
+        self.shed = 0
+        self.max_queue_depth = 0
+
+    def _has_room(self, priority: int) -> bool:
+        """Check whether a request of ``priority`` may start now."""
+        if priority == RequestPriority.INTERACTIVE:
+            return self.in_flight < self.limit
+        return self.in_flight < self.limit - self.reserved
+
+    def can_start(self, priority: RequestPriority) -> bool:
+        """Check whether a request of ``priority`` would start without queuing."""
+        return self._has_room(priority) and not (self._waiters and self._waiters[0][0] <= priority)
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority, timeout: float | None = None):
+        """Hold a request slot for the duration of the block.
+
+        Args:
+            priority: Priority class of the request
+            timeout: Longest wait for the slot in seconds (None = no limit)
+
+        Raises:
+            asyncio.TimeoutError: If no slot was granted within ``timeout``
+        """
+        async with asyncio.timeout(timeout):
+            await self._async_acquire(priority)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._wake()
+
+    async def _async_acquire(self, priority: RequestPriority) -> None:
+        """Wait until a slot is granted to a request of ``priority``."""
+        name = priority.name.lower()
+        self.requests[name] += 1
+        # Don't overtake waiters of the same or a more urgent class
+        if self.can_start(priority):
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (int(priority), next(self._order), future)
+        heapq.heappush(self._waiters, entry)
+        self.queued[name] += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before being cancelled: pass the slot on
+                self.in_flight -= 1
+                self._wake()
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+        finally:
+            self.wait_time[name] += time.monotonic() - start
+
+    def _wake(self) -> None:
+        """Grant free slots to the most urgent waiters."""
+        while self._waiters and self._has_room(self._waiters[0][0]):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def as_dict(self) -> dict:
+        """Return scheduler state for diagnostics."""
+        return {
+            "limit": self.limit,
+            "reserved_interactive": self.reserved,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "requests": dict(self.requests),
+            "queued": dict(self.queued),
+            "wait_s": {name: round(seconds, 3) for name, seconds in self.wait_time.items()},
+            "shed": self.shed,
+        }
@@ -2,17 +2,29 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass, SensorDeviceClass
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfInformation, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ACCOUNT_DEVICE_PREFIX,
+    DOMAIN,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_DEVICES_REMOVED,
+    SIGNAL_SCHEDULE_TIMELINE,
+)
 from .coordinator import EnviDataUpdateCoordinator
+from .models import EnviDevice
+from .schedule import ScheduleTimeline
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,13 +57,9 @@ class EnviSensor(CoordinatorEntity, SensorEntity):
         
         # Try to set initial unit for schedule temperature sensor
         if sensor_type == "schedule_temperature":
-            initial_data = coordinator.get_device_data(device_id)
-            if initial_data:
-                temp_unit = initial_data.get("temperature_unit", "F").upper()
-                if temp_unit == "C":
-                    self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-                else:
-                    self._attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT
+            device = coordinator.get_device(device_id)
+            if device is not None:
+                self._attr_native_unit_of_measurement = _native_temperature_unit(device)
 
     def _get_sensor_name(self) -> str:
         """Get human-readable sensor name."""
@@ -61,6 +69,9 @@ class EnviSensor(CoordinatorEntity, SensorEntity):
             "mode": "Mode",
             "schedule_name": "Schedule Name",
             "schedule_temperature": "Schedule Temperature",
+            "scheduled_setpoint": "Scheduled Setpoint",
+            "next_setpoint": "Next Setpoint",
+            "next_schedule_change": "Next Schedule Change",
             "wifi_ssid": "WiFi Network",
             "location": "Location",
             "model": "Model",
@@ -78,19 +89,31 @@ class EnviSensor(CoordinatorEntity, SensorEntity):
             manufacturer="EHEAT",
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Populate initial state from cached coordinator data.
+        
+        Avoids update_before_add, which would request a coordinator refresh
+        for every entity added (including heaters discovered at runtime).
+        """
+        await super().async_added_to_hass()
+        self._update_from_coordinator()
+
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self._update_from_coordinator()
         self.async_write_ha_state()
 
     def _update_from_coordinator(self) -> None:
-        """Update sensor state from coordinator data."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if not data:
+        """Update sensor state from the device model."""
+        device = self.coordinator.get_device(self.device_id)
+        if device is None:
             self._attr_available = False
             return
-        # Override in subclasses
         self._attr_available = True
+        self._update_from_device(device)
+
+    def _update_from_device(self, device: EnviDevice) -> None:
+        """Update state from the device model (override in subclasses)."""
 
 
 class EnviSignalStrengthSensor(EnviSensor):
@@ -110,18 +133,9 @@ class EnviSignalStrengthSensor(EnviSensor):
         """Initialize signal strength sensor."""
         super().__init__(coordinator, device_id, "signal_strength", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update signal strength."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            signal_strength = data.get("signal_strength")
-            if signal_strength is not None:
-                self._attr_native_value = int(signal_strength)
-            else:
-                self._attr_native_value = None
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_native_value = device.signal_strength
 
 
 class EnviFirmwareVersionSensor(EnviSensor):
@@ -139,15 +153,9 @@ class EnviFirmwareVersionSensor(EnviSensor):
         """Initialize firmware version sensor."""
         super().__init__(coordinator, device_id, "firmware_version", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update firmware version."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            firmware = data.get("firmware_version")
-            self._attr_native_value = firmware or "Unknown"
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_native_value = device.firmware_version or "Unknown"
 
 
 class EnviModeSensor(EnviSensor):
@@ -165,22 +173,16 @@ class EnviModeSensor(EnviSensor):
         """Initialize mode sensor."""
         super().__init__(coordinator, device_id, "mode", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update mode."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            mode = data.get("current_mode")
-            if mode is not None:
-                # Map mode number to human-readable name
-                mode_name = MODE_MAP.get(mode, f"Mode {mode}")
-                self._attr_native_value = mode_name
-                # Store raw mode as attribute
-                self._attr_extra_state_attributes = {"mode_number": mode}
-            else:
-                self._attr_native_value = "Unknown"
-            self._attr_available = True
+        mode = device.mode
+        if mode is not None:
+            # Map mode number to human-readable name
+            self._attr_native_value = MODE_MAP.get(mode, f"Mode {mode}")
+            # Store raw mode as attribute
+            self._attr_extra_state_attributes = {"mode_number": mode}
         else:
-            self._attr_available = False
+            self._attr_native_value = "Unknown"
 
 
 class EnviScheduleNameSensor(EnviSensor):
@@ -198,31 +200,21 @@ class EnviScheduleNameSensor(EnviSensor):
         """Initialize schedule name sensor."""
         super().__init__(coordinator, device_id, "schedule_name", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update schedule name."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            schedule = data.get("schedule", {})
-            if isinstance(schedule, dict):
-                schedule_name = schedule.get("name") or schedule.get("title")
-                if schedule_name:
-                    self._attr_native_value = schedule_name
-                    # Add schedule details as attributes
-                    self._attr_extra_state_attributes = {
-                        "schedule_id": schedule.get("schedule_id"),
-                        "temperature": schedule.get("temperature"),
-                        "trigger_time": schedule.get("trigger_time"),
-                        "day": schedule.get("day"),
-                    }
-                else:
-                    self._attr_native_value = "None"
-                    self._attr_extra_state_attributes = {}
-            else:
-                self._attr_native_value = "None"
-                self._attr_extra_state_attributes = {}
-            self._attr_available = True
+        schedule = device.schedule
+        if schedule is not None and schedule.name:
+            self._attr_native_value = schedule.name
+            # Add schedule details as attributes
+            self._attr_extra_state_attributes = {
+                "schedule_id": schedule.schedule_id,
+                "temperature": schedule.temperature,
+                "trigger_time": schedule.trigger_time,
+                "day": schedule.day,
+            }
         else:
-            self._attr_available = False
+            self._attr_native_value = "None"
+            self._attr_extra_state_attributes = {}
 
 
 class EnviScheduleTemperatureSensor(EnviSensor):
@@ -245,41 +237,130 @@ class EnviScheduleTemperatureSensor(EnviSensor):
         # Unit will be set based on device's temperature unit
         self._attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT  # Default, will be updated
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update schedule temperature."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            schedule = data.get("schedule", {})
-            temp_unit = data.get("temperature_unit", "F").upper()
-            
-            # Set unit of measurement based on device's unit
-            # Use UnitOfTemperature constants to ensure proper handling
-            if temp_unit == "C":
-                self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-            else:
-                self._attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT
-            
-            if isinstance(schedule, dict):
-                temp = schedule.get("temperature")
-                if temp is not None:
-                    # Keep temperature in device's native unit (no conversion)
-                    # The API already returns it in the correct unit
-                    self._attr_native_value = float(temp)
-                    _LOGGER.debug(
-                        "Schedule temperature for %s: %s %s (device unit: %s, native_unit: %s)",
-                        self.device_id,
-                        self._attr_native_value,
-                        self._attr_native_unit_of_measurement,
-                        temp_unit,
-                        self._attr_native_unit_of_measurement
-                    )
-                else:
-                    self._attr_native_value = None
-            else:
-                self._attr_native_value = None
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        # Set unit of measurement based on device's unit
+        self._attr_native_unit_of_measurement = _native_temperature_unit(device)
+        # Keep temperature in device's native unit (no conversion)
+        # The API already returns it in the correct unit
+        schedule = device.schedule
+        self._attr_native_value = schedule.temperature if schedule is not None else None
+
+
+class EnviScheduleTimelineSensor(EnviSensor):
+    """Base class for sensors computed from a heater's local schedule timeline.
+    
+    Values come from the coordinator's precomputed ``ScheduleTimeline`` and
+    are refreshed on coordinator updates and by the coordinator's shared
+    timer at each scheduled change, so no API calls or polling are needed.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    async def async_added_to_hass(self) -> None:
+        """Also listen for scheduled setpoint changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SCHEDULE_TIMELINE.format(self.coordinator.entry_id),
+                self._handle_timeline_change,
+            )
+        )
+
+    @callback
+    def _handle_timeline_change(self) -> None:
+        """Handle a scheduled setpoint change announced by the coordinator."""
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+
+    def _update_from_device(self, device: EnviDevice) -> None:
+        """Update from the timeline at the current local time."""
+        timeline = self.coordinator.schedule_timelines.get(self.device_id)
+        if timeline is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        self._update_from_timeline(device, timeline, dt_util.now())
+
+    def _update_from_timeline(self, device: EnviDevice, timeline: ScheduleTimeline, now: datetime) -> None:
+        """Update state from the timeline (override in subclasses)."""
+
+
+class EnviScheduledSetpointSensor(EnviScheduleTimelineSensor):
+    """Sensor for the setpoint the schedule calls for right now."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    # Like the schedule temperature sensor, keep the device's native unit
+    _attr_icon = "mdi:thermometer-check"
+
+    def __init__(
+        self,
+        coordinator: EnviDataUpdateCoordinator,
+        device_id: str,
+        device_name: str,
+    ) -> None:
+        """Initialize scheduled setpoint sensor."""
+        super().__init__(coordinator, device_id, "scheduled_setpoint", device_name)
+
+    def _update_from_timeline(self, device: EnviDevice, timeline: ScheduleTimeline, now: datetime) -> None:
+        """Update the setpoint in effect."""
+        self._attr_native_unit_of_measurement = _native_temperature_unit(device)
+        self._attr_native_value = timeline.current(now)
+
+
+class EnviNextSetpointSensor(EnviScheduleTimelineSensor):
+    """Sensor for the setpoint of the next schedule transition."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:thermometer-chevron-up"
+
+    def __init__(
+        self,
+        coordinator: EnviDataUpdateCoordinator,
+        device_id: str,
+        device_name: str,
+    ) -> None:
+        """Initialize next setpoint sensor."""
+        super().__init__(coordinator, device_id, "next_setpoint", device_name)
+
+    def _update_from_timeline(self, device: EnviDevice, timeline: ScheduleTimeline, now: datetime) -> None:
+        """Update the next setpoint; its time goes in attributes."""
+        change_at, temperature = timeline.next_change(now)
+        self._attr_native_unit_of_measurement = _native_temperature_unit(device)
+        self._attr_native_value = temperature
+        self._attr_extra_state_attributes = {"change_at": change_at.isoformat()}
+
+
+class EnviNextScheduleChangeSensor(EnviScheduleTimelineSensor):
+    """Sensor for the time of the next schedule transition."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:calendar-arrow-right"
+
+    def __init__(
+        self,
+        coordinator: EnviDataUpdateCoordinator,
+        device_id: str,
+        device_name: str,
+    ) -> None:
+        """Initialize next schedule change sensor."""
+        super().__init__(coordinator, device_id, "next_schedule_change", device_name)
+
+    def _update_from_timeline(self, device: EnviDevice, timeline: ScheduleTimeline, now: datetime) -> None:
+        """Update the next transition time; its setpoint goes in attributes."""
+        change_at, temperature = timeline.next_change(now)
+        self._attr_native_value = change_at
+        self._attr_extra_state_attributes = {
+            "setpoint": temperature,
+            "current_setpoint": timeline.current(now),
+            "transitions_per_day": len(timeline),
+        }
+
+
+def _native_temperature_unit(device: EnviDevice) -> str:
+    """Return the heater's own temperature unit."""
+    return UnitOfTemperature.CELSIUS if device.celsius else UnitOfTemperature.FAHRENHEIT
 
 
 class EnviWiFiSSIDSensor(EnviSensor):
@@ -297,15 +378,9 @@ class EnviWiFiSSIDSensor(EnviSensor):
         """Initialize WiFi SSID sensor."""
         super().__init__(coordinator, device_id, "wifi_ssid", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update WiFi SSID."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            ssid = data.get("ssid")
-            self._attr_native_value = ssid or "Unknown"
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_native_value = device.ssid or "Unknown"
 
 
 class EnviLocationSensor(EnviSensor):
@@ -323,15 +398,9 @@ class EnviLocationSensor(EnviSensor):
         """Initialize location sensor."""
         super().__init__(coordinator, device_id, "location", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update location."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            location = data.get("location_name") or data.get("relative_location_name")
-            self._attr_native_value = location or "Unknown"
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_native_value = device.location or "Unknown"
 
 
 class EnviModelSensor(EnviSensor):
@@ -349,15 +418,9 @@ class EnviModelSensor(EnviSensor):
         """Initialize model sensor."""
         super().__init__(coordinator, device_id, "model", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update model."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            model = data.get("model_no")
-            self._attr_native_value = model or "Unknown"
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_native_value = device.model_no or "Unknown"
 
 
 class EnviSerialSensor(EnviSensor):
@@ -375,15 +438,9 @@ class EnviSerialSensor(EnviSensor):
         """Initialize serial sensor."""
         super().__init__(coordinator, device_id, "serial", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update serial number."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            serial = data.get("serial_no")
-            self._attr_native_value = serial or "Unknown"
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        self._attr_native_value = device.serial_no or "Unknown"
 
 
 class EnviLastUpdateSensor(EnviSensor):
@@ -402,78 +459,225 @@ class EnviLastUpdateSensor(EnviSensor):
         """Initialize last update sensor."""
         super().__init__(coordinator, device_id, "last_update", device_name)
 
-    def _update_from_coordinator(self) -> None:
+    def _update_from_device(self, device: EnviDevice) -> None:
         """Update last update timestamp."""
-        data = self.coordinator.get_device_data(self.device_id)
-        if data:
-            # Use device_status_res_at if available, otherwise device_status_req_at
-            last_update = data.get("device_status_res_at") or data.get("device_status_req_at")
-            if last_update:
-                # Parse timestamp - must return datetime object for TIMESTAMP device class
-                dt = None
-                timestamp_str = str(last_update).strip()
-                
-                # Try multiple parsing strategies
-                try:
-                    # Try ISO format first (with or without Z)
-                    if "Z" in timestamp_str:
-                        dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                    elif "+" in timestamp_str or (timestamp_str.count("-") >= 3 and "T" in timestamp_str):
-                        # Has timezone info (ISO format with timezone) or ISO format with T separator
-                        dt = datetime.fromisoformat(timestamp_str)
-                    else:
-                        # Try common formats: "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DDTHH:MM:SS"
-                        # This handles the format seen in the error: "2025-12-18 01:07:44"
-                        for fmt in [
-                            "%Y-%m-%d %H:%M:%S",
-                            "%Y-%m-%dT%H:%M:%S",
-                            "%Y-%m-%d %H:%M:%S.%f",
-                            "%Y-%m-%dT%H:%M:%S.%f",
-                        ]:
-                            try:
-                                dt = datetime.strptime(timestamp_str, fmt)
-                                # Assume UTC if no timezone info
-                                dt = dt.replace(tzinfo=timezone.utc)
-                                break
-                            except ValueError:
-                                continue
-                    
-                    if dt is None:
-                        raise ValueError(f"Could not parse timestamp: {timestamp_str}")
-                    
-                    # Ensure timezone-aware datetime
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    
-                    # CRITICAL: For TIMESTAMP device class, Home Assistant expects a datetime object, not a string
-                    # Double-check we're setting a datetime object, not a string
-                    if not isinstance(dt, datetime):
-                        raise TypeError(f"Expected datetime object, got {type(dt)}")
-                    
-                    self._attr_native_value = dt
-                    _LOGGER.debug(
-                        "Parsed timestamp '%s' to datetime %s for device %s",
-                        timestamp_str,
-                        dt,
-                        self.device_id,
-                    )
-                except (ValueError, TypeError, AttributeError) as e:
-                    # If parsing fails, set to None (not a string) for TIMESTAMP device class
-                    _LOGGER.warning(
-                        "Failed to parse timestamp '%s' (type: %s) for device %s: %s. Setting to None.",
-                        timestamp_str,
-                        type(last_update).__name__,
-                        self.device_id,
-                        e,
-                    )
-                    # CRITICAL: Must set None, not a string, for TIMESTAMP device class
-                    self._attr_native_value = None
-            else:
-                # No timestamp available - set to None for TIMESTAMP device class
-                self._attr_native_value = None
-            self._attr_available = True
-        else:
-            self._attr_available = False
+        # TIMESTAMP sensors need a datetime (or None), never a string
+        try:
+            self._attr_native_value = device.last_update_at
+        except ValueError as e:
+            _LOGGER.warning(
+                "Failed to parse timestamp '%s' for device %s: %s. Setting to None.",
+                device.last_update,
+                self.device_id,
+                e,
+            )
+            self._attr_native_value = None
+
+
+class EnviApiSensor(CoordinatorEntity, SensorEntity):
+    """Base class for per-account API diagnostic sensors.
+    
+    These read the API client's request metrics and belong to one "Envi
+    Cloud" service device per config entry rather than to a heater.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: EnviDataUpdateCoordinator,
+        entry_id: str,
+        sensor_type: str,
+        name: str,
+    ) -> None:
+        """Initialize the API sensor."""
+        super().__init__(coordinator)
+        self.entry_id = entry_id
+        self.sensor_type = sensor_type
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{sensor_type}"
+        self._attr_name = f"Envi Cloud {name}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the account's service device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{ACCOUNT_DEVICE_PREFIX}{self.entry_id}")},
+            name="Envi Cloud",
+            manufacturer="EHEAT",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """API metrics are available even when a poll fails."""
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        """Populate initial state from the current metrics."""
+        await super().async_added_to_hass()
+        self._update_from_coordinator()
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+
+    def _update_from_coordinator(self) -> None:
+        """Update sensor state from the client metrics (override in subclasses)."""
+
+
+class EnviApiRequestsSensor(EnviApiSensor):
+    """Sensor for the total number of API requests."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:cloud-sync"
+
+    def __init__(self, coordinator: EnviDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize API requests sensor."""
+        super().__init__(coordinator, entry_id, "api_requests", "API Requests")
+
+    def _update_from_coordinator(self) -> None:
+        """Update request count and per-endpoint breakdown."""
+        metrics = self.coordinator.client.metrics
+        totals = metrics.totals()
+        self._attr_native_value = totals.requests
+        self._attr_extra_state_attributes = {
+            name: endpoint.requests for name, endpoint in metrics.endpoints.items() if endpoint.requests
+        }
+        self._attr_extra_state_attributes["hedged"] = totals.hedged
+        if pool := self.coordinator.client.connection_pool:
+            self._attr_extra_state_attributes["connection_reuse_rate"] = pool.stats.reuse_rate
+
+
+class EnviApiLatencySensor(EnviApiSensor):
+    """Sensor for the p95 API response time."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator: EnviDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize API latency sensor."""
+        super().__init__(coordinator, entry_id, "api_latency_p95", "API Latency p95")
+
+    def _update_from_coordinator(self) -> None:
+        """Update p95 latency; p50/p99 and per-endpoint p95 go in attributes."""
+        metrics = self.coordinator.client.metrics
+        summary = metrics.totals().latency.as_dict()
+        self._attr_native_value = summary["p95_ms"]
+        self._attr_extra_state_attributes = {
+            "p50_ms": summary["p50_ms"],
+            "p99_ms": summary["p99_ms"],
+            "max_ms": summary["max_ms"],
+            **{
+                f"{name}_p95_ms": endpoint.latency.as_dict()["p95_ms"]
+                for name, endpoint in metrics.endpoints.items()
+                if endpoint.latency.count
+            },
+        }
+
+
+class EnviApiErrorsSensor(EnviApiSensor):
+    """Sensor for the number of failed API requests."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:cloud-alert"
+
+    def __init__(self, coordinator: EnviDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize API errors sensor."""
+        super().__init__(coordinator, entry_id, "api_errors", "API Errors")
+
+    def _update_from_coordinator(self) -> None:
+        """Update failed request count; retry causes go in attributes."""
+        metrics = self.coordinator.client.metrics
+        totals = metrics.totals()
+        self._attr_native_value = totals.errors
+        self._attr_extra_state_attributes = {
+            "retries": totals.retries,
+            "retries_denied": totals.retries_denied,
+            "rate_limited": totals.rate_limited,
+            "server_errors": totals.server_errors,
+            "timeouts": totals.timeouts,
+            "auth_refreshes": metrics.auth_refreshes,
+            "open_circuits": self.coordinator.client.breakers.open_circuits(),
+        }
+
+
+class EnviApiBytesSensor(EnviApiSensor):
+    """Sensor for the amount of data received from the API."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:download-network"
+
+    def __init__(self, coordinator: EnviDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize API data received sensor."""
+        super().__init__(coordinator, entry_id, "api_bytes_received", "API Data Received")
+
+    def _update_from_coordinator(self) -> None:
+        """Update bytes received."""
+        self._attr_native_value = self.coordinator.client.metrics.totals().bytes_received
+
+
+class EnviScanIntervalSensor(EnviApiSensor):
+    """Sensor for the coordinator's current scan interval.
+    
+    In auto mode the interval moves with observed cycle duration, rate
+    limiting and payload changes; the attributes explain the latest
+    adjustments.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-sync-outline"
+
+    def __init__(self, coordinator: EnviDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize scan interval sensor."""
+        super().__init__(coordinator, entry_id, "scan_interval", "Scan Interval")
+
+    def _update_from_coordinator(self) -> None:
+        """Update the interval; tuner state goes in attributes."""
+        interval = self.coordinator.update_interval
+        self._attr_native_value = interval.total_seconds() if interval else None
+        tuner = self.coordinator.interval_tuner
+        if tuner is None:
+            self._attr_extra_state_attributes = {"mode": "fixed"}
+            return
+        last = tuner.last_adjustment
+        state = tuner.as_dict()
+        self._attr_extra_state_attributes = {
+            "mode": "auto",
+            "last_adjustment_reason": last.reason if last else None,
+            "last_adjusted_at": last.at.isoformat() if last else None,
+            "previous_interval_s": last.previous if last else None,
+            "changing_cycles": state["changing_cycles"],
+            "rate_limited": state["rate_limited"],
+            "max_cycle_s": state["max_cycle_s"],
+        }
+
+
+class EnviPendingCommandsSensor(EnviApiSensor):
+    """Sensor for heater commands queued while the Envi cloud is unreachable."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:tray-full"
+
+    def __init__(self, coordinator: EnviDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize pending commands sensor."""
+        super().__init__(coordinator, entry_id, "pending_commands", "Pending Commands")
+
+    def _update_from_coordinator(self) -> None:
+        """Update the queued command count; queued values go in attributes."""
+        journal = self.coordinator.journal
+        self._attr_native_value = journal.pending_count
+        self._attr_extra_state_attributes = {
+            "replayed": journal.replayed,
+            "discarded": journal.discarded,
+            "devices": {device_id: journal.async_pending_for(device_id) for device_id in journal.entries},
+        }
 
 
 async def async_setup_entry(
@@ -481,7 +685,11 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities,
 ):
-    """Set up Envi sensors from a config entry."""
+    """Set up Envi sensors from a config entry.
+    
+    Sensors for heaters discovered later by the coordinator are
+    added incrementally, without reloading the config entry.
+    """
     _LOGGER.debug("Setting up sensors for entry %s", entry.entry_id)
     
     # Get coordinator (should already be created in __init__.py)
@@ -491,6 +699,76 @@ async def async_setup_entry(
         _LOGGER.error("Coordinator not found for entry %s", entry.entry_id)
         return
     
+    known_device_ids: set[str] = set()
+
+    @callback
+    def _async_add_devices(device_ids: list[str]) -> None:
+        """Create sensors for devices not seen before."""
+        new_ids = [device_id for device_id in device_ids if device_id not in known_device_ids]
+        if not new_ids:
+            return
+
+        # Create sensors for each device
+        sensors = []
+        for device_id in new_ids:
+            try:
+                device = coordinator.get_device(device_id)
+                device_name = device.name if device and device.name else f"Heater {device_id}"
+                _LOGGER.debug("Creating sensors for device %s (%s)", device_id, device_name)
+
+                # Create all sensors for this device
+                sensors.extend(
+                    [
+                        EnviSignalStrengthSensor(coordinator, device_id, device_name),
+                        EnviFirmwareVersionSensor(coordinator, device_id, device_name),
+                        EnviModeSensor(coordinator, device_id, device_name),
+                        EnviScheduleNameSensor(coordinator, device_id, device_name),
+                        EnviScheduleTemperatureSensor(coordinator, device_id, device_name),
+                        EnviScheduledSetpointSensor(coordinator, device_id, device_name),
+                        EnviNextSetpointSensor(coordinator, device_id, device_name),
+                        EnviNextScheduleChangeSensor(coordinator, device_id, device_name),
+                        EnviWiFiSSIDSensor(coordinator, device_id, device_name),
+                        EnviLocationSensor(coordinator, device_id, device_name),
+                        EnviModelSensor(coordinator, device_id, device_name),
+                        EnviSerialSensor(coordinator, device_id, device_name),
+                        EnviLastUpdateSensor(coordinator, device_id, device_name),
+                    ]
+                )
+                known_device_ids.add(device_id)
+            except Exception as e:
+                _LOGGER.error("Error creating sensors for device %s: %s", device_id, e, exc_info=True)
+
+        if not sensors:
+            _LOGGER.error("No sensors created!")
+            return
+
+        _LOGGER.info("Created %s sensors for %s devices", len(sensors), len(new_ids))
+        async_add_entities(sensors)
+
+    @callback
+    def _async_remove_devices(device_ids: list[str]) -> None:
+        """Forget removed devices so they are re-created if they come back."""
+        known_device_ids.difference_update(device_ids)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICES_REMOVED.format(entry.entry_id), _async_remove_devices)
+    )
+
+    # Account-level API diagnostics
+    async_add_entities(
+        [
+            EnviApiRequestsSensor(coordinator, entry.entry_id),
+            EnviApiLatencySensor(coordinator, entry.entry_id),
+            EnviApiErrorsSensor(coordinator, entry.entry_id),
+            EnviApiBytesSensor(coordinator, entry.entry_id),
+            EnviScanIntervalSensor(coordinator, entry.entry_id),
+            EnviPendingCommandsSensor(coordinator, entry.entry_id),
+        ]
+    )
+
     device_ids = coordinator.device_ids
 
     if not device_ids:
@@ -498,37 +776,4 @@ async def async_setup_entry(
         return
 
     _LOGGER.info("Found %s devices for sensors: %s", len(device_ids), device_ids)
-
-    # Create sensors for each device
-    sensors = []
-    for device_id in device_ids:
-        try:
-            device_data = coordinator.get_device_data(device_id) or {}
-            device_name = device_data.get("name", f"Heater {device_id}")
-            _LOGGER.debug("Creating sensors for device %s (%s)", device_id, device_name)
-
-            # Create all sensors for this device
-            sensors.extend(
-                [
-                    EnviSignalStrengthSensor(coordinator, device_id, device_name),
-                    EnviFirmwareVersionSensor(coordinator, device_id, device_name),
-                    EnviModeSensor(coordinator, device_id, device_name),
-                    EnviScheduleNameSensor(coordinator, device_id, device_name),
-                    EnviScheduleTemperatureSensor(coordinator, device_id, device_name),
-                    EnviWiFiSSIDSensor(coordinator, device_id, device_name),
-                    EnviLocationSensor(coordinator, device_id, device_name),
-                    EnviModelSensor(coordinator, device_id, device_name),
-                    EnviSerialSensor(coordinator, device_id, device_name),
-                    EnviLastUpdateSensor(coordinator, device_id, device_name),
-                ]
-            )
-        except Exception as e:
-            _LOGGER.error("Error creating sensors for device %s: %s", device_id, e, exc_info=True)
-
-    if not sensors:
-        _LOGGER.error("No sensors created!")
-        return
-
-    _LOGGER.info("Created %s sensors for %s devices", len(sensors), len(device_ids))
-    async_add_entities(sensors, update_before_add=True)
-
+    _async_add_devices(device_ids)
@@ -1,18 +1,24 @@
 """Custom services for Smart Envi integration."""
 from __future__ import annotations
 
+import json
 import logging
+import os
 from typing import TYPE_CHECKING
 
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers import entity_registry
-from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.helpers import device_registry, entity_registry
+from homeassistant.const import ATTR_AREA_ID, ATTR_ENTITY_ID, ATTR_TEMPERATURE
 
-from .const import DOMAIN
+from .const import DOMAIN, MAX_TEMPERATURE, MIN_TEMPERATURE
 from .api import EnviApiClient, EnviApiError, EnviDeviceError
+from .cassette import CassetteRecorder
+from .models import EnviDevice
+from .trace import to_chrome_trace
+from .schedule import diff_schedule, export_schedule, normalize_schedule, plan_schedule_import
 
 if TYPE_CHECKING:
     from .coordinator import EnviDataUpdateCoordinator
@@ -62,6 +68,143 @@ def _get_client_from_domain(hass: HomeAssistant) -> EnviApiClient | None:
             return client
     return None
 
+def _get_coordinators(hass: HomeAssistant) -> list[EnviDataUpdateCoordinator]:
+    """Get all coordinators from domain data.
+    
+    Args:
+        hass: Home Assistant instance
+        
+    Returns:
+        List of coordinators, one per configured Envi account
+    """
+    prefix = f"{DOMAIN}_coordinator_"
+    return [
+        coordinator
+        for key, coordinator in hass.data.get(DOMAIN, {}).items()
+        if key.startswith(prefix) and coordinator is not None
+    ]
+
+
+def _get_coordinator_for_device(hass: HomeAssistant, device_id: str) -> EnviDataUpdateCoordinator | None:
+    """Get the coordinator that manages a device.
+    
+    Args:
+        hass: Home Assistant instance
+        device_id: Device ID to look up
+        
+    Returns:
+        Coordinator managing the device, or None if no coordinator knows it
+    """
+    for coordinator in _get_coordinators(hass):
+        if device_id in coordinator.device_ids:
+            return coordinator
+    return None
+
+
+def _resolve_target_device_ids(hass: HomeAssistant, call: ServiceCall) -> set[str]:
+    """Resolve entity, area and "all" targets of a service call to device IDs.
+    
+    Only Smart Envi climate entities are considered, so sensors that belong to
+    the same heater don't resolve to bogus device IDs.
+    
+    Args:
+        hass: Home Assistant instance
+        call: Service call with entity_id, area_id and/or all
+        
+    Returns:
+        Set of device ID strings
+    """
+    if call.data.get("all"):
+        return {
+            device_id
+            for coordinator in _get_coordinators(hass)
+            for device_id in coordinator.device_ids
+        }
+
+    device_ids: set[str] = set()
+    ent_reg = entity_registry.async_get(hass)
+    prefix = f"{DOMAIN}_"
+
+    for entity_id in call.data.get(ATTR_ENTITY_ID, []):
+        registry_entry = ent_reg.async_get(entity_id)
+        if registry_entry is None or registry_entry.platform != DOMAIN or registry_entry.domain != "climate":
+            _LOGGER.warning("Ignoring %s: not a Smart Envi heater", entity_id)
+            continue
+        device_ids.add(registry_entry.unique_id.replace(prefix, "", 1))
+
+    area_ids = set(call.data.get(ATTR_AREA_ID, []))
+    if area_ids:
+        dev_reg = device_registry.async_get(hass)
+        for registry_entry in ent_reg.entities.values():
+            if registry_entry.platform != DOMAIN or registry_entry.domain != "climate":
+                continue
+            area_id = registry_entry.area_id
+            if area_id is None and registry_entry.device_id:
+                device = dev_reg.async_get(registry_entry.device_id)
+                area_id = device.area_id if device else None
+            if area_id in area_ids:
+                device_ids.add(registry_entry.unique_id.replace(prefix, "", 1))
+
+    return device_ids
+
+
+def _resolve_schedule_file(hass: HomeAssistant, filename: str) -> str:
+    """Resolve a schedule export/import filename to an allowed path.
+    
+    Relative names are resolved inside the Home Assistant config directory.
+    Absolute paths must be in ``allowlist_external_dirs``.
+    
+    Args:
+        hass: Home Assistant instance
+        filename: File name or path given to the service
+        
+    Returns:
+        Absolute file path
+        
+    Raises:
+        HomeAssistantError: If the path is not allowed
+    """
+    if not os.path.isabs(filename):
+        return hass.config.path(filename)
+    if not hass.config.is_allowed_path(filename):
+        raise HomeAssistantError(f"Access to {filename} is not allowed (see allowlist_external_dirs)")
+    return filename
+
+
+def _write_json_file(path: str, data: dict) -> None:
+    """Write data to a JSON file (runs in executor)."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
+def _read_json_file(path: str) -> dict | list:
+    """Read data from a JSON file (runs in executor)."""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _get_clients(hass: HomeAssistant) -> dict[str, EnviApiClient]:
+    """Get all API clients from domain data, keyed by config entry ID."""
+    return {
+        entry_id: client
+        for entry_id, client in hass.data.get(DOMAIN, {}).items()
+        if entry_id != "services_setup" and isinstance(client, EnviApiClient)
+    }
+
+
+def _cassette_path(path: str, entry_id: str, account_count: int) -> str:
+    """Return the cassette file path for one account.
+    
+    With several accounts, the config entry ID is inserted before the
+    extension so each account gets its own cassette.
+    """
+    if account_count == 1:
+        return path
+    directory, name = os.path.split(path)
+    base, _, ext = name.partition(".")
+    return os.path.join(directory, f"{base}.{entry_id}.{ext}" if ext else f"{name}.{entry_id}")
+
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up custom services for Smart Envi integration."""
     
@@ -113,6 +256,10 @@ async def async_setup_services(hass: HomeAssistant) -> None:
           - temperature: float - Target temperature (50-86°F)
           - enabled: bool - Whether this time slot is enabled
         
+        The requested schedule is diffed against the cached schedule index and
+        only changed fields are sent. Re-applying an identical schedule makes no
+        API calls once the index is cached.
+        
         Args:
             call: Service call with entity_id and schedule data
             
@@ -133,9 +280,10 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if not device_id:
             raise HomeAssistantError(f"Could not determine device_id for entity {entity_id}")
         
-        client = _get_client_from_domain(hass)
-        if not client:
+        coordinator = _get_coordinator_for_device(hass, device_id)
+        if not coordinator:
             raise HomeAssistantError("Smart Envi integration not configured or API client unavailable")
+        client = coordinator.client
         
         try:
             # Validate schedule data structure
@@ -160,45 +308,40 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                                 f"Schedule temperature must be between 50 and 86°F, got {temp}"
                             )
             
-            # Get current device data to find schedule_id
-            device_data = await client.get_device_state(device_id)
-            schedule_info = device_data.get("schedule", {})
-            schedule_id = None
+            # Look up the current schedule in the cached schedule index
+            # (no live device GET; schedule/list is fetched at most once per TTL)
+            current = await coordinator.async_get_device_schedule(device_id)
             
-            if isinstance(schedule_info, dict):
-                schedule_id = schedule_info.get("schedule_id") or schedule_info.get("id")
-            
-            # Build schedule payload
-            # Include device_id for creation, schedule_id for updates
-            payload = schedule_data.copy()
-            
-            if schedule_id:
-                # Update existing schedule
-                _LOGGER.info("Updating schedule %s for device %s", schedule_id, device_id)
-                _LOGGER.debug("Schedule update payload: %s", payload)
-                await client.update_schedule(schedule_id, payload)
+            if current and current.get("id"):
+                schedule_id = current["id"]
+                changes = diff_schedule(current, schedule_data)
+                if not changes:
+                    _LOGGER.debug(
+                        "Schedule %s for device %s is unchanged, skipping write", schedule_id, device_id
+                    )
+                    return
+                # Update existing schedule with only the fields that changed
+                _LOGGER.info(
+                    "Updating schedule %s for device %s (changed: %s)",
+                    schedule_id, device_id, ", ".join(changes),
+                )
+                _LOGGER.debug("Schedule update payload: %s", changes)
+                await client.update_schedule(schedule_id, changes)
+                coordinator.async_store_schedule(schedule_id, changes)
                 _LOGGER.info("Schedule %s updated successfully for device %s", schedule_id, device_id)
             else:
                 # Create new schedule
                 _LOGGER.info("Creating new schedule for device %s", device_id)
+                payload = normalize_schedule(schedule_data)
                 payload["device_id"] = device_id
                 _LOGGER.debug("Schedule creation payload: %s", payload)
                 await client.create_schedule(payload)
+                # The new schedule's ID is only known after the next list fetch
+                coordinator.async_invalidate_schedules()
                 _LOGGER.info("New schedule created successfully for device %s", device_id)
             
             # Refresh device data to get updated schedule info
-            # Find the coordinator that manages this device
-            domain_data = hass.data.get(DOMAIN, {})
-            for entry_id, _ in domain_data.items():
-                if entry_id == "services_setup":
-                    continue
-                coordinator_key = f"{DOMAIN}_coordinator_{entry_id}"
-                coordinator = domain_data.get(coordinator_key)
-                if coordinator and hasattr(coordinator, "async_refresh_device"):
-                    # Check if this coordinator manages our device
-                    if device_id in coordinator.device_ids:
-                        await coordinator.async_refresh_device(device_id)
-                        break
+            await coordinator.async_refresh_device(device_id)
             
             _LOGGER.info("Schedule operation completed successfully for %s", entity_id)
         except HomeAssistantError:
@@ -244,21 +387,18 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         
         try:
             # Get device state to find schedule_id
-            device_data = await client.get_device_state(device_id)
-            schedule_info = device_data.get("schedule", {})
-            
-            schedule_id = None
-            if isinstance(schedule_info, dict):
-                schedule_id = schedule_info.get("schedule_id") or schedule_info.get("id")
+            device = EnviDevice.from_payload(await client.get_device_state(device_id))
+            schedule_info = device.schedule
+            schedule_id = schedule_info.schedule_id if schedule_info else None
             
             # If schedule_id exists, try to get full schedule details
             schedule_data = {
                 "device_id": device_id,
                 "schedule_id": schedule_id,
-                "enabled": schedule_info.get("enabled", False) if isinstance(schedule_info, dict) else False,
-                "name": schedule_info.get("name") or schedule_info.get("title") if isinstance(schedule_info, dict) else None,
-                "temperature": schedule_info.get("temperature") if isinstance(schedule_info, dict) else None,
-                "times": schedule_info.get("times", []) if isinstance(schedule_info, dict) else [],
+                "enabled": schedule_info.enabled if schedule_info else False,
+                "name": schedule_info.name if schedule_info else None,
+                "temperature": schedule_info.temperature if schedule_info else None,
+                "times": schedule_info.times if schedule_info else [],
             }
             
             # If we have a schedule_id, try to get more details from schedule list
@@ -266,7 +406,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 try:
                     schedule_list = await client.get_schedule_list()
                     for schedule in schedule_list:
-                        if isinstance(schedule, dict) and schedule.get("id") == schedule_id:
+                        if isinstance(schedule, dict) and str(schedule.get("id")) == schedule_id:
                             # Merge additional schedule details
                             schedule_data.update({
                                 "enabled": schedule.get("enabled", schedule_data["enabled"]),
@@ -318,34 +458,41 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         
         try:
             # Get full device info
-            device_info = await client.get_device_full_info(device_id)
+            device = EnviDevice.from_payload(await client.get_device_full_info(device_id))
             
             # Log detailed status
             _LOGGER.info("Retrieved status for %s (device_id: %s)", entity_id, device_id)
-            _LOGGER.debug("=== Status for %s ===", entity_id)
-            _LOGGER.debug("Device ID: %s", device_id)
-            _LOGGER.debug("Name: %s", device_info.get("name"))
-            _LOGGER.debug("Serial: %s", device_info.get("serial_no"))
-            _LOGGER.debug("Model: %s", device_info.get("model_no"))
-            _LOGGER.debug("Firmware: %s", device_info.get("firmware_version"))
-            _LOGGER.debug("Current Temp: %s°%s", device_info.get("ambient_temperature"), device_info.get("temperature_unit", "F"))
-            _LOGGER.debug("Target Temp: %s°%s", device_info.get("current_temperature"), device_info.get("temperature_unit", "F"))
-            _LOGGER.debug("State: %s", "ON" if device_info.get("state") == 1 else "OFF")
-            _LOGGER.debug("Mode: %s", device_info.get("current_mode"))
-            _LOGGER.debug("Schedule Active: %s", device_info.get("is_schedule_active"))
-            _LOGGER.debug("Freeze Protect: %s", device_info.get("freeze_protect_setting"))
-            _LOGGER.debug("Signal Strength: %s%%", device_info.get("signal_strength"))
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                unit = device.temperature_unit
+                _LOGGER.debug(
+                    "Status for %s: device_id=%s name=%s model=%s firmware=%s current=%s°%s "
+                    "target=%s°%s state=%s mode=%s schedule_active=%s freeze_protect=%s signal=%s%%",
+                    entity_id,
+                    device_id,
+                    device.name,
+                    device.model_no,
+                    device.firmware_version,
+                    device.ambient_temperature,
+                    unit,
+                    device.target_temperature,
+                    unit,
+                    "ON" if device.is_on else "OFF",
+                    device.mode,
+                    device.schedule_active,
+                    device.freeze_protect,
+                    device.signal_strength,
+                )
             
             # Return status as service result (for use in automations)
             return {
                 "device_id": device_id,
-                "name": device_info.get("name"),
-                "current_temperature": device_info.get("ambient_temperature"),
-                "target_temperature": device_info.get("current_temperature"),
-                "state": "on" if device_info.get("state") == 1 else "off",
-                "mode": device_info.get("current_mode"),
-                "firmware_version": device_info.get("firmware_version"),
-                "signal_strength": device_info.get("signal_strength"),
+                "name": device.name,
+                "current_temperature": device.ambient_temperature,
+                "target_temperature": device.target_temperature,
+                "state": "on" if device.is_on else "off",
+                "mode": device.mode,
+                "firmware_version": device.firmware_version,
+                "signal_strength": device.signal_strength,
             }
         except EnviApiError as e:
             _LOGGER.error("API error getting status for %s: %s", entity_id, e, exc_info=True)
@@ -505,6 +652,304 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             _LOGGER.error("Failed to set hold: %s", e, exc_info=True)
             raise HomeAssistantError(f"Failed to set hold: {str(e)}") from e
 
+    async def bulk_set(call: ServiceCall) -> ServiceResponse:
+        """Set temperature, state and/or mode on many heaters at once.
+        
+        Writes are combined into one PATCH per heater, fanned out per account
+        with bounded concurrency, and followed by a single coordinator refresh
+        per account instead of one refresh per heater.
+        
+        Args:
+            call: Service call with targets (entity_id, area_id or all) and at
+                least one of temperature (°F), state ("on"/"off") or mode
+                
+        Returns:
+            Dictionary with per-device results and success/failure counts
+            
+        Raises:
+            HomeAssistantError: If no Smart Envi heaters match the targets
+        """
+        device_ids = _resolve_target_device_ids(hass, call)
+        if not device_ids:
+            raise HomeAssistantError("No Smart Envi heaters matched the given targets")
+
+        temperature = call.data.get(ATTR_TEMPERATURE)
+        state = call.data.get("state")
+        mode = call.data.get("mode")
+
+        # Group payloads per coordinator (one per account)
+        plans: dict[str, tuple[EnviDataUpdateCoordinator, dict[str, dict]]] = {}
+        results: dict[str, dict] = {}
+        for device_id in sorted(device_ids):
+            coordinator = _get_coordinator_for_device(hass, device_id)
+            if coordinator is None:
+                results[device_id] = {"success": False, "error": "Device not managed by any Smart Envi account"}
+                continue
+
+            payload: dict = {}
+            if temperature is not None:
+                device = coordinator.get_device(device_id)
+                if device is not None and device.celsius:
+                    payload["temperature"] = coordinator.client.convert_temperature(temperature, "F", "C")
+                else:
+                    payload["temperature"] = temperature
+            if state is not None:
+                payload["state"] = 1 if state == "on" else 0
+            if mode is not None:
+                payload["mode"] = mode
+
+            plans.setdefault(coordinator.entry_id, (coordinator, {}))[1][device_id] = payload
+
+        for coordinator, payloads in plans.values():
+            _LOGGER.info("Bulk updating %s heaters for entry %s", len(payloads), coordinator.entry_id)
+            outcome = await coordinator.async_bulk_update_devices(payloads)
+            for device_id, error in outcome.items():
+                if error is None:
+                    results[device_id] = {"success": True}
+                else:
+                    results[device_id] = {"success": False, "error": str(error)}
+
+        succeeded = sum(1 for result in results.values() if result["success"])
+        _LOGGER.info("Bulk set complete: %s succeeded, %s failed", succeeded, len(results) - succeeded)
+        return {
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        }
+
+    async def export_schedules(call: ServiceCall) -> ServiceResponse:
+        """Export all schedules of all configured accounts.
+        
+        Args:
+            call: Service call with optional filename to write the export to
+            
+        Returns:
+            Export document with a ``schedules`` list (also written to the file
+            if a filename was given)
+            
+        Raises:
+            HomeAssistantError: If schedules can't be fetched or the file can't
+                be written
+        """
+        schedules: list[dict] = []
+        for coordinator in _get_coordinators(hass):
+            try:
+                index = await coordinator.async_get_schedules(force=True)
+            except EnviApiError as e:
+                raise HomeAssistantError(f"Failed to fetch schedules: {e}") from e
+            schedules.extend(export_schedule(schedule) for schedule in index.values())
+
+        export = {"version": 1, "schedules": schedules}
+
+        filename = call.data.get("filename")
+        if filename:
+            path = _resolve_schedule_file(hass, filename)
+            try:
+                await hass.async_add_executor_job(_write_json_file, path, export)
+            except OSError as e:
+                raise HomeAssistantError(f"Failed to write {path}: {e}") from e
+            _LOGGER.info("Exported %s schedules to %s", len(schedules), path)
+        else:
+            _LOGGER.info("Exported %s schedules", len(schedules))
+        return export
+
+    async def import_schedules(call: ServiceCall) -> ServiceResponse:
+        """Import schedules, writing only what differs from the current state.
+        
+        The import is reconciled against a fresh schedule/list per account:
+        unchanged schedules cost nothing, changed ones get a PUT with only the
+        changed fields, new ones are added and (with delete_missing) schedules
+        of the imported devices that aren't in the import are deleted. Writes
+        run with bounded concurrency.
+        
+        Args:
+            call: Service call with schedules or filename, plus dry_run and
+                delete_missing flags
+                
+        Returns:
+            Summary of planned (dry run) or applied operations and any errors
+            
+        Raises:
+            HomeAssistantError: If the import can't be read or is invalid
+        """
+        dry_run = call.data["dry_run"]
+        delete_missing = call.data["delete_missing"]
+
+        imported = call.data.get("schedules")
+        if imported is None:
+            path = _resolve_schedule_file(hass, call.data["filename"])
+            try:
+                document = await hass.async_add_executor_job(_read_json_file, path)
+            except (OSError, ValueError) as e:
+                raise HomeAssistantError(f"Failed to read {path}: {e}") from e
+            imported = document.get("schedules") if isinstance(document, dict) else document
+        if not isinstance(imported, list):
+            raise HomeAssistantError("Import must contain a list of schedules")
+
+        # Group imported schedules by the account that manages their device
+        per_coordinator: dict[str, tuple[EnviDataUpdateCoordinator, list[dict]]] = {}
+        skipped: list[str] = []
+        for entry in imported:
+            if not isinstance(entry, dict) or entry.get("device_id") is None:
+                raise HomeAssistantError("Each imported schedule must be a dictionary with a device_id")
+            for time_entry in normalize_schedule(entry).get("times", []):
+                if not MIN_TEMPERATURE <= time_entry["temperature"] <= MAX_TEMPERATURE:
+                    raise HomeAssistantError(
+                        f"Schedule temperature must be between {MIN_TEMPERATURE} and "
+                        f"{MAX_TEMPERATURE}°F, got {time_entry['temperature']}"
+                    )
+            device_id = str(entry["device_id"])
+            coordinator = _get_coordinator_for_device(hass, device_id)
+            if coordinator is None:
+                _LOGGER.warning("Skipping schedule for unknown device %s", device_id)
+                skipped.append(device_id)
+                continue
+            per_coordinator.setdefault(coordinator.entry_id, (coordinator, []))[1].append(entry)
+
+        summary: dict = {
+            "dry_run": dry_run,
+            "added": 0,
+            "updated": 0,
+            "deleted": 0,
+            "unchanged": 0,
+            "skipped_devices": skipped,
+            "operations": [],
+            "errors": {},
+        }
+        for coordinator, entries in per_coordinator.values():
+            try:
+                current = await coordinator.async_get_schedules(force=True)
+            except EnviApiError as e:
+                raise HomeAssistantError(f"Failed to fetch schedules: {e}") from e
+            plan = plan_schedule_import(current, entries, delete_missing=delete_missing)
+
+            summary["unchanged"] += len(plan["unchanged"])
+            summary["operations"].extend(
+                [{"action": "add", **payload} for payload in plan["add"]]
+                + [{"action": "update", "schedule_id": schedule_id, **changes} for schedule_id, changes in plan["update"]]
+                + [{"action": "delete", "schedule_id": schedule_id} for schedule_id in plan["delete"]]
+            )
+            if dry_run:
+                summary["added"] += len(plan["add"])
+                summary["updated"] += len(plan["update"])
+                summary["deleted"] += len(plan["delete"])
+                continue
+
+            results = await coordinator.async_apply_schedule_plan(plan)
+            for key, error in results.items():
+                if error is not None:
+                    summary["errors"][key] = str(error)
+                    continue
+                action = key.split(":", 1)[0]
+                summary[{"add": "added", "update": "updated", "delete": "deleted"}[action]] += 1
+
+        _LOGGER.info(
+            "Schedule import %s: %s added, %s updated, %s deleted, %s unchanged, %s errors",
+            "planned (dry run)" if dry_run else "applied",
+            summary["added"], summary["updated"], summary["deleted"],
+            summary["unchanged"], len(summary["errors"]),
+        )
+        return summary
+
+    async def start_api_recording(call: ServiceCall) -> None:
+        """Start recording API traffic of all accounts to an in-memory cassette.
+        
+        Args:
+            call: Service call (no parameters required)
+            
+        Raises:
+            HomeAssistantError: If no API clients are found
+        """
+        clients = _get_clients(hass)
+        if not clients:
+            raise HomeAssistantError("No Smart Envi API clients found. Please configure the integration first.")
+        for entry_id, client in clients.items():
+            if isinstance(client.transport, CassetteRecorder):
+                _LOGGER.debug("API recording already running for entry %s", entry_id)
+                continue
+            client.transport = CassetteRecorder(client.transport)
+            _LOGGER.info("Started API recording for entry %s", entry_id)
+
+    async def stop_api_recording(call: ServiceCall) -> ServiceResponse:
+        """Stop recording API traffic and save the cassette(s).
+        
+        Args:
+            call: Service call with the filename to write the cassette to
+                (gzipped if it ends with ``.gz``)
+            
+        Returns:
+            Dictionary with the written files and interaction counts, plus
+            the cassettes whose recording stopped early at a size or time limit
+            
+        Raises:
+            HomeAssistantError: If no recording is running or the file can't
+                be written
+        """
+        path = _resolve_schedule_file(hass, call.data["filename"])
+        recordings = {
+            entry_id: client
+            for entry_id, client in _get_clients(hass).items()
+            if isinstance(client.transport, CassetteRecorder)
+        }
+        if not recordings:
+            raise HomeAssistantError("No API recording is running")
+
+        files = {}
+        truncated = {}
+        for entry_id, client in recordings.items():
+            recorder = client.transport
+            client.transport = recorder.transport
+            cassette_path = _cassette_path(path, entry_id, len(recordings))
+            try:
+                await hass.async_add_executor_job(recorder.save, cassette_path)
+            except OSError as e:
+                raise HomeAssistantError(f"Failed to write {cassette_path}: {e}") from e
+            files[cassette_path] = len(recorder.interactions)
+            if recorder.truncated is not None:
+                truncated[cassette_path] = {"reason": recorder.truncated, "dropped": recorder.dropped}
+        return {"files": files, "truncated": truncated}
+
+    async def export_trace(call: ServiceCall) -> ServiceResponse:
+        """Export recent coordinator cycle traces as Chrome trace JSON.
+        
+        The file can be opened in chrome://tracing or ui.perfetto.dev to see
+        where each poll cycle spent its time (network, retry sleeps, entity
+        updates).
+        
+        Args:
+            call: Service call with the filename to write the trace to
+            
+        Returns:
+            Dictionary with the written file and a timing summary per cycle
+            
+        Raises:
+            HomeAssistantError: If no traces are available or the file can't
+                be written
+        """
+        path = _resolve_schedule_file(hass, call.data["filename"])
+        coordinators = _get_coordinators(hass)
+        events: list[dict] = []
+        summaries: dict[str, list[dict]] = {}
+        next_pid = 1
+        for coordinator in coordinators:
+            traces = list(coordinator.traces)
+            events.extend(
+                to_chrome_trace(traces, process_name=coordinator.entry_id, start_pid=next_pid)["traceEvents"]
+            )
+            next_pid += len(traces)
+            summaries[coordinator.entry_id] = [trace.summary() for trace in traces]
+        if not events:
+            raise HomeAssistantError("No coordinator traces recorded yet")
+
+        try:
+            await hass.async_add_executor_job(
+                _write_json_file, path, {"traceEvents": events, "displayTimeUnit": "ms"}
+            )
+        except OSError as e:
+            raise HomeAssistantError(f"Failed to write {path}: {e}") from e
+        _LOGGER.info("Exported coordinator traces to %s", path)
+        return {"file": path, "cycles": summaries}
+
     # Register all services
     hass.services.async_register(
         DOMAIN,
@@ -513,6 +958,27 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=vol.Schema({}),
     )
     
+    hass.services.async_register(
+        DOMAIN,
+        "bulk_set",
+        bulk_set,
+        schema=vol.All(
+            vol.Schema({
+                vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+                vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [cv.string]),
+                vol.Optional("all"): cv.boolean,
+                vol.Optional(ATTR_TEMPERATURE): vol.All(
+                    vol.Coerce(float), vol.Range(min=MIN_TEMPERATURE, max=MAX_TEMPERATURE)
+                ),
+                vol.Optional("state"): vol.In(["on", "off"]),
+                vol.Optional("mode"): vol.Coerce(int),
+            }),
+            cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_AREA_ID, "all"),
+            cv.has_at_least_one_key(ATTR_TEMPERATURE, "state", "mode"),
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
     hass.services.async_register(
         DOMAIN,
         "set_schedule",
@@ -521,6 +987,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             vol.Required(ATTR_ENTITY_ID): cv.entity_id,
             vol.Required("schedule"): vol.Schema({
                 vol.Required("enabled"): cv.boolean,
+                vol.Optional("name"): cv.string,
                 vol.Optional("times"): vol.All(cv.ensure_list, [
                     vol.Schema({
                         vol.Required("time"): cv.time,
@@ -541,6 +1008,32 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         }),
     )
     
+    hass.services.async_register(
+        DOMAIN,
+        "export_schedules",
+        export_schedules,
+        schema=vol.Schema({
+            vol.Optional("filename"): cv.string,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        "import_schedules",
+        import_schedules,
+        schema=vol.All(
+            vol.Schema({
+                vol.Optional("filename"): cv.string,
+                vol.Optional("schedules"): vol.All(cv.ensure_list, [dict]),
+                vol.Optional("dry_run", default=False): cv.boolean,
+                vol.Optional("delete_missing", default=False): cv.boolean,
+            }),
+            cv.has_at_least_one_key("filename", "schedules"),
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
     hass.services.async_register(
         DOMAIN,
         "get_status",
@@ -587,13 +1080,46 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         }),
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        "start_api_recording",
+        start_api_recording,
+        schema=vol.Schema({}),
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        "stop_api_recording",
+        stop_api_recording,
+        schema=vol.Schema({
+            vol.Required("filename"): cv.string,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "export_trace",
+        export_trace,
+        schema=vol.Schema({
+            vol.Required("filename"): cv.string,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
 async def async_unload_services(hass: HomeAssistant) -> None:
     """Unload custom services."""
     hass.services.async_remove(DOMAIN, "refresh_all")
+    hass.services.async_remove(DOMAIN, "bulk_set")
     hass.services.async_remove(DOMAIN, "set_schedule")
     hass.services.async_remove(DOMAIN, "get_schedule")
+    hass.services.async_remove(DOMAIN, "export_schedules")
+    hass.services.async_remove(DOMAIN, "import_schedules")
     hass.services.async_remove(DOMAIN, "get_status")
     hass.services.async_remove(DOMAIN, "test_connection")
     hass.services.async_remove(DOMAIN, "set_freeze_protect")
     hass.services.async_remove(DOMAIN, "set_child_lock")
     hass.services.async_remove(DOMAIN, "set_hold")
+    hass.services.async_remove(DOMAIN, "start_api_recording")
+    hass.services.async_remove(DOMAIN, "stop_api_recording")
+    hass.services.async_remove(DOMAIN, "export_trace")
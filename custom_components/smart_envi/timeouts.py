@@ -0,0 +1,130 @@
+"""Timeouts and request deadlines for the Envi API client.
+
+Each endpoint class (see metrics.py) has its own ``TimeoutProfile``:
+
+* ``connect``: time allowed to open a connection (including TLS) per attempt;
+* ``read``: longest wait for data on the socket per attempt;
+* ``total``: deadline for the whole request, covering every attempt, queueing
+  for a scheduler slot and the backoff sleeps between retries.
+
+Retries only happen while the deadline has room for them, and each attempt's
+total timeout is whatever is left of it, so a retried request never takes
+longer than its profile allows. Callers can tighten the deadline further for
+everything they start with ``request_deadline`` (e.g. a poll cycle that must
+not run into the next one).
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import ClientTimeout
+
+from .const import (
+    DEFAULT_API_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_ENDPOINT_TIMEOUTS,
+    DEFAULT_READ_TIMEOUT,
+)
+from .metrics import ENDPOINT_CLASSES
+
+# Absolute time.monotonic() deadline set by the caller, if any
+_REQUEST_DEADLINE: ContextVar[float | None] = ContextVar("smart_envi_request_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[None]:
+    """Finish the requests made inside the block within ``seconds`` from now.
+
+    Nested deadlines never extend an outer one.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _REQUEST_DEADLINE.get()
+    token = _REQUEST_DEADLINE.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _REQUEST_DEADLINE.reset(token)
+
+
+@dataclass(frozen=True)
+class TimeoutProfile:
+    """Connect, socket-read and total timeouts of one endpoint class (seconds)."""
+
+    connect: float
+    read: float
+    total: float
+
+    def deadline(self) -> float:
+        """Return the time.monotonic() deadline of a request starting now."""
+        deadline = time.monotonic() + self.total
+        caller = _REQUEST_DEADLINE.get()
+        return deadline if caller is None else min(caller, deadline)
+
+    def client_timeout(self, remaining: float) -> ClientTimeout:
+        """Return the aiohttp timeout for an attempt with ``remaining`` seconds left."""
+        return ClientTimeout(
+            total=remaining,
+            sock_connect=min(self.connect, remaining),
+            sock_read=min(self.read, remaining),
+        )
+
+    def as_dict(self) -> dict:
+        """Return the profile for diagnostics."""
+        return {"connect_s": self.connect, "read_s": self.read, "total_s": self.total}
+
+
+def default_endpoint_timeout(name: str, options: Mapping[str, Any]) -> float:
+    """Return the deadline of an endpoint class when it has no ``<class>_timeout`` option.
+
+    That is its DEFAULT_ENDPOINT_TIMEOUTS entry, or else the general
+    ``api_timeout`` option.
+    """
+    return float(DEFAULT_ENDPOINT_TIMEOUTS.get(name, options.get("api_timeout", DEFAULT_API_TIMEOUT)))
+
+
+def timeout_overrides(values: Mapping[str, Any], options: Mapping[str, Any]) -> dict[str, Any]:
+    """Return options with ``<class>_timeout`` values set from ``values``.
+
+    Values equal to the class's default are removed rather than stored, so
+    those classes keep following ``api_timeout`` when it changes.
+
+    Args:
+        values: Submitted ``<class>_timeout`` values (other keys are copied as is)
+        options: Options to update (``api_timeout`` decides the defaults)
+
+    Returns:
+        Updated copy of ``options``
+    """
+    updated = {**options, **values}
+    for name in ENDPOINT_CLASSES:
+        key = f"{name}_timeout"
+        if key in updated and float(updated[key]) == default_endpoint_timeout(name, updated):
+            del updated[key]
+    return updated
+
+
+def build_timeout_profiles(options: Mapping[str, Any]) -> dict[str, TimeoutProfile]:
+    """Build the timeout profile of every endpoint class from config entry options.
+
+    Connect and read timeouts are shared by all classes. The total comes from
+    the ``<class>_timeout`` option, then DEFAULT_ENDPOINT_TIMEOUTS, then the
+    general ``api_timeout`` option.
+
+    Args:
+        options: Config entry options
+
+    Returns:
+        Dictionary mapping endpoint class to its profile
+    """
+    connect = float(options.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT))
+    read = float(options.get("read_timeout", DEFAULT_READ_TIMEOUT))
+    profiles = {}
+    for name in ENDPOINT_CLASSES:
+        total = float(options.get(f"{name}_timeout", default_endpoint_timeout(name, options)))
+        profiles[name] = TimeoutProfile(min(connect, total), min(read, total), total)
+    return profiles
@@ -0,0 +1,195 @@
+"""Per-cycle tracing for the Smart Envi coordinator.
+
+Each coordinator update cycle can be recorded as a ``CycleTrace`` made of
+timed spans (device list, per-device fetches, HTTP attempts, retry sleeps,
+payload processing, listener dispatch). The active trace lives in a context
+variable, so the API client adds spans without the trace being passed around,
+and code running outside a traced cycle pays only for one context variable
+lookup per span.
+
+Traces can be exported in the Chrome trace event format and opened in
+``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+# Upper bound on spans kept per cycle, so tracing large fleets stays cheap
+MAX_SPANS_PER_TRACE = 2500
+
+MAIN_TRACK = "coordinator"
+
+_ACTIVE_TRACE: ContextVar[CycleTrace | None] = ContextVar("smart_envi_trace", default=None)
+_ACTIVE_TRACK: ContextVar[str] = ContextVar("smart_envi_trace_track", default=MAIN_TRACK)
+
+
+class Span:
+    """One timed operation within a cycle (times relative to the cycle start)."""
+
+    __slots__ = ("name", "track", "start", "end", "attributes")
+
+    def __init__(self, name: str, track: str, start: float, attributes: dict[str, Any]) -> None:
+        """Initialize the span."""
+        self.name = name
+        self.track = track
+        self.start = start
+        self.end = start
+        self.attributes = attributes
+
+    @property
+    def duration(self) -> float:
+        """Span duration in seconds."""
+        return self.end - self.start
+
+    def as_dict(self) -> dict:
+        """Return the span with times in milliseconds."""
+        return {
+            "name": self.name,
+            "track": self.track,
+            "start_ms": round(self.start * 1000, 2),
+            "duration_ms": round(self.duration * 1000, 2),
+            **({"attributes": self.attributes} if self.attributes else {}),
+        }
+
+
+class CycleTrace:
+    """Spans recorded during one coordinator update cycle."""
+
+    def __init__(self, name: str = "update") -> None:
+        """Start a trace now."""
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self.start_monotonic = time.monotonic()
+        self.duration: float | None = None
+        self.spans: list[Span] = []
+        self.dropped_spans = 0
+        self.attributes: dict[str, Any] = {}
+
+    def elapsed(self) -> float:
+        """Seconds since the trace started."""
+        return time.monotonic() - self.start_monotonic
+
+    def add_span(self, span: Span) -> None:
+        """Keep a finished span, or count it as dropped once the cap is hit."""
+        if len(self.spans) < MAX_SPANS_PER_TRACE:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+
+    def finish(self) -> None:
+        """Mark the cycle as finished (spans may still be added, e.g. dispatch)."""
+        self.duration = self.elapsed()
+
+    def phase_totals(self) -> dict[str, float]:
+        """Total time per span name in milliseconds.
+
+        Concurrent spans (e.g. parallel device fetches) are summed, so totals
+        can exceed the cycle duration.
+        """
+        totals: dict[str, float] = defaultdict(float)
+        for span in self.spans:
+            totals[span.name] += span.duration * 1000
+        return {name: round(total, 2) for name, total in totals.items()}
+
+    def summary(self) -> dict:
+        """Return timing summary without individual spans."""
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans,
+            "phase_totals_ms": self.phase_totals(),
+            **self.attributes,
+        }
+
+    def as_dict(self) -> dict:
+        """Return summary plus all spans."""
+        return {**self.summary(), "spans": [span.as_dict() for span in self.spans]}
+
+    @contextmanager
+    def activate(self) -> Iterator[CycleTrace]:
+        """Make this the active trace for code running in the current context."""
+        token = _ACTIVE_TRACE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_TRACE.reset(token)
+
+
+@contextmanager
+def trace_span(name: str, track: str | None = None, **attributes: Any) -> Iterator[Span | None]:
+    """Record a span in the active trace (no-op outside a traced cycle).
+
+    Args:
+        name: Span name (e.g. "device_fetch", "http", "retry_sleep")
+        track: Track to draw the span and its nested spans on (e.g. a device
+            ID); defaults to the enclosing span's track
+        **attributes: Extra attributes stored with the span
+
+    Yields:
+        The span (attributes can be added while it runs), or None if no trace
+        is active
+    """
+    trace = _ACTIVE_TRACE.get()
+    if trace is None:
+        yield None
+        return
+
+    track_token = _ACTIVE_TRACK.set(track) if track else None
+    span = Span(name, track or _ACTIVE_TRACK.get(), trace.elapsed(), attributes)
+    try:
+        yield span
+    except BaseException as err:
+        span.attributes["error"] = type(err).__name__
+        raise
+    finally:
+        span.end = trace.elapsed()
+        trace.add_span(span)
+        if track_token is not None:
+            _ACTIVE_TRACK.reset(track_token)
+
+
+def to_chrome_trace(
+    traces: Iterable[CycleTrace], process_name: str = "smart_envi", start_pid: int = 1
+) -> dict:
+    """Convert traces to the Chrome trace event format.
+
+    Args:
+        traces: Traces to export (each becomes its own process row)
+        process_name: Prefix for the process names
+        start_pid: Process ID of the first trace (offset it when merging the
+            output of several calls into one file)
+
+    Returns:
+        Document with a ``traceEvents`` list, ready to be written as JSON
+    """
+    events: list[dict] = []
+    for pid, trace in enumerate(traces, start=start_pid):
+        base_us = trace.started_at.timestamp() * 1_000_000
+        events.append({
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": f"{process_name} {trace.name} {trace.started_at.isoformat()}"},
+        })
+        tracks: dict[str, int] = {MAIN_TRACK: 0}
+        for span in trace.spans:
+            if span.track not in tracks:
+                tracks[span.track] = len(tracks)
+            events.append({
+                "name": span.name,
+                "ph": "X",
+                "pid": pid,
+                "tid": tracks[span.track],
+                "ts": base_us + span.start * 1_000_000,
+                "dur": span.duration * 1_000_000,
+                "args": span.attributes,
+            })
+        for track, tid in tracks.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
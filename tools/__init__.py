@@ -0,0 +1 @@
+"""Development tools for the Smart Envi integration (not shipped via HACS)."""
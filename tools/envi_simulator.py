@@ -0,0 +1,536 @@
+"""Offline Envi API simulator for local development and load testing.
+
+⚠️ This is a development tool. It is not part of the Home Assistant integration
+and is not installed by HACS.
+
+Serves a local stand-in for the Envi cloud endpoints used by ``EnviApiClient``
+(``auth/login``, ``device/list``, ``device/{id}``,
+``device/update-temperature/{id}`` and ``schedule/*``) backed by N virtual
+heaters with simple thermal drift. Latency and failures can be injected to
+reproduce production conditions offline:
+
+- latency distributions (fixed, uniform, lognormal, pareto)
+- token expiry (401 once a token is older than ``token_ttl``)
+- rate limiting (429 with Retry-After above a requests/second budget)
+- random 5xx responses and malformed JSON bodies
+- cloud sync lag (writes show up in ``device/{id}`` after ``sync_delay``)
+
+Run standalone::
+
+    python tools/envi_simulator.py --heaters 150 --port 8099 --latency lognormal:0.2:0.6
+
+then point a client at it::
+
+    EnviApiClient(session, "user", "pass", base_url="http://127.0.0.1:8099/apis/v1")
+
+Or start it in-process (as the benchmarks do)::
+
+    simulator = EnviSimulator(SimulatorConfig(heaters=100))
+    base_url = await simulator.start()
+    ...
+    await simulator.stop()
+
+Request counters are available at ``GET /_sim/stats`` and reset with
+``POST /_sim/reset``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+API_PREFIX = "/apis/v1"
+
+# Thermal model: degrees Fahrenheit per minute
+HEATING_RATE = 0.5
+COOLING_RATE = 0.2
+ROOM_BASELINE = 58.0
+
+
+@dataclass
+class LatencyProfile:
+    """Latency distribution for simulated responses.
+
+    Attributes:
+        kind: One of "fixed", "uniform", "lognormal" or "pareto"
+        a: Fixed/min latency (fixed, uniform), median (lognormal) or scale
+            (pareto), in seconds
+        b: Max latency (uniform), sigma (lognormal) or shape (pareto)
+    """
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyProfile:
+        """Parse a ``kind:a:b`` spec such as ``lognormal:0.2:0.6``."""
+        parts = spec.split(":")
+        kind = parts[0]
+        if kind not in ("fixed", "uniform", "lognormal", "pareto"):
+            raise ValueError(f"Unknown latency distribution '{kind}'")
+        values = [float(part) for part in parts[1:]] + [0.0, 0.0]
+        return cls(kind, values[0], values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency sample in seconds."""
+        if self.kind == "uniform":
+            return rng.uniform(self.a, max(self.a, self.b))
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(max(self.a, 1e-6)), self.b)
+        if self.kind == "pareto":
+            return self.a * rng.paretovariate(max(self.b, 0.1))
+        return self.a
+
+
+@dataclass
+class SimulatorConfig:
+    """Simulator configuration.
+
+    Attributes:
+        heaters: Number of virtual heaters
+        latency: Default latency profile for every endpoint
+        endpoint_latency: Per-endpoint overrides keyed by endpoint class
+            ("auth", "device_list", "device_get", "device_update", "schedule")
+        token_ttl: Seconds until an issued token is rejected with 401
+        rate_limit: Requests per second before answering 429 (0 = unlimited)
+        retry_after: Retry-After seconds sent with 429 responses
+        error_rate: Fraction of requests answered with a random 5xx
+        malformed_rate: Fraction of requests answered with invalid JSON
+        sync_delay: Seconds before a write is reflected in device reads
+        celsius_fraction: Fraction of heaters that report in Celsius
+        seed: Random seed for reproducible runs
+    """
+
+    heaters: int = 10
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    endpoint_latency: dict[str, LatencyProfile] = field(default_factory=dict)
+    token_ttl: float = 24 * 3600
+    rate_limit: float = 0.0
+    retry_after: int = 2
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    sync_delay: float = 0.0
+    celsius_fraction: float = 0.0
+    seed: int = 1234
+
+
+@dataclass
+class VirtualHeater:
+    """State of one simulated heater."""
+
+    device_id: int
+    name: str
+    celsius: bool
+    ambient: float
+    target: float = 68.0
+    state: int = 1
+    mode: int = 1
+    schedule_id: int | None = None
+    pending: list[tuple[float, dict]] = field(default_factory=list)
+    updated_at: float = field(default_factory=time.monotonic)
+    synced_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def advance(self, now: float) -> None:
+        """Apply synced writes and thermal drift up to ``now``."""
+        still_pending = []
+        for apply_at, payload in self.pending:
+            if apply_at <= now:
+                self._apply(payload)
+            else:
+                still_pending.append((apply_at, payload))
+        self.pending = still_pending
+
+        minutes = (now - self.updated_at) / 60
+        self.updated_at = now
+        if self.state == 1 and self.ambient < self.target:
+            self.ambient = min(self.target, self.ambient + HEATING_RATE * minutes)
+        elif self.ambient > ROOM_BASELINE:
+            self.ambient = max(ROOM_BASELINE, self.ambient - COOLING_RATE * minutes)
+
+    def _apply(self, payload: dict) -> None:
+        """Apply a synced write to the heater."""
+        if "temperature" in payload:
+            temperature = float(payload["temperature"])
+            self.target = temperature * 9 / 5 + 32 if self.celsius else temperature
+        if "state" in payload:
+            self.state = int(payload["state"])
+        if "mode" in payload:
+            self.mode = int(payload["mode"])
+        self.synced_at = datetime.now(timezone.utc)
+
+    def to_payload(self, schedule: dict | None) -> dict:
+        """Render the heater as a ``device/{id}`` payload."""
+        def _unit(value: float) -> float:
+            return round((value - 32) * 5 / 9, 1) if self.celsius else round(value, 1)
+
+        return {
+            "id": self.device_id,
+            "serial_no": f"SIM{self.device_id:06d}",
+            "name": self.name,
+            "ambient_temperature": _unit(self.ambient),
+            "current_temperature": _unit(self.target),
+            "temperature_unit": "C" if self.celsius else "F",
+            "state": self.state,
+            "current_mode": self.mode,
+            "device_status": 1,
+            "signal_strength": 70 + self.device_id % 30,
+            "ssid": "SimNet",
+            "location_name": f"Room {self.device_id % 12}",
+            "firmware_version": "1.2.3-sim",
+            "model_no": "EH1500-SIM",
+            "is_schedule_active": bool(schedule and schedule.get("enabled")),
+            "schedule": {
+                "schedule_id": schedule["id"],
+                "name": schedule.get("name"),
+                "enabled": schedule.get("enabled"),
+                "times": schedule.get("times", []),
+            } if schedule else {},
+            "freeze_protect_setting": True,
+            "child_lock_setting": True,
+            "is_hold": False,
+            "is_geofence_active": False,
+            "night_light_setting": {"brightness": 50, "color": {"r": 255, "g": 180, "b": 80}, "auto": False, "on": False},
+            "pilot_light_setting": {"brightness": 30, "always_on": False, "auto_dim": True, "auto_dim_time": 30},
+            "display_setting": {"display_brightness": {"value": 60}, "timeout": {"value": 30}},
+            "device_status_req_at": self.synced_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "device_status_res_at": self.synced_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+
+def _b64url(data: dict) -> str:
+    """Encode a dict as unpadded base64url JSON (JWT segment)."""
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+class EnviSimulator:
+    """In-process Envi API simulator."""
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        """Initialize the simulator and its virtual heaters."""
+        self.config = config or SimulatorConfig()
+        self.rng = random.Random(self.config.seed)
+        self.stats: Counter[str] = Counter()
+        self.heaters: dict[int, VirtualHeater] = {}
+        self.schedules: dict[int, dict] = {}
+        self._tokens: dict[str, float] = {}
+        self._next_schedule_id = 1
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._runner: web.AppRunner | None = None
+
+        for index in range(1, self.config.heaters + 1):
+            self.add_heater(index)
+
+    def add_heater(self, device_id: int) -> VirtualHeater:
+        """Add a virtual heater (also usable at runtime to test discovery)."""
+        heater = VirtualHeater(
+            device_id=device_id,
+            name=f"Sim Heater {device_id}",
+            celsius=self.rng.random() < self.config.celsius_fraction,
+            ambient=ROOM_BASELINE + self.rng.uniform(0, 10),
+            target=self.rng.choice([64.0, 66.0, 68.0, 70.0]),
+        )
+        self.heaters[device_id] = heater
+        return heater
+
+    def remove_heater(self, device_id: int) -> None:
+        """Remove a virtual heater."""
+        self.heaters.pop(device_id, None)
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application(middlewares=[self._faults_middleware])
+        app.add_routes([
+            web.post(f"{API_PREFIX}/auth/login", self._login),
+            web.get(f"{API_PREFIX}/device/list", self._device_list),
+            web.get(f"{API_PREFIX}/device/{{device_id}}", self._device_get),
+            web.patch(f"{API_PREFIX}/device/update-temperature/{{device_id}}", self._device_update),
+            web.get(f"{API_PREFIX}/schedule/list", self._schedule_list),
+            web.post(f"{API_PREFIX}/schedule/add", self._schedule_add),
+            web.get(f"{API_PREFIX}/schedule/{{schedule_id}}", self._schedule_get),
+            web.put(f"{API_PREFIX}/schedule/{{schedule_id}}", self._schedule_update),
+            web.delete(f"{API_PREFIX}/schedule/{{schedule_id}}", self._schedule_delete),
+            web.get("/_sim/stats", self._stats),
+            web.post("/_sim/reset", self._reset),
+        ])
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving in the running event loop.
+
+        Args:
+            host: Interface to bind
+            port: TCP port (0 picks a free port)
+
+        Returns:
+            Base URL to pass to ``EnviApiClient(base_url=...)``
+        """
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{bound_port}{API_PREFIX}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # Fault injection
+
+    @staticmethod
+    def _endpoint_class(request: web.Request) -> str:
+        """Classify a request path the same way the client groups endpoints."""
+        path = request.path[len(API_PREFIX) + 1:]
+        if path.startswith("auth/"):
+            return "auth"
+        if path == "device/list":
+            return "device_list"
+        if path.startswith("device/update-temperature/"):
+            return "device_update"
+        if path.startswith("device/"):
+            return "device_get"
+        return "schedule"
+
+    @web.middleware
+    async def _faults_middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Inject latency, rate limiting, token expiry, 5xx and bad JSON."""
+        if not request.path.startswith(API_PREFIX):
+            return await handler(request)
+
+        endpoint = self._endpoint_class(request)
+        self.stats["requests"] += 1
+        self.stats[f"requests:{endpoint}"] += 1
+
+        profile = self.config.endpoint_latency.get(endpoint, self.config.latency)
+        delay = profile.sample(self.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.config.rate_limit > 0:
+            now = time.monotonic()
+            if now - self._window_start >= 1:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > self.config.rate_limit:
+                self.stats["429"] += 1
+                return web.json_response(
+                    {"status": "error", "msg": "Too many requests"},
+                    status=429,
+                    headers={"Retry-After": str(self.config.retry_after)},
+                )
+
+        if endpoint != "auth":
+            token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            issued = self._tokens.get(token)
+            if issued is None or time.monotonic() - issued > self.config.token_ttl:
+                self.stats["401"] += 1
+                return web.json_response({"status": "error", "msg": "Unauthorized"}, status=401)
+
+        if self.rng.random() < self.config.error_rate:
+            status = self.rng.choice([500, 502, 503, 504])
+            self.stats["5xx"] += 1
+            return web.json_response({"status": "error", "msg": "Server error"}, status=status)
+
+        if self.rng.random() < self.config.malformed_rate:
+            self.stats["malformed"] += 1
+            return web.Response(text='{"status": "success", "data": {', content_type="application/json")
+
+        return await handler(request)
+
+    # Endpoints
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Handle auth/login."""
+        payload = await request.json()
+        if not payload.get("username") or not payload.get("password"):
+            return web.json_response({"status": "error", "msg": "Invalid credentials"})
+        exp = int(time.time() + self.config.token_ttl)
+        token = ".".join([
+            _b64url({"alg": "HS256", "typ": "JWT"}),
+            _b64url({"sub": payload["username"], "exp": exp, "jti": self.rng.getrandbits(64)}),
+            "simulated-signature",
+        ])
+        self._tokens[token] = time.monotonic()
+        return web.json_response({"status": "success", "data": {"token": token}})
+
+    async def _device_list(self, request: web.Request) -> web.Response:
+        """Handle device/list."""
+        return web.json_response({
+            "status": "success",
+            "data": [{"id": heater.device_id, "name": heater.name} for heater in self.heaters.values()],
+        })
+
+    def _get_heater(self, request: web.Request) -> VirtualHeater | None:
+        """Look up the heater addressed by the request path."""
+        try:
+            return self.heaters.get(int(request.match_info["device_id"]))
+        except ValueError:
+            return None
+
+    async def _device_get(self, request: web.Request) -> web.Response:
+        """Handle device/{id}."""
+        heater = self._get_heater(request)
+        if heater is None:
+            return web.json_response({"status": "error", "msg": "Device not found"}, status=404)
+        heater.advance(time.monotonic())
+        schedule = self.schedules.get(heater.schedule_id) if heater.schedule_id else None
+        return web.json_response({"status": "success", "data": heater.to_payload(schedule)})
+
+    async def _device_update(self, request: web.Request) -> web.Response:
+        """Handle device/update-temperature/{id}."""
+        heater = self._get_heater(request)
+        if heater is None:
+            return web.json_response({"status": "error", "msg": "Device not found"}, status=404)
+        payload = await request.json()
+        unknown = set(payload) - {"temperature", "state", "mode", "night_light_setting",
+                                  "pilot_light_setting", "display_setting"}
+        if unknown:
+            return web.json_response(
+                {"status": "error", "msg": f"{sorted(unknown)[0]} is not allowed", "msgCode": "validation"},
+                status=400,
+            )
+        heater.pending.append((time.monotonic() + self.config.sync_delay, payload))
+        return web.json_response({"status": "success", "data": {}})
+
+    async def _schedule_list(self, request: web.Request) -> web.Response:
+        """Handle schedule/list."""
+        return web.json_response({"status": "success", "data": list(self.schedules.values())})
+
+    async def _schedule_add(self, request: web.Request) -> web.Response:
+        """Handle schedule/add."""
+        payload = await request.json()
+        try:
+            heater = self.heaters[int(payload["device_id"])]
+        except (KeyError, ValueError):
+            return web.json_response({"status": "error", "msg": "device_id is required"}, status=400)
+        schedule = {
+            "id": self._next_schedule_id,
+            "device_id": heater.device_id,
+            "name": payload.get("name"),
+            "enabled": payload.get("enabled", True),
+            "times": payload.get("times", []),
+        }
+        self._next_schedule_id += 1
+        self.schedules[schedule["id"]] = schedule
+        heater.schedule_id = schedule["id"]
+        return web.json_response({"status": "success", "data": schedule})
+
+    def _get_schedule(self, request: web.Request) -> dict | None:
+        """Look up the schedule addressed by the request path."""
+        try:
+            return self.schedules.get(int(request.match_info["schedule_id"]))
+        except ValueError:
+            return None
+
+    async def _schedule_get(self, request: web.Request) -> web.Response:
+        """Handle GET schedule/{id}."""
+        schedule = self._get_schedule(request)
+        if schedule is None:
+            return web.json_response({"status": "error", "msg": "Schedule not found"}, status=404)
+        return web.json_response({"status": "success", "data": schedule})
+
+    async def _schedule_update(self, request: web.Request) -> web.Response:
+        """Handle PUT schedule/{id}."""
+        schedule = self._get_schedule(request)
+        if schedule is None:
+            return web.json_response({"status": "error", "msg": "Schedule not found"}, status=404)
+        payload = await request.json()
+        schedule.update({key: value for key, value in payload.items() if key in ("name", "enabled", "times")})
+        return web.json_response({"status": "success", "data": schedule})
+
+    async def _schedule_delete(self, request: web.Request) -> web.Response:
+        """Handle DELETE schedule/{id}."""
+        schedule = self._get_schedule(request)
+        if schedule is None:
+            return web.json_response({"status": "error", "msg": "Schedule not found"}, status=404)
+        del self.schedules[schedule["id"]]
+        heater = self.heaters.get(schedule["device_id"])
+        if heater is not None and heater.schedule_id == schedule["id"]:
+            heater.schedule_id = None
+        return web.json_response({"status": "success", "data": {}})
+
+    # Introspection
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        """Return request counters."""
+        return web.json_response(dict(self.stats))
+
+    async def _reset(self, request: web.Request) -> web.Response:
+        """Reset request counters."""
+        self.stats.clear()
+        return web.json_response({})
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Offline Envi API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--heaters", type=int, default=10, help="number of virtual heaters")
+    parser.add_argument(
+        "--latency", default="fixed:0",
+        help="latency distribution kind:a:b, e.g. fixed:0.1, uniform:0.05:0.5, lognormal:0.2:0.6, pareto:0.1:2",
+    )
+    parser.add_argument(
+        "--endpoint-latency", action="append", default=[], metavar="ENDPOINT=SPEC",
+        help="per-endpoint latency override, e.g. device_list=lognormal:2:0.5 (repeatable)",
+    )
+    parser.add_argument("--token-ttl", type=float, default=24 * 3600, help="seconds until tokens return 401")
+    parser.add_argument("--rate-limit", type=float, default=0, help="requests/second before 429 (0 = off)")
+    parser.add_argument("--retry-after", type=int, default=2, help="Retry-After seconds on 429")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests answered with 5xx")
+    parser.add_argument("--malformed-rate", type=float, default=0, help="fraction of requests with invalid JSON")
+    parser.add_argument("--sync-delay", type=float, default=0, help="seconds before writes show in reads")
+    parser.add_argument("--celsius-fraction", type=float, default=0, help="fraction of heaters reporting in C")
+    parser.add_argument("--seed", type=int, default=1234)
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    args = _parse_args()
+    logging.basicConfig(level=logging.INFO)
+    endpoint_latency = {}
+    for override in args.endpoint_latency:
+        endpoint, _, spec = override.partition("=")
+        endpoint_latency[endpoint] = LatencyProfile.parse(spec)
+    config = SimulatorConfig(
+        heaters=args.heaters,
+        latency=LatencyProfile.parse(args.latency),
+        endpoint_latency=endpoint_latency,
+        token_ttl=args.token_ttl,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        sync_delay=args.sync_delay,
+        celsius_fraction=args.celsius_fraction,
+        seed=args.seed,
+    )
+    simulator = EnviSimulator(config)
+    _LOGGER.info(
+        "Serving %s virtual heaters at http://%s:%s%s", args.heaters, args.host, args.port, API_PREFIX
+    )
+    web.run_app(simulator.create_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()